@@ -1,23 +1,31 @@
-from typing import List
+from typing import AsyncIterator, List, Optional, Union
 
-from asgiref.sync import sync_to_async
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from ninja_extra import api_controller, route, status
 from ninja_extra import permissions
-from ninja_jwt.authentication import AsyncJWTAuth
+from ninja_extra.exceptions import APIException
 
+from api.comments.models import Comment
 from api.comments.repositories import CommentRepository
 from api.comments.schemas import (
+    CommentBulkCreateSchema,
+    CommentBulkResponseSchema,
     CommentCreateSchema,
+    CommentPageSchema,
     CommentResponseSchema,
+    CommentRow,
+    CommentTreeSchema,
 )
-from api.services import UserService
+from api.comments.services import CommentTreeService
+from api.posts.models import Post
+from api.services import CursorPaginationService, HttpCacheService, JSONResponseService, UserService
+from api.users.authentication import UserJWTAuth
 
 
 @api_controller(
     "/posts/{post_id}/comments",
     tags=["comments"],
-    auth=AsyncJWTAuth(),
+    auth=UserJWTAuth(),
     permissions=[permissions.IsAuthenticatedOrReadOnly],
 )
 class CommentController:
@@ -26,10 +34,15 @@ class CommentController:
 
     Attributes:
         - create_comment (method): Create a new comment.
-        - get_comments_by_post (method): Get all comments by post.
+        - bulk_create_comments (method): Create a batch of comments.
+        - get_comments_by_post (method): Get a page of comments by post, or stream them.
         - get_comment (method): Get a comment by ID.
         - update_comment (method): Update an existing comment.
         - delete_comment (method): Delete a comment.
+        - create_reply (method): Create a reply to a comment.
+        - get_replies_by_comment (method): Get all replies to a comment.
+        - get_post_thread (method): Get the whole comment tree of a post.
+        - get_comment_thread (method): Get a comment with its whole reply tree.
     """
 
     @route.post("/", response={status.HTTP_201_CREATED: CommentResponseSchema})
@@ -50,27 +63,160 @@ class CommentController:
         comment_repository = CommentRepository()
         user_service = UserService()
         user_id = await user_service.get_user_id(request)
-        comment = await comment_repository.create(
-            comment=comment_data.dict(),
-            post_id=post_id,
-            author_id=user_id,
-        )
+        try:
+            comment = await comment_repository.create(
+                comment=comment_data.dict(),
+                post_id=post_id,
+                author_id=user_id,
+            )
+        except Post.DoesNotExist:
+            exception = APIException("Post not found")
+            exception.status_code = status.HTTP_404_NOT_FOUND
+            raise exception
+
         return CommentResponseSchema.from_orm(comment)
 
-    @route.get("/", response={status.HTTP_200_OK: List[CommentResponseSchema]}, auth=None)
-    async def get_comments_by_post(self, post_id: int) -> List[CommentResponseSchema]:
+    @route.post("/bulk", response={status.HTTP_201_CREATED: CommentBulkResponseSchema})
+    async def bulk_create_comments(
+        self,
+        request: HttpRequest,
+        post_id: int,
+        comments_data: CommentBulkCreateSchema,
+    ) -> CommentBulkResponseSchema:
         """
-        Get all comments by post.
+        Create a batch of comments.
 
+        :param request: http request object
         :param post_id: post id
-        :return: comments
+        :param comments_data: comments data
+        :return: ids of the created comments
         """
         comment_repository = CommentRepository()
-        comments = await comment_repository.get_all_by_post_id(post_id)
-        comments_schema = await sync_to_async(
-            lambda: [CommentResponseSchema.from_orm(comment) for comment in comments]
-        )()
-        return comments_schema
+        user_service = UserService()
+        user_id = await user_service.get_user_id(request)
+        try:
+            comments = await comment_repository.bulk_create(
+                comments=[comment.dict() for comment in comments_data.comments],
+                post_id=post_id,
+                author_id=user_id,
+            )
+        except ValueError as err:
+            exception = APIException(str(err))
+            exception.status_code = status.HTTP_400_BAD_REQUEST
+            raise exception
+        except Post.DoesNotExist:
+            exception = APIException("Post not found")
+            exception.status_code = status.HTTP_404_NOT_FOUND
+            raise exception
+
+        return CommentBulkResponseSchema(ids=[comment.pk for comment in comments])
+
+    @route.get(
+        "/",
+        response={status.HTTP_200_OK: CommentPageSchema, status.HTTP_304_NOT_MODIFIED: None},
+        auth=None,
+    )
+    async def get_comments_by_post(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        post_id: int,
+        cursor: Optional[str] = None,
+        limit: int = CursorPaginationService.DEFAULT_LIMIT,
+        stream: bool = False,
+    ) -> Union[CommentPageSchema, HttpResponse, StreamingHttpResponse]:
+        """
+        Get a page of comments by post, newest first, or 304 Not Modified if the ETag sent is still current.
+
+        With stream enabled, every comment after the cursor is streamed as newline-delimited JSON instead,
+        without caching headers.
+
+        :param request: http request object
+        :param response: temporal response object, carrying the caching headers
+        :param post_id: post id
+        :param cursor: cursor of the page, returned as next_cursor by the previous page
+        :param limit: page size, ignored when streaming
+        :param stream: stream the comments as newline-delimited JSON
+        :return: comments of the page and the cursor of the next page
+        """
+        comment_repository = CommentRepository()
+        try:
+            if stream:
+                rows = comment_repository.stream_rows_by_post_id(post_id=post_id, cursor=cursor)
+                return StreamingHttpResponse(
+                    self._serialize_stream(rows),
+                    content_type="application/x-ndjson",
+                )
+
+            if HttpCacheService.is_conditional(request):
+                versions, has_next = await comment_repository.get_page_versions_by_post_id(
+                    post_id=post_id,
+                    cursor=cursor,
+                    limit=limit,
+                )
+                not_modified = HttpCacheService.not_modified(
+                    request,
+                    HttpCacheService.etag(versions, has_next=has_next),
+                    "comments",
+                    self._keys(HttpCacheService.post_comments_key(post_id), versions),
+                )
+                if not_modified is not None:
+                    return not_modified
+
+            rows, next_cursor = await comment_repository.get_page_rows_by_post_id(
+                post_id=post_id,
+                cursor=cursor,
+                limit=limit,
+            )
+        except ValueError as err:
+            exception = APIException(str(err))
+            exception.status_code = status.HTTP_400_BAD_REQUEST
+            raise exception
+
+        versions = [(row.id, row.updated_at, row.reply_count) for row in rows]
+        HttpCacheService.apply(
+            response,
+            HttpCacheService.etag(versions, has_next=next_cursor is not None),
+            "comments",
+            self._keys(HttpCacheService.post_comments_key(post_id), versions),
+        )
+        return JSONResponseService.render(request, {"items": rows, "next_cursor": next_cursor}, response)
+
+    @staticmethod
+    def _keys(listing_key: str, versions: List[tuple]) -> List[str]:
+        """
+        Get the surrogate keys of a listing of comments.
+
+        :param listing_key: surrogate key of the listing itself
+        :param versions: versions of the listed comments
+        :return: surrogate keys of the listing and of every listed comment
+        """
+        return [listing_key, *(HttpCacheService.comment_key(version[0]) for version in versions)]
+
+    @staticmethod
+    async def _serialize_stream(rows: AsyncIterator[CommentRow]) -> AsyncIterator[bytes]:
+        """
+        Serialize comment rows into newline-delimited JSON, one comment at a time.
+
+        :param rows: async iterator of comment rows
+        :return: async iterator of JSON lines
+        """
+        async for row in rows:
+            yield JSONResponseService.render_line(row)
+
+    @route.get("/tree", response={status.HTTP_200_OK: List[CommentTreeSchema]}, auth=None)
+    async def get_post_thread(self, post_id: int, depth: Optional[int] = None) -> List[CommentTreeSchema]:
+        """
+        Get the whole comment tree of a post.
+
+        :param post_id: post id
+        :param depth: number of reply levels to include below the top-level comments, all of them by default
+        :return: top-level comments with their nested replies
+        """
+        self._check_depth(depth)
+        comment_repository = CommentRepository()
+        comments = await comment_repository.get_thread(post_id=post_id, comment_id=None, depth=depth)
+        return CommentTreeService.build_tree(comments)
 
     @route.get(
         "/{comment_id}", response={status.HTTP_200_OK: CommentResponseSchema}, auth=None
@@ -162,34 +308,97 @@ class CommentController:
         comment_repository = CommentRepository()
         user_service = UserService()
         user_id = await user_service.get_user_id(request)
-        comment = await comment_repository.create_reply(
-            comment=comment_data.dict(),
-            post_id=post_id,
-            comment_id=comment_id,
-            author_id=user_id,
-        )
+        try:
+            comment = await comment_repository.create_reply(
+                comment=comment_data.dict(),
+                post_id=post_id,
+                comment_id=comment_id,
+                author_id=user_id,
+            )
+        except Post.DoesNotExist:
+            exception = APIException("Post not found")
+            exception.status_code = status.HTTP_404_NOT_FOUND
+            raise exception
+        except Comment.DoesNotExist:
+            exception = APIException("Comment not found")
+            exception.status_code = status.HTTP_404_NOT_FOUND
+            raise exception
+
         return CommentResponseSchema.from_orm(comment)
 
     @route.get(
         "/{comment_id}/replies",
-        response={status.HTTP_200_OK: List[CommentResponseSchema]},
+        response={status.HTTP_200_OK: List[CommentResponseSchema], status.HTTP_304_NOT_MODIFIED: None},
         auth=None,
     )
     async def get_replies_by_comment(
         self,
+        request: HttpRequest,
+        response: HttpResponse,
         post_id: int,
         comment_id: int,
-    ) -> List[CommentResponseSchema]:
+    ) -> Union[List[CommentResponseSchema], HttpResponse]:
         """
-        Get all replies to a comment.
+        Get all replies to a comment, or 304 Not Modified if the ETag sent is still current.
 
+        :param request: http request object
+        :param response: temporal response object, carrying the caching headers
         :param post_id: post id
         :param comment_id: comment id
         :return: replies to the comment
         """
         comment_repository = CommentRepository()
-        comments = await comment_repository.get_replies_by_comment(post_id, comment_id)
-        comments_schema = await sync_to_async(
-            lambda: [CommentResponseSchema.from_orm(comment) for comment in comments]
-        )()
-        return comments_schema
+        listing_key = HttpCacheService.comment_replies_key(comment_id)
+        if HttpCacheService.is_conditional(request):
+            versions = await comment_repository.get_reply_versions(post_id, comment_id)
+            not_modified = HttpCacheService.not_modified(
+                request, HttpCacheService.etag(versions), "replies", self._keys(listing_key, versions)
+            )
+            if not_modified is not None:
+                return not_modified
+
+        rows = await comment_repository.get_reply_rows(post_id, comment_id)
+        versions = [(row.id, row.updated_at, row.reply_count) for row in rows]
+        HttpCacheService.apply(response, HttpCacheService.etag(versions), "replies", self._keys(listing_key, versions))
+        return JSONResponseService.render(request, rows, response)
+
+    @route.get(
+        "/{comment_id}/tree",
+        response={status.HTTP_200_OK: CommentTreeSchema},
+        auth=None,
+    )
+    async def get_comment_thread(
+        self,
+        post_id: int,
+        comment_id: int,
+        depth: Optional[int] = None,
+    ) -> CommentTreeSchema:
+        """
+        Get a comment with its whole reply tree.
+
+        :param post_id: post id
+        :param comment_id: comment id
+        :param depth: number of reply levels to include below the comment, all of them by default
+        :return: comment with its nested replies
+        """
+        self._check_depth(depth)
+        comment_repository = CommentRepository()
+        comments = await comment_repository.get_thread(post_id=post_id, comment_id=comment_id, depth=depth)
+        if not comments:
+            exception = APIException("Comment not found")
+            exception.status_code = status.HTTP_404_NOT_FOUND
+            raise exception
+
+        return CommentTreeService.build_tree(comments)[0]
+
+    @staticmethod
+    def _check_depth(depth: Optional[int]) -> None:
+        """
+        Reject a negative tree depth.
+
+        :param depth: requested tree depth
+        """
+        if depth is not None and depth < 0:
+            exception = APIException("Depth must not be negative")
+            exception.status_code = status.HTTP_400_BAD_REQUEST
+            raise exception
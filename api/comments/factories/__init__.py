@@ -0,0 +1,6 @@
+from .comment_factory import CommentFactory
+
+
+__all__ = [
+    "CommentFactory",
+]
@@ -0,0 +1,18 @@
+import factory
+
+from api.comments.models import Comment
+
+
+class CommentFactory(factory.django.DjangoModelFactory):
+    """
+    Comment factory for creating comments with common fields.
+    """
+
+    class Meta:
+        model = Comment
+
+    text = factory.Faker("sentence", nb_words=8)
+    author = factory.SubFactory("api.users.factories.UserFactory")
+    post = factory.SubFactory("api.posts.factories.PostFactory")
+    parent = None
+    is_blocked = False
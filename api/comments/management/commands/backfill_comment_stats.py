@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from api.comments.services import CommentStatsService
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the daily comment stats from the comments table.
+    """
+
+    help = "Rebuild the pre-aggregated daily comment stats from the comments table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to backfill (defaults to the default database).",
+        )
+
+    def handle(self, *args, **options):
+        days = CommentStatsService.backfill(using=options["database"])
+        self.stdout.write(self.style.SUCCESS(f"Backfilled daily comment stats for {days} days."))
@@ -0,0 +1,138 @@
+import math
+import time
+import tracemalloc
+from typing import Callable, List
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from ninja import Schema
+
+from api.comments.models import Comment
+from api.comments.repositories import CommentRepository
+from api.comments.schemas import CommentResponseSchema
+from api.posts.factories import PostFactory
+from api.renderers import FastJSONRenderer
+from api.users.factories import UserFactory
+
+
+class Command(BaseCommand):
+    """
+    Compare the model and the projection read paths of a large listing: the replies to a comment.
+
+    The replies are inserted into a throwaway test database. The model path reads Comment instances, as the
+    routes did before, builds a CommentResponseSchema from each and validates them against the response model
+    of the route, as django-ninja does, before rendering. The projection path reads CommentRow objects with
+    values_list and renders them as they are. Both render with FastJSONRenderer, and the peak memory of each
+    path is traced in a separate run, as tracing slows the timed ones down.
+    """
+
+    help = "Benchmark the model and the projection read paths on a large listing of replies."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--replies", type=int, default=10_000, help="Number of replies in the listing.")
+        parser.add_argument("--repeat", type=int, default=10, help="Number of timed runs per path.")
+
+    def handle(self, *args, **options):
+        if options["replies"] < 1 or options["repeat"] < 1:
+            raise CommandError("--replies and --repeat must be positive.")
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self._run(options["replies"], options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def _run(self, count: int, repeat: int) -> None:
+        author = UserFactory()
+        post = PostFactory(author=author)
+        parent = Comment.objects.create(text="Parent comment", author=author, post=post)
+        self.stdout.write(f"Inserting {count} replies...")
+        Comment.objects.bulk_create(
+            (
+                Comment(
+                    text=f"Reply number {number}, with a sentence or two of text to serialize." * 2,
+                    author=author,
+                    post=post,
+                    parent=parent,
+                )
+                for number in range(count)
+            ),
+            batch_size=5000,
+        )
+
+        repository = CommentRepository()
+        renderer = FastJSONRenderer()
+        response_model = type(
+            "NinjaResponseSchema", (Schema,), {"__annotations__": {"response": List[CommentResponseSchema]}}
+        )
+        replies = Comment.available.filter(post_id=post.pk, parent_id=parent.pk)
+        get_reply_rows = async_to_sync(repository.get_reply_rows)
+
+        def model_path() -> bytes:
+            schemas = [CommentResponseSchema.from_orm(comment) for comment in replies.all()]
+            data = response_model.model_validate({"response": schemas}).model_dump()["response"]
+            return renderer.render(None, data, response_status=200)
+
+        def projection_path() -> bytes:
+            return renderer.render(None, get_reply_rows(post.pk, parent.pk), response_status=200)
+
+        if model_path() != projection_path():
+            raise CommandError("The two paths render different listings.")
+
+        paths = {"model": model_path, "projection": projection_path}
+        results = {name: (self._measure(path, repeat), self._peak_memory(path)) for name, path in paths.items()}
+
+        self.stdout.write(f"{'path':<12} {'p50 ms':>9} {'p95 ms':>9} {'peak MiB':>9}")
+        for name, (latencies, peak) in results.items():
+            self.stdout.write(
+                f"{name:<12} {self._percentile(latencies, 50):>9.1f} {self._percentile(latencies, 95):>9.1f} "
+                f"{peak / 2**20:>9.1f}"
+            )
+
+        (model_latencies, model_peak), (projection_latencies, projection_peak) = results.values()
+        speedup = self._percentile(model_latencies, 50) / self._percentile(projection_latencies, 50)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"The projection path is {speedup:.1f}x faster and peaks at {projection_peak / model_peak:.0%} "
+                "of the memory of the model path."
+            )
+        )
+
+    @staticmethod
+    def _measure(step: Callable[[], object], count: int) -> List[float]:
+        """
+        Run a step repeatedly.
+
+        :return: duration of every run, in milliseconds.
+        """
+        latencies = []
+        for _ in range(count):
+            started = time.perf_counter()
+            step()
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies
+
+    @staticmethod
+    def _peak_memory(step: Callable[[], object]) -> int:
+        """
+        Run a step once with allocations traced.
+
+        :return: peak of the memory allocated during the run, in bytes.
+        """
+        tracemalloc.start()
+        try:
+            step()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak
+
+    @staticmethod
+    def _percentile(values: List[float], percentile: int) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * percentile / 100) - 1)]
@@ -0,0 +1,114 @@
+import math
+import time
+from datetime import timedelta
+from typing import Callable, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.utils import timezone
+from ninja.parser import Parser
+from ninja.renderers import JSONRenderer
+
+from api.comments.models import Comment
+from api.comments.schemas import CommentPageSchema, CommentResponseSchema
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, uses_orjson
+
+
+class Command(BaseCommand):
+    """
+    Compare the JSON encoding and decoding cost of the stdlib and orjson on a large listing of comments.
+
+    The listing is built from unsaved comments and validated into a CommentPageSchema dump, as the API does
+    before rendering, so only the JSON step differs between the two renderers. The validation time is
+    reported too, as it comes on top of either. Request bodies are decoded from a bulk creation request of
+    the first COMMENTS_BULK_MAX_SIZE comments, the largest body the API accepts.
+    """
+
+    help = "Benchmark the stdlib and orjson JSON renderers and parsers on a listing of comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--comments", type=int, default=10_000, help="Number of comments in the listing.")
+        parser.add_argument("--repeat", type=int, default=20, help="Number of timed runs per step.")
+
+    def handle(self, *args, **options):
+        if options["comments"] < 1 or options["repeat"] < 1:
+            raise CommandError("--comments and --repeat must be positive.")
+        if not uses_orjson():
+            raise CommandError("orjson is not installed, or JSON_BACKEND is not orjson.")
+
+        now = timezone.now()
+        comments = [
+            Comment(
+                id=comment_id,
+                text=f"Comment number {comment_id}, with a sentence or two of text to serialize." * 2,
+                created_at=now - timedelta(seconds=comment_id),
+                updated_at=now,
+                is_blocked=False,
+                reply_count=comment_id % 7,
+            )
+            for comment_id in range(1, options["comments"] + 1)
+        ]
+
+        def validate() -> dict:
+            return CommentPageSchema(
+                items=[CommentResponseSchema.from_orm(comment) for comment in comments],
+                next_cursor=None,
+            ).model_dump()
+
+        data = validate()
+        stdlib_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        body = fast_renderer.render(None, data, response_status=200)
+        bulk_body = fast_renderer.render(
+            None,
+            {"comments": [{"text": item["text"]} for item in data["items"][: settings.COMMENTS_BULK_MAX_SIZE]]},
+            response_status=200,
+        )
+        request = RequestFactory().post("/", data=bulk_body, content_type="application/json")
+        stdlib_parser, fast_parser = Parser(), FastJSONParser()
+
+        steps = {
+            "validate": validate,
+            "render json": lambda: stdlib_renderer.render(None, data, response_status=200),
+            "render orjson": lambda: fast_renderer.render(None, data, response_status=200),
+            "parse json": lambda: stdlib_parser.parse_body(request),
+            "parse orjson": lambda: fast_parser.parse_body(request),
+        }
+        results = {name: self._measure(step, options["repeat"]) for name, step in steps.items()}
+
+        self.stdout.write(
+            f"Listing of {options['comments']} comments: {len(body) / 1024:.0f} KiB, "
+            f"bulk creation body: {len(bulk_body) / 1024:.0f} KiB."
+        )
+        self.stdout.write(f"{'step':<14} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+        for step, latencies in results.items():
+            self.stdout.write(
+                f"{step:<14} {sum(latencies) / len(latencies):>9.2f} "
+                f"{self._percentile(latencies, 50):>9.2f} {self._percentile(latencies, 95):>9.2f}"
+            )
+
+        render_speedup = self._percentile(results["render json"], 50) / self._percentile(results["render orjson"], 50)
+        parse_speedup = self._percentile(results["parse json"], 50) / self._percentile(results["parse orjson"], 50)
+        self.stdout.write(
+            self.style.SUCCESS(f"orjson renders {render_speedup:.1f}x and parses {parse_speedup:.1f}x faster.")
+        )
+
+    @staticmethod
+    def _measure(step: Callable[[], object], count: int) -> List[float]:
+        """
+        Run a step repeatedly.
+
+        :return: duration of every run, in milliseconds.
+        """
+        latencies = []
+        for _ in range(count):
+            started = time.perf_counter()
+            step()
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies
+
+    @staticmethod
+    def _percentile(values: List[float], percentile: int) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * percentile / 100) - 1)]
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from api.comments.services import CommentCounterService
+
+
+class Command(BaseCommand):
+    """
+    Recompute the comment and reply counters from the comments table.
+    """
+
+    help = "Recompute the denormalized comment and reply counters that drifted from the comments table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to reconcile (defaults to the default database).",
+        )
+
+    def handle(self, *args, **options):
+        fixed_posts, fixed_comments = CommentCounterService.reconcile(using=options["database"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled comment counters of {fixed_posts} posts and {fixed_comments} comments.")
+        )
@@ -0,0 +1,72 @@
+# Generated by Django 5.1.2 on 2026-10-18 15:03
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+
+def backfill_comment_daily_stats(apps, schema_editor):
+    Comment = apps.get_model("comments", "Comment")
+    CommentDailyStat = apps.get_model("comments", "CommentDailyStat")
+    using = schema_editor.connection.alias
+
+    aggregates = (
+        Comment.objects.using(using)
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(
+            total_comments=Count("id"),
+            blocked_comments=Count("id", filter=Q(is_blocked=True)),
+        )
+        .order_by("day")
+    )
+    CommentDailyStat.objects.using(using).bulk_create(
+        [
+            CommentDailyStat(
+                date=entry["day"],
+                total_comments=entry["total_comments"],
+                blocked_comments=entry["blocked_comments"],
+            )
+            for entry in aggregates
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0003_rename_answer_to_comment_parent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CommentDailyStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(unique=True, verbose_name="date")),
+                (
+                    "total_comments",
+                    models.IntegerField(default=0, verbose_name="total comments"),
+                ),
+                (
+                    "blocked_comments",
+                    models.IntegerField(default=0, verbose_name="blocked comments"),
+                ),
+            ],
+            options={
+                "verbose_name": "Comment daily stat",
+                "verbose_name_plural": "Comment daily stats",
+                "ordering": ["date"],
+            },
+        ),
+        migrations.RunPython(backfill_comment_daily_stats, migrations.RunPython.noop),
+    ]
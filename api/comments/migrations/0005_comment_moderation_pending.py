@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-18 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0004_commentdailystat"),
+        ("posts", "0003_post_moderation_pending"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="moderation_pending",
+            field=models.BooleanField(default=False, verbose_name="moderation pending"),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("moderation_pending", True)),
+                fields=["id"],
+                name="comment_moderation_pending_idx",
+            ),
+        ),
+    ]
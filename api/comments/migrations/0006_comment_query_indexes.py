@@ -0,0 +1,32 @@
+# Generated by Django 5.1.2 on 2026-10-18 15:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0005_comment_moderation_pending"),
+        ("posts", "0003_post_moderation_pending"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("is_blocked", False)),
+                fields=["post", "-created_at", "-id"],
+                name="comment_post_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("is_blocked", False)),
+                fields=["parent", "-created_at", "-id"],
+                name="comment_parent_created_idx",
+            ),
+        ),
+    ]
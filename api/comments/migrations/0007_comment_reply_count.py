@@ -0,0 +1,47 @@
+# Generated by Django 5.1.2 on 2026-10-18 15:38
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_comments(apps, schema_editor):
+    """
+    Fill the comment and reply counters of the existing rows.
+    """
+    Comment = apps.get_model("comments", "Comment")
+    Post = apps.get_model("posts", "Post")
+    using = schema_editor.connection.alias
+
+    def visible_count(**filters):
+        counted = (
+            Comment.objects.using(using)
+            .filter(is_blocked=False, **filters)
+            .order_by()
+            .values(*filters)
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return Coalesce(Subquery(counted), 0)
+
+    Post.objects.using(using).update(comment_count=visible_count(post=OuterRef("pk")))
+    Comment.objects.using(using).update(reply_count=visible_count(parent=OuterRef("pk")))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0006_comment_query_indexes"),
+        ("posts", "0004_post_comment_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="reply_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="reply count"
+            ),
+        ),
+        migrations.RunPython(count_comments, migrations.RunPython.noop),
+    ]
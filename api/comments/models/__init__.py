@@ -1,8 +1,10 @@
 from .comment import Comment
+from .comment_daily_stat import CommentDailyStat
 from .manager import AvailableCommentsManager
 
 
 __all__ = [
     "Comment",
+    "CommentDailyStat",
     "AvailableCommentsManager",
 ]
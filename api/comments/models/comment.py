@@ -2,6 +2,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from api.comments.models.manager import AvailableCommentsManager
+from api.services.moderation_service import ModerationService
 from api.services.profanity_service import ProfanityFilter
 
 
@@ -17,6 +18,8 @@ class Comment(models.Model):
         - post(Post): The post that the comment belongs to.
         - parent(Comment): The comment that this comment is an answer to.
         - is_blocked(bool): A boolean that indicates if the comment is blocked.
+        - moderation_pending(bool): A boolean that indicates if the comment still awaits the profanity check.
+        - reply_count(int): The number of direct replies to the comment that are not blocked.
     """
 
     text = models.CharField(_("text"), max_length=255)
@@ -26,6 +29,8 @@ class Comment(models.Model):
     post = models.ForeignKey("posts.Post", on_delete=models.CASCADE)
     parent = models.ForeignKey("self", on_delete=models.CASCADE, null=True, blank=True)
     is_blocked = models.BooleanField(_("is blocked"), default=False)
+    moderation_pending = models.BooleanField(_("moderation pending"), default=False)
+    reply_count = models.PositiveIntegerField(_("reply count"), default=0, editable=False)
 
     objects = models.Manager()
     available = AvailableCommentsManager()
@@ -34,10 +39,38 @@ class Comment(models.Model):
         verbose_name = _("Comment")
         verbose_name_plural = _("Comments")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["post", "-created_at", "-id"],
+                condition=models.Q(is_blocked=False),
+                name="comment_post_created_idx",
+            ),
+            models.Index(
+                fields=["parent", "-created_at", "-id"],
+                condition=models.Q(is_blocked=False),
+                name="comment_parent_created_idx",
+            ),
+            models.Index(
+                fields=["id"],
+                condition=models.Q(moderation_pending=True),
+                name="comment_moderation_pending_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.text
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Create an instance from a database row, remembering the loaded blocked state.
+
+        The daily stats signals compare it with the saved state to count block changes.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_is_blocked = instance.__dict__.get("is_blocked")
+        return instance
+
     def save(
         self,
         *args,
@@ -57,9 +90,12 @@ class Comment(models.Model):
             - update_fields(list): A list of fields to update.
         """
 
-        profanity_filter = ProfanityFilter()
+        if ModerationService.is_async():
+            self.moderation_pending = True
+        else:
+            profanity_filter = ProfanityFilter()
 
-        if profanity_filter.is_profane(self.text):
-            self.is_blocked = True
+            if profanity_filter.is_profane(self.text):
+                self.is_blocked = True
 
         super().save(*args, force_insert, force_update, using, update_fields)
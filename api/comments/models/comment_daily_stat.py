@@ -0,0 +1,28 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class CommentDailyStat(models.Model):
+    """
+    Comment daily stat model class that holds pre-aggregated comment counters of a day.
+
+    Rows are maintained incrementally by the comment signals and can be rebuilt
+    with the backfill_comment_stats management command.
+
+    Attributes:
+        - date(date): The day the counters belong to.
+        - total_comments(int): The number of comments created that day.
+        - blocked_comments(int): The number of blocked comments created that day.
+    """
+
+    date = models.DateField(_("date"), unique=True)
+    total_comments = models.IntegerField(_("total comments"), default=0)
+    blocked_comments = models.IntegerField(_("blocked comments"), default=0)
+
+    class Meta:
+        verbose_name = _("Comment daily stat")
+        verbose_name_plural = _("Comment daily stats")
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"{self.date}: {self.total_comments} ({self.blocked_comments} blocked)"
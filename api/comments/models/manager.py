@@ -1,18 +1,51 @@
+from typing import Dict, Optional, Tuple
+
 from django.db import models
 
+from api.services.moderation_service import ModerationService
+
 
 class AvailableCommentsManager(models.Manager):
     """
     Manager for the Comment model that returns only comments that are not blocked.
 
+    Comments awaiting moderation are left out too when the pending policy hides them. The raw thread query
+    filters with the same visibility.
+
     Attributes:
+        - visibility (method): Returns the field values of the comments the manager returns.
+        - visibility_sql (method): Builds the visibility as SQL conditions for raw queries.
         - get_queryset (method): Returns the queryset of the manager.
     """
 
+    @staticmethod
+    def visibility() -> Dict[str, bool]:
+        """
+        Returns the field values of the comments the manager returns.
+
+        :return: value required for every filtered field.
+        """
+        visibility = {"is_blocked": False}
+        if ModerationService.hides_pending():
+            visibility["moderation_pending"] = False
+        return visibility
+
+    @classmethod
+    def visibility_sql(cls, alias: Optional[str] = None) -> Tuple[str, list]:
+        """
+        Builds the visibility as SQL conditions for raw queries.
+
+        :param alias: alias of the comments table, None for unqualified columns.
+        :return: conditions joined with AND, and their parameters.
+        """
+        prefix = f"{alias}." if alias else ""
+        visibility = cls.visibility()
+        return " AND ".join(f"{prefix}{field} = %s" for field in visibility), list(visibility.values())
+
     def get_queryset(self):
         """
         Returns the queryset of the manager.
 
         :return: queryset of the manager.
         """
-        return super().get_queryset().filter(is_blocked=False)
+        return super().get_queryset().filter(**self.visibility())
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import AsyncIterator, List, Optional, Tuple
 
 from api.comments.models import Comment
+from api.comments.schemas import CommentRow
 
 
 class CommentBaseRepository(ABC):
@@ -10,8 +11,15 @@ class CommentBaseRepository(ABC):
 
     The methods defined in this class are:
     - create: creates a new comment
+    - bulk_create: creates a batch of comments
     - get_by_id: retrieves a comment by its id
     - get_all_by_post_id: retrieves all comments related to a post
+    - get_page_versions_by_post_id: retrieves the versions of a page of comments related to a post
+    - get_page_rows_by_post_id: retrieves a page of comment rows related to a post
+    - stream_rows_by_post_id: iterates over the comment rows related to a post
+    - get_reply_versions: retrieves the versions of all replies to a comment
+    - get_reply_rows: retrieves the rows of all replies to a comment
+    - get_thread: retrieves a whole reply tree of a post or a comment
     - update: updates a comment
     - delete: deletes a comment
     """
@@ -20,6 +28,10 @@ class CommentBaseRepository(ABC):
     async def create(self, comment: dict, post_id: int, author_id: int) -> Comment:
         raise NotImplementedError
 
+    @abstractmethod
+    async def bulk_create(self, comments: List[dict], post_id: int, author_id: int) -> List[Comment]:
+        raise NotImplementedError
+
     @abstractmethod
     async def create_reply(self, comment: dict, post_id: int, comment_id: int, author_id: int) -> Comment:
         raise NotImplementedError
@@ -33,7 +45,31 @@ class CommentBaseRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def get_replies_by_comment(self, post_id: int, comment_id: int) -> List[Comment]:
+    async def get_page_versions_by_post_id(
+        self, post_id: int, cursor: Optional[str], limit: int
+    ) -> Tuple[List[tuple], bool]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_page_rows_by_post_id(
+        self, post_id: int, cursor: Optional[str], limit: int
+    ) -> Tuple[List[CommentRow], Optional[str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_rows_by_post_id(self, post_id: int, cursor: Optional[str]) -> AsyncIterator[CommentRow]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_reply_versions(self, post_id: int, comment_id: int) -> List[tuple]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_reply_rows(self, post_id: int, comment_id: int) -> List[CommentRow]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_thread(self, post_id: int, comment_id: Optional[int], depth: Optional[int]) -> List[Comment]:
         raise NotImplementedError
 
     @abstractmethod
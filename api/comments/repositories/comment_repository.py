@@ -1,38 +1,136 @@
-from typing import List
+from itertools import islice
+from typing import AsyncIterator, List, Optional, Tuple
 
 from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
 
-from api.comments.models import Comment
+from api.comments.models import AvailableCommentsManager, Comment
 from api.comments.repositories import CommentBaseRepository
-from api.services import UserService
+from api.comments.schemas import CommentRow
+from api.comments.services import CommentCounterService, CommentStatsService, CommentValidationService
+from api.metrics.instruments import instrument_repository
+from api.services import (
+    AuthorWriteService,
+    CursorPaginationService,
+    HttpCacheService,
+    ModerationService,
+    ProfanityFilter,
+)
 
 
+@instrument_repository("comment")
 class CommentRepository(CommentBaseRepository):
     """
     CommentRepository is a class that implements the methods defined in the CommentBaseRepository abstract class.
 
     The methods implemented in this class are:
     - create: creates a new comment
+    - bulk_create: creates a batch of comments
     - get_by_id: retrieves a comment by its id
     - get_all_by_post_id: retrieves all comments related to a post
+    - get_page_versions_by_post_id: retrieves the versions of a page of comments related to a post
+    - get_page_rows_by_post_id: retrieves a page of comment rows related to a post
+    - stream_rows_by_post_id: iterates over the comment rows related to a post
+    - get_reply_versions: retrieves the versions of all replies to a comment
+    - get_reply_rows: retrieves the rows of all replies to a comment
+    - get_thread: retrieves a whole reply tree of a post or a comment
     - update: updates a comment
     - delete: deletes a comment
+
+    The row methods select the fields of CommentResponseSchema only, into CommentRow objects, for the list
+    endpoints to render without building Comment instances and schemas.
+
+    Writes hand the surrogate keys of the responses they make stale to HttpCacheService.purge.
     """
 
+    STREAM_CHUNK_SIZE = 500
+
     async def create(self, comment: dict, post_id: int, author_id: int) -> Comment:
         """
-        Creates a new comment.
+        Creates a new comment, once the post is known to accept it.
 
         :param comment: dict with the comment data
         :param post_id: id of the post related to the comment
         :param author_id: id of the author of the comment
         :return: created object
         """
-        return await Comment.objects.acreate(author_id=author_id, post_id=post_id, **comment)
+        await CommentValidationService.validate(post_id)
+        try:
+            created_comment = await Comment.objects.acreate(author_id=author_id, post_id=post_id, **comment)
+        except IntegrityError:
+            await CommentValidationService.revalidate(post_id)
+            raise
+        await HttpCacheService.purge(self._listing_keys(post_id, parent_id=None))
+        return created_comment
+
+    async def bulk_create(self, comments: List[dict], post_id: int, author_id: int) -> List[Comment]:
+        """
+        Creates a batch of comments with batched inserts.
+
+        The whole batch is screened for profanity in one pass, or left to the moderation worker in async mode,
+        since bulk inserts skip Comment.save. The daily stats and the comment counters are updated in the same
+        transaction, since bulk inserts skip the signals too.
+
+        :param comments: list of dicts with the comment data
+        :param post_id: id of the post related to the comments
+        :param author_id: id of the author of the comments
+        :return: created objects, in the given order
+        """
+        if len(comments) > settings.COMMENTS_BULK_MAX_SIZE:
+            raise ValueError(f"At most {settings.COMMENTS_BULK_MAX_SIZE} comments can be created at once")
+
+        await CommentValidationService.validate(post_id)
+
+        moderation_pending = ModerationService.is_async()
+        if moderation_pending:
+            blocked_flags = [False] * len(comments)
+        else:
+            blocked_flags = ProfanityFilter().profane_flags([comment["text"] for comment in comments])
+
+        comments_to_create = [
+            Comment(
+                author_id=author_id,
+                post_id=post_id,
+                is_blocked=is_blocked,
+                moderation_pending=moderation_pending,
+                **comment,
+            )
+            for comment, is_blocked in zip(comments, blocked_flags)
+        ]
+
+        def create_batch() -> List[Comment]:
+            with transaction.atomic():
+                created_comments = Comment.objects.bulk_create(
+                    comments_to_create,
+                    batch_size=settings.COMMENTS_BULK_BATCH_SIZE,
+                )
+                deltas = {}
+                for created_comment in created_comments:
+                    day = CommentStatsService.day_of(created_comment.created_at)
+                    total_delta, blocked_delta = deltas.get(day, (0, 0))
+                    deltas[day] = (total_delta + 1, blocked_delta + int(created_comment.is_blocked))
+                CommentStatsService.record(deltas)
+                CommentCounterService.record(
+                    *CommentCounterService.deltas(
+                        (created_comment.post_id, created_comment.parent_id)
+                        for created_comment in created_comments
+                        if not created_comment.is_blocked
+                    )
+                )
+                return created_comments
+
+        try:
+            created_comments = await sync_to_async(create_batch)()
+        except IntegrityError:
+            await CommentValidationService.revalidate(post_id)
+            raise
+        await HttpCacheService.purge(self._listing_keys(post_id, parent_id=None))
+        return created_comments
 
     async def create_reply(self, comment: dict, post_id: int, comment_id: int, author_id: int) -> Comment:
         """
-        Creates a new reply to a comment.
+        Creates a new reply to a comment, once the post and the comment are known to accept it.
 
         :param comment: dict with the comment data
         :param post_id: id of the post related to the comment
@@ -40,7 +138,24 @@ class CommentRepository(CommentBaseRepository):
         :param author_id: id of the author of the comment
         :return:
         """
-        return await Comment.objects.acreate(author_id=author_id, post_id=post_id, parent_id=comment_id, **comment)
+        await CommentValidationService.validate(post_id, parent_id=comment_id)
+        reply = await Comment.objects.acreate(author_id=author_id, post_id=post_id, parent_id=comment_id, **comment)
+        await HttpCacheService.purge(self._listing_keys(post_id, parent_id=comment_id))
+        return reply
+
+    @staticmethod
+    def _listing_keys(post_id: int, parent_id: Optional[int]) -> List[str]:
+        """
+        Get the surrogate keys of the responses listing or counting the comments of a post, and of a parent comment.
+
+        :param post_id: id of the post related to the comment
+        :param parent_id: id of the comment replied to, None for a top-level comment
+        :return: surrogate keys
+        """
+        keys = [HttpCacheService.post_comments_key(post_id), HttpCacheService.post_key(post_id)]
+        if parent_id is not None:
+            keys.extend([HttpCacheService.comment_replies_key(parent_id), HttpCacheService.comment_key(parent_id)])
+        return keys
 
     async def get_by_id(self, post_id: int, comment_id: int) -> Comment:
         """
@@ -59,21 +174,137 @@ class CommentRepository(CommentBaseRepository):
         :param post_id: id of the post
         :return: list of comments
         """
-        return await sync_to_async(Comment.available.filter(post_id=post_id).all)()
+        return [comment async for comment in Comment.available.filter(post_id=post_id)]
+
+    async def get_page_rows_by_post_id(
+        self, post_id: int, cursor: Optional[str], limit: int
+    ) -> Tuple[List[CommentRow], Optional[str]]:
+        """
+        Retrieves a page of comment rows related to a post, newest first.
+
+        :param post_id: id of the post
+        :param cursor: cursor of the page, None for the first page
+        :param limit: page size
+        :return: comment rows of the page and the cursor of the next page
+        """
+        return await CursorPaginationService.paginate(
+            Comment.available.filter(post_id=post_id),
+            cursor=cursor,
+            limit=limit,
+            projection=CommentRow,
+        )
+
+    async def get_page_versions_by_post_id(
+        self, post_id: int, cursor: Optional[str], limit: int
+    ) -> Tuple[List[tuple], bool]:
+        """
+        Retrieves the versions of a page of comments related to a post, without loading the comments.
+
+        :param post_id: id of the post
+        :param cursor: cursor of the page, None for the first page
+        :param limit: page size
+        :return: id, updated_at and reply count of the comments of the page, and whether a next page follows
+        """
+        return await CursorPaginationService.versions(
+            Comment.available.filter(post_id=post_id),
+            cursor=cursor,
+            limit=limit,
+            counter="reply_count",
+        )
+
+    def stream_rows_by_post_id(self, post_id: int, cursor: Optional[str]) -> AsyncIterator[CommentRow]:
+        """
+        Iterates over the comment rows related to a post, newest first, fetching them in chunks.
+
+        The cursor is decoded right away, so an invalid one fails before anything is streamed. Chunks are
+        fetched from a sync iterator in a worker thread, as aiterator() of a values_list() queryset runs the
+        query in the event loop.
+
+        :param post_id: id of the post
+        :param cursor: cursor to start after, None to start from the newest comment
+        :return: async iterator of comment rows
+        """
+        queryset = CursorPaginationService.order(Comment.available.filter(post_id=post_id), cursor)
+        values = queryset.values_list(*CommentRow.FIELDS).iterator(chunk_size=self.STREAM_CHUNK_SIZE)
+        next_chunk = sync_to_async(lambda: list(islice(values, self.STREAM_CHUNK_SIZE)))
+
+        async def rows() -> AsyncIterator[CommentRow]:
+            while chunk := await next_chunk():
+                for row_values in chunk:
+                    yield CommentRow(*row_values)
+
+        return rows()
 
-    async def get_replies_by_comment(self, post_id: int, comment_id: int) -> List[Comment]:
+    async def get_reply_rows(self, post_id: int, comment_id: int) -> List[CommentRow]:
         """
-        Retrieves all replies to a comment.
+        Retrieves the rows of all replies to a comment.
 
         :param post_id: id of the post
         :param comment_id: id of the comment
+        :return: list of comment rows
+        """
+        queryset = Comment.available.filter(post_id=post_id, parent_id=comment_id)
+        return [CommentRow(*values) async for values in queryset.values_list(*CommentRow.FIELDS)]
+
+    async def get_reply_versions(self, post_id: int, comment_id: int) -> List[tuple]:
+        """
+        Retrieves the versions of all replies to a comment, without loading the replies.
+
+        :param post_id: id of the post
+        :param comment_id: id of the comment
+        :return: id, updated_at and reply count of the replies
+        """
+        queryset = Comment.available.filter(post_id=post_id, parent_id=comment_id)
+        return [version async for version in queryset.values_list("id", "updated_at", "reply_count")]
+
+    async def get_thread(self, post_id: int, comment_id: Optional[int], depth: Optional[int]) -> List[Comment]:
+        """
+        Retrieves a whole reply tree with a single recursive query.
+
+        Blocked comments, and comments awaiting moderation if the pending policy hides them,
+        are left out together with their replies. Every comment gets a depth
+        attribute, 0 for the roots, and parents always come before their replies.
+
+        :param post_id: id of the post
+        :param comment_id: id of the root comment, None to start from the top-level comments of the post
+        :param depth: number of reply levels to fetch below the roots, None for all of them
         :return: list of comments
         """
-        return await sync_to_async(Comment.available.filter(post_id=post_id, parent_id=comment_id).all)()
+        table = connection.ops.quote_name(Comment._meta.db_table)
+        root_visibility, root_params = AvailableCommentsManager.visibility_sql()
+        reply_visibility, reply_params = AvailableCommentsManager.visibility_sql("reply")
+        params = [post_id, *root_params]
+
+        if comment_id is None:
+            anchor = "parent_id IS NULL"
+        else:
+            anchor = "id = %s"
+            params.append(comment_id)
+
+        depth_condition = ""
+        params.extend(reply_params)
+        if depth is not None:
+            depth_condition = "AND thread.depth < %s"
+            params.append(depth)
+
+        sql = f"""
+            WITH RECURSIVE thread (id, depth) AS (
+                SELECT id, 0 FROM {table}
+                WHERE post_id = %s AND {root_visibility} AND {anchor}
+                UNION ALL
+                SELECT reply.id, thread.depth + 1 FROM {table} reply
+                JOIN thread ON reply.parent_id = thread.id
+                WHERE {reply_visibility} {depth_condition}
+            )
+            SELECT node.*, thread.depth FROM {table} node
+            JOIN thread ON node.id = thread.id
+            ORDER BY thread.depth, node.created_at DESC, node.id DESC
+        """
+        return [comment async for comment in Comment.objects.raw(sql, params)]
 
     async def update(self, comment: dict, post_id: int, comment_id: int, author_id: int) -> Comment:
         """
-        Updates a comment.
+        Updates a comment with a single statement checking the author too.
 
         :param comment: dict with the updated comment data
         :param post_id: id of the post related to the comment
@@ -81,32 +312,35 @@ class CommentRepository(CommentBaseRepository):
         :param author_id: id of the author of the comment
         :return: updated object
         """
-        user_service = UserService()
-        comment_to_update = await self.get_by_id(post_id=post_id, comment_id=comment_id)
-
-        await user_service.check_author_permission(
-            obj_author_id=comment_to_update.author_id,
+        updated_comment = await AuthorWriteService.update(
+            Comment.objects.filter(post_id=post_id),
+            pk=comment_id,
             author_id=author_id,
+            values=comment,
         )
-
-        await Comment.objects.filter(pk=comment_id).aupdate(**comment)
-        return await self.get_by_id(post_id=post_id, comment_id=comment_id)
+        await HttpCacheService.purge([HttpCacheService.comment_key(comment_id)])
+        return updated_comment
 
     async def delete(self, post_id: int, comment_id: int, author_id: int) -> Comment:
         """
-        Deletes a comment.
+        Deletes a comment, together with its replies.
+
+        The parent is looked up first, so the keys of the replies listing and the counter of the parent of a
+        deleted reply are purged too.
 
         :param post_id: id of the post related to the comment
         :param comment_id: id of the comment
         :param author_id: id of the author of the comment
         :return: deleted object
         """
-        user_service = UserService()
-        comment_to_delete = await self.get_by_id(post_id=post_id, comment_id=comment_id)
-
-        await user_service.check_author_permission(
-            obj_author_id=comment_to_delete.author_id,
-            author_id=author_id,
+        comments = Comment.objects.filter(post_id=post_id)
+        parent_id = await comments.filter(pk=comment_id).values_list("parent_id", flat=True).afirst()
+        deleted = await AuthorWriteService.delete(comments, pk=comment_id, author_id=author_id)
+        await HttpCacheService.purge(
+            [
+                HttpCacheService.comment_key(comment_id),
+                HttpCacheService.comment_replies_key(comment_id),
+                *self._listing_keys(post_id, parent_id=parent_id),
+            ]
         )
-
-        return await comment_to_delete.adelete()
+        return deleted
@@ -1,10 +1,20 @@
 from .comment_create_schema import CommentCreateSchema
+from .comment_bulk_create_schema import CommentBulkCreateSchema
 from .comment_response_schema import CommentResponseSchema
+from .comment_bulk_response_schema import CommentBulkResponseSchema
+from .comment_page_schema import CommentPageSchema
+from .comment_tree_schema import CommentTreeSchema
 from .comment_daily_schema import CommentDailyBreakdownSchema
+from .comment_row import CommentRow
 
 
 __all__ = [
     "CommentCreateSchema",
+    "CommentBulkCreateSchema",
     "CommentResponseSchema",
+    "CommentBulkResponseSchema",
+    "CommentPageSchema",
+    "CommentTreeSchema",
     "CommentDailyBreakdownSchema",
+    "CommentRow",
 ]
@@ -0,0 +1,16 @@
+from typing import List
+
+from ninja_schema import Schema
+
+from api.comments.schemas.comment_create_schema import CommentCreateSchema
+
+
+class CommentBulkCreateSchema(Schema):
+    """
+    Schema for creating a batch of comments.
+
+    Attributes:
+        - comments(List[CommentCreateSchema]): The comments to create.
+    """
+
+    comments: List[CommentCreateSchema]
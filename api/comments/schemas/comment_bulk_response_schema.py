@@ -0,0 +1,14 @@
+from typing import List
+
+from ninja_schema import Schema
+
+
+class CommentBulkResponseSchema(Schema):
+    """
+    Schema for the response of a batch of created comments.
+
+    Attributes:
+        - ids(List[int]): The IDs of the created comments, in the order they were sent.
+    """
+
+    ids: List[int]
@@ -0,0 +1,18 @@
+from typing import List, Optional
+
+from ninja_schema import Schema
+
+from api.comments.schemas.comment_response_schema import CommentResponseSchema
+
+
+class CommentPageSchema(Schema):
+    """
+    Comment page schema with the comments of a page and the cursor of the next one.
+
+    Attributes:
+        - items (List[CommentResponseSchema]): The comments of the page.
+        - next_cursor (str): The cursor of the next page, None on the last page.
+    """
+
+    items: List[CommentResponseSchema]
+    next_cursor: Optional[str] = None
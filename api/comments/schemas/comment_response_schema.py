@@ -13,6 +13,7 @@ class CommentResponseSchema(ModelSchema):
         - created_at(datetime): The date and time the comment was created.
         - updated_at(datetime): The date and time the comment was last updated.
         - is_blocked(bool): A boolean that indicates if the comment is blocked.
+        - reply_count(int): The number of direct replies to the comment that are not blocked.
     """
 
     class Config:
@@ -23,4 +24,5 @@ class CommentResponseSchema(ModelSchema):
             "created_at",
             "updated_at",
             "is_blocked",
+            "reply_count",
         ]
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import ClassVar, Tuple
+
+
+@dataclass(slots=True)
+class CommentRow:
+    """
+    Comment with the fields of CommentResponseSchema only, read with values_list instead of a Comment instance.
+
+    Attributes:
+        - FIELDS(tuple): The fields to select, in the order of the attributes.
+        - id(int): The ID of the comment.
+        - text(str): The text of the comment.
+        - created_at(datetime): The date and time the comment was created.
+        - updated_at(datetime): The date and time the comment was last updated.
+        - is_blocked(bool): A boolean that indicates if the comment is blocked.
+        - reply_count(int): The number of direct replies to the comment that are not blocked.
+    """
+
+    FIELDS: ClassVar[Tuple[str, ...]] = ("id", "text", "created_at", "updated_at", "is_blocked", "reply_count")
+
+    id: int
+    text: str
+    created_at: datetime
+    updated_at: datetime
+    is_blocked: bool
+    reply_count: int
+
+    @property
+    def pk(self) -> int:
+        return self.id
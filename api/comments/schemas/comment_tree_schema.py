@@ -0,0 +1,17 @@
+from typing import List
+
+from api.comments.schemas.comment_response_schema import CommentResponseSchema
+
+
+class CommentTreeSchema(CommentResponseSchema):
+    """
+    Comment tree schema class that represents a comment together with its nested replies.
+
+    Attributes:
+        - replies(List[CommentTreeSchema]): The replies to the comment, each with its own replies.
+    """
+
+    replies: List["CommentTreeSchema"] = []
+
+
+CommentTreeSchema.model_rebuild()
@@ -1,6 +1,14 @@
 from .analytics_service import AnalyticsService
+from .comment_counter_service import CommentCounterService
+from .comment_stats_service import CommentStatsService
+from .comment_tree_service import CommentTreeService
+from .comment_validation_service import CommentValidationService
 
 
 __all__ = [
     "AnalyticsService",
+    "CommentCounterService",
+    "CommentStatsService",
+    "CommentTreeService",
+    "CommentValidationService",
 ]
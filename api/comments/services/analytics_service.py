@@ -1,11 +1,9 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from asgiref.sync import sync_to_async
-from django.db.models import Q, Count, QuerySet
-from django.db.models.functions import TruncDate
+from django.db.models import Q
 
-from api.comments.models import Comment
+from api.comments.models import CommentDailyStat
 from api.comments.schemas import CommentDailyBreakdownSchema
 
 
@@ -15,8 +13,8 @@ class AnalyticsService:
 
     Attributes:
         - parse_dates (method): Parse the date strings into datetime objects.
-        - search_comments (method): Search for comments based on the date range.
-        - format_comments (method): Format the comments queryset into a list of dictionaries.
+        - fetch_comments (method): Search for the daily comment stats within the date range.
+        - format_comments (method): Format the daily comment stats into a list of schemas.
     """
 
     @staticmethod
@@ -43,48 +41,37 @@ class AnalyticsService:
     @staticmethod
     async def fetch_comments(
         date_from: Optional[datetime], date_to: Optional[datetime]
-    ) -> QuerySet:
+    ) -> List[CommentDailyStat]:
         """
-        Search for comments based on the date range.
+        Search for the daily comment stats within the date range, both ends included.
+
+        The stats are pre-aggregated, so this is a range read over one row per day.
 
         :param date_from: date_from filter
         :param date_to: date_to filter
-        :return: comments queryset
+        :return: daily comment stats
         """
-        query = Q()
+        query = Q(total_comments__gt=0)
         if date_from:
-            query &= Q(created_at__gte=date_from)
+            query &= Q(date__gte=date_from.date())
         if date_to:
-            query &= Q(created_at__lte=date_to)
+            query &= Q(date__lte=date_to.date())
 
-        return await sync_to_async(
-            lambda: (
-                Comment.objects.filter(query)
-                .annotate(date=TruncDate("created_at"))
-                .values("date")
-                .annotate(
-                    total_comments=Count("id"),
-                    blocked_comments=Count("id", filter=Q(is_blocked=True)),
-                )
-                .order_by("date")
-            )
-        )()
+        return [stat async for stat in CommentDailyStat.objects.filter(query).order_by("date")]
 
     @staticmethod
-    async def format_comments(comments: QuerySet):
+    async def format_comments(comments: List[CommentDailyStat]) -> List[CommentDailyBreakdownSchema]:
         """
-        Format the comments queryset into a list of dictionaries.
+        Format the daily comment stats into a list of schemas.
 
-        :param comments: comments queryset
-        :return: list of dictionaries
+        :param comments: daily comment stats
+        :return: list of daily breakdown schemas
         """
-        return await sync_to_async(
-            lambda: [
-                CommentDailyBreakdownSchema(
-                    date=entry["date"].strftime("%Y-%m-%d"),
-                    total_comments=entry["total_comments"],
-                    blocked_comments=entry["blocked_comments"],
-                )
-                for entry in comments
-            ]
-        )()
+        return [
+            CommentDailyBreakdownSchema(
+                date=stat.date.strftime("%Y-%m-%d"),
+                total_comments=stat.total_comments,
+                blocked_comments=stat.blocked_comments,
+            )
+            for stat in comments
+        ]
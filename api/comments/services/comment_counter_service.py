@@ -0,0 +1,101 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from api.comments.models import Comment
+from api.posts.models import Post
+from api.posts.services import PostCacheService
+
+
+class CommentCounterService:
+    """
+    Service class for the denormalized comment counters.
+
+    Every post counts its comments and replies that are not blocked, and every comment its direct replies
+    that are not blocked. The counters are moved with F() expressions, so concurrent writes never lose an
+    update, and they never go below 0, a drift being left to the reconcile_comment_counts command.
+
+    Attributes:
+        - deltas (method): Get the counter deltas of comments entering or leaving the counts.
+        - record (method): Apply counter deltas.
+        - reconcile (method): Recompute the counters that drifted from the comments table.
+    """
+
+    @staticmethod
+    def deltas(comments: Iterable[Tuple[int, Optional[int]]], sign: int = 1) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Get the counter deltas of comments entering or leaving the counts.
+
+        :param comments: post ID and parent ID of every comment
+        :param sign: 1 for comments entering the counts, -1 for comments leaving them
+        :return: deltas per post ID and deltas per parent comment ID
+        """
+        post_deltas: Dict[int, int] = {}
+        parent_deltas: Dict[int, int] = {}
+        for post_id, parent_id in comments:
+            post_deltas[post_id] = post_deltas.get(post_id, 0) + sign
+            if parent_id is not None:
+                parent_deltas[parent_id] = parent_deltas.get(parent_id, 0) + sign
+        return post_deltas, parent_deltas
+
+    @staticmethod
+    def record(post_deltas: Dict[int, int], parent_deltas: Dict[int, int], using: str = DEFAULT_DB_ALIAS) -> None:
+        """
+        Apply counter deltas with a single update per row, dropping the cached details of the posts and the
+        cached listing pages, which carry the comment counts too.
+
+        :param post_deltas: comment count deltas per post ID
+        :param parent_deltas: reply count deltas per comment ID
+        :param using: database alias
+        """
+        for post_id, delta in post_deltas.items():
+            if delta:
+                Post.objects.using(using).filter(pk=post_id).update(
+                    comment_count=Greatest(F("comment_count") + delta, Value(0))
+                )
+        for comment_id, delta in parent_deltas.items():
+            if delta:
+                Comment.objects.using(using).filter(pk=comment_id).update(
+                    reply_count=Greatest(F("reply_count") + delta, Value(0))
+                )
+
+        changed_post_ids = [post_id for post_id, delta in post_deltas.items() if delta]
+        if changed_post_ids:
+            post_cache_service = PostCacheService()
+            for post_id in changed_post_ids:
+                post_cache_service.forget_post(post_id)
+            post_cache_service.forget_listings()
+
+    @staticmethod
+    def _visible_count(**filters) -> Coalesce:
+        counted = (
+            Comment.objects.filter(is_blocked=False, **filters)
+            .order_by()
+            .values(*filters)
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return Coalesce(Subquery(counted), 0)
+
+    @classmethod
+    def reconcile(cls, using: str = DEFAULT_DB_ALIAS) -> Tuple[int, int]:
+        """
+        Recompute the counters that drifted from the comments table.
+
+        :param using: database alias
+        :return: number of posts and number of comments fixed
+        """
+        comment_count = cls._visible_count(post=OuterRef("pk"))
+        reply_count = cls._visible_count(parent=OuterRef("pk"))
+
+        with transaction.atomic(using=using):
+            fixed_posts = (
+                Post.objects.using(using).exclude(comment_count=comment_count).update(comment_count=comment_count)
+            )
+            fixed_comments = (
+                Comment.objects.using(using).exclude(reply_count=reply_count).update(reply_count=reply_count)
+            )
+
+        return fixed_posts, fixed_comments
@@ -0,0 +1,98 @@
+from datetime import date, datetime
+from typing import Dict, Tuple
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from api.comments.models import Comment, CommentDailyStat
+
+
+class CommentStatsService:
+    """
+    Service class for the pre-aggregated daily comment stats.
+
+    Attributes:
+        - day_of (method): Get the day a comment creation date belongs to.
+        - record (method): Apply counter deltas to the daily stats.
+        - backfill (method): Rebuild the daily stats from the comments table.
+    """
+
+    @staticmethod
+    def day_of(created_at: datetime) -> date:
+        """
+        Get the day a comment creation date belongs to, in the current time zone.
+
+        :param created_at: comment creation date
+        :return: day of the comment
+        """
+        if timezone.is_aware(created_at):
+            return timezone.localdate(created_at)
+        return created_at.date()
+
+    @staticmethod
+    def record(deltas: Dict[date, Tuple[int, int]], using: str = DEFAULT_DB_ALIAS) -> None:
+        """
+        Apply counter deltas to the daily stats with a single upsert per day.
+
+        :param deltas: mapping of day to (total comments delta, blocked comments delta)
+        :param using: database alias
+        """
+        connection = connections[using]
+        quote_name = connection.ops.quote_name
+        rows = [
+            (connection.ops.adapt_datefield_value(day), total_delta, blocked_delta)
+            for day, (total_delta, blocked_delta) in deltas.items()
+            if total_delta or blocked_delta
+        ]
+        if not rows:
+            return
+
+        table = quote_name(CommentDailyStat._meta.db_table)
+        day_column = quote_name("date")
+        total_column = quote_name("total_comments")
+        blocked_column = quote_name("blocked_comments")
+        sql = (
+            f"INSERT INTO {table} ({day_column}, {total_column}, {blocked_column}) VALUES (%s, %s, %s) "
+            f"ON CONFLICT ({day_column}) DO UPDATE SET "
+            f"{total_column} = {table}.{total_column} + EXCLUDED.{total_column}, "
+            f"{blocked_column} = {table}.{blocked_column} + EXCLUDED.{blocked_column}"
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+    @staticmethod
+    def backfill(using: str = DEFAULT_DB_ALIAS) -> int:
+        """
+        Rebuild the daily stats from the comments table.
+
+        :param using: database alias
+        :return: number of days written
+        """
+        aggregates = (
+            Comment.objects.using(using)
+            .annotate(day=TruncDate("created_at"))
+            .values("day")
+            .annotate(
+                total_comments=Count("id"),
+                blocked_comments=Count("id", filter=Q(is_blocked=True)),
+            )
+            .order_by("day")
+        )
+
+        with transaction.atomic(using=using):
+            CommentDailyStat.objects.using(using).all().delete()
+            stats = CommentDailyStat.objects.using(using).bulk_create(
+                [
+                    CommentDailyStat(
+                        date=entry["day"],
+                        total_comments=entry["total_comments"],
+                        blocked_comments=entry["blocked_comments"],
+                    )
+                    for entry in aggregates
+                ],
+                batch_size=500,
+            )
+
+        return len(stats)
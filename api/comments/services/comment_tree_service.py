@@ -0,0 +1,37 @@
+from typing import Dict, List
+
+from api.comments.models import Comment
+from api.comments.schemas import CommentTreeSchema
+
+
+class CommentTreeService:
+    """
+    Service class for assembling comment threads.
+
+    Attributes:
+        - build_tree (method): Nest a flat list of comments into reply trees.
+    """
+
+    @staticmethod
+    def build_tree(comments: List[Comment]) -> List[CommentTreeSchema]:
+        """
+        Nest a flat list of comments into reply trees in a single pass.
+
+        Parents must come before their replies, as returned by CommentRepository.get_thread.
+
+        :param comments: flat list of comments
+        :return: root comments with their nested replies
+        """
+        nodes: Dict[int, CommentTreeSchema] = {}
+        roots: List[CommentTreeSchema] = []
+
+        for comment in comments:
+            node = CommentTreeSchema.from_orm(comment)
+            nodes[comment.pk] = node
+            parent = nodes.get(comment.parent_id)
+            if parent is None:
+                roots.append(node)
+            else:
+                parent.replies.append(node)
+
+        return roots
@@ -0,0 +1,70 @@
+from typing import Optional
+
+from django.db.models import Exists, OuterRef
+
+from api.comments.models import Comment
+from api.posts.models import Post
+from api.posts.services import PostVisibilityService
+
+
+class CommentValidationService:
+    """
+    Service class for checking the targets of new comments before inserting them.
+
+    A comment needs a published post that is not blocked, and a reply needs a parent comment of that post
+    that is available too. The post and the parent are checked with a single query, and the visibility of
+    the post is cached per process, so a top-level comment on a known post costs no query at all. A post deleted
+    by another process can still be cached as visible, so an insert that breaks a constraint is checked again.
+
+    Attributes:
+        - validate (method): Check that a post, and a parent comment if any, accept a new comment.
+        - revalidate (method): Check that a post still exists after an insert of comments into it failed.
+    """
+
+    @classmethod
+    async def validate(cls, post_id: int, parent_id: Optional[int] = None) -> None:
+        """
+        Check that a post, and a parent comment if any, accept a new comment.
+
+        :param post_id: post ID.
+        :param parent_id: ID of the comment to reply to, None for a top-level comment.
+        """
+        visible = PostVisibilityService.get(post_id)
+        if visible is False:
+            cls._raise_missing(Post)
+
+        if parent_id is None:
+            if visible is None:
+                visible = await Post.published.filter(pk=post_id).aexists()
+                PostVisibilityService.set(post_id, visible)
+                if not visible:
+                    cls._raise_missing(Post)
+            return
+
+        parent_exists = await (
+            Post.published.filter(pk=post_id)
+            .annotate(parent_exists=Exists(Comment.available.filter(pk=parent_id, post_id=OuterRef("pk"))))
+            .values_list("parent_exists", flat=True)
+            .afirst()
+        )
+        PostVisibilityService.set(post_id, parent_exists is not None)
+        if parent_exists is None:
+            cls._raise_missing(Post)
+        if not parent_exists:
+            cls._raise_missing(Comment)
+
+    @classmethod
+    async def revalidate(cls, post_id: int) -> None:
+        """
+        Check that a post still exists after an insert of comments into it broke a constraint, dropping its cached
+        visibility.
+
+        :param post_id: post ID.
+        """
+        PostVisibilityService.forget(post_id)
+        if not await Post.objects.filter(pk=post_id).aexists():
+            cls._raise_missing(Post)
+
+    @staticmethod
+    def _raise_missing(model) -> None:
+        raise model.DoesNotExist(f"{model._meta.object_name} matching query does not exist.")
@@ -0,0 +1,69 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.comments.models import Comment
+from api.comments.services import CommentCounterService, CommentStatsService
+
+
+@receiver(post_save, sender=Comment, dispatch_uid="comments_daily_stats_on_save")
+def update_daily_stats_on_save(sender, instance: Comment, created: bool, using: str, **kwargs) -> None:
+    """
+    Count a created comment, or a block state change of an existing one, in the daily stats.
+    """
+    day = CommentStatsService.day_of(instance.created_at)
+    loaded_is_blocked = getattr(instance, "_loaded_is_blocked", None)
+
+    if created:
+        CommentStatsService.record({day: (1, int(instance.is_blocked))}, using=using)
+    elif loaded_is_blocked is not None and loaded_is_blocked != instance.is_blocked:
+        CommentStatsService.record({day: (0, 1 if instance.is_blocked else -1)}, using=using)
+
+
+@receiver(post_save, sender=Comment, dispatch_uid="comments_counters_on_save")
+def update_counters_on_save(sender, instance: Comment, created: bool, using: str, **kwargs) -> None:
+    """
+    Count a created comment that is not blocked, or a block state change of an existing one, in the counters.
+    """
+    loaded_is_blocked = getattr(instance, "_loaded_is_blocked", None)
+
+    if created:
+        sign = 0 if instance.is_blocked else 1
+    elif loaded_is_blocked is not None and loaded_is_blocked != instance.is_blocked:
+        sign = -1 if instance.is_blocked else 1
+    else:
+        sign = 0
+
+    if sign:
+        CommentCounterService.record(
+            *CommentCounterService.deltas([(instance.post_id, instance.parent_id)], sign=sign),
+            using=using,
+        )
+
+
+@receiver(post_save, sender=Comment, dispatch_uid="comments_remember_blocked_state")
+def remember_blocked_state(sender, instance: Comment, **kwargs) -> None:
+    """
+    Remember the saved blocked state, so the next save of the instance counts only its own change.
+    """
+    instance._loaded_is_blocked = instance.is_blocked
+
+
+@receiver(post_delete, sender=Comment, dispatch_uid="comments_daily_stats_on_delete")
+def update_daily_stats_on_delete(sender, instance: Comment, using: str, **kwargs) -> None:
+    """
+    Remove a deleted comment from the daily stats.
+    """
+    day = CommentStatsService.day_of(instance.created_at)
+    CommentStatsService.record({day: (-1, -int(instance.is_blocked))}, using=using)
+
+
+@receiver(post_delete, sender=Comment, dispatch_uid="comments_counters_on_delete")
+def update_counters_on_delete(sender, instance: Comment, using: str, **kwargs) -> None:
+    """
+    Remove a deleted comment that is not blocked from the counters, its cascaded replies included.
+    """
+    if not instance.is_blocked:
+        CommentCounterService.record(
+            *CommentCounterService.deltas([(instance.post_id, instance.parent_id)], sign=-1),
+            using=using,
+        )
@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, tag
+from django.utils import timezone
+from ninja_extra.testing import TestAsyncClient
+
+from api.comments.api import AnalyticsController
+from api.comments.factories import CommentFactory
+from api.comments.models import CommentDailyStat
+from api.posts.factories import PostFactory
+
+
+@tag("api")
+class AnalyticsControllerTest(TestCase):
+    async def test_get_comments_daily_breakdown_success(self):
+        post = await sync_to_async(PostFactory)()
+        await sync_to_async(CommentFactory.create_batch)(2, post=post)
+        await sync_to_async(CommentFactory)(post=post, is_blocked=True)
+        today = timezone.localdate()
+        await CommentDailyStat.objects.acreate(
+            date=today - timedelta(days=10),
+            total_comments=4,
+            blocked_comments=0,
+        )
+
+        client = TestAsyncClient(AnalyticsController)
+        response = await client.get(path="/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+        response = await client.get(path=f"/?date_from={today:%Y-%m-%d}&date_to={today:%Y-%m-%d}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            [{"date": f"{today:%Y-%m-%d}", "total_comments": 3, "blocked_comments": 1}],
+        )
+
+    async def test_get_comments_daily_breakdown_invalid_date(self):
+        client = TestAsyncClient(AnalyticsController)
+        response = await client.get(path="/?date_from=yesterday")
+        self.assertEqual(response.status_code, 500)
@@ -0,0 +1,287 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings, tag
+from ninja_extra.testing import TestAsyncClient
+from ninja_jwt.tokens import AccessToken
+
+from api.comments.api import CommentController
+from api.comments.factories import CommentFactory
+from api.comments.models import Comment
+from api.posts.factories import PostFactory
+from api.users.factories import UserFactory
+
+PURGED_KEYS = []
+
+
+def record_purge(keys):
+    PURGED_KEYS.extend(keys)
+
+
+@tag("api")
+class CommentControllerTest(TestCase):
+    async def test_bulk_create_comments_success(self):
+        user = await sync_to_async(UserFactory)()
+        post = await sync_to_async(PostFactory)(author=user)
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        client = TestAsyncClient(CommentController)
+        response = await client.post(
+            path=f"/posts/{post.id}/comments/bulk",
+            json={"comments": [{"text": "first"}, {"text": "second"}]},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            response.json()["ids"],
+            [comment.id async for comment in Comment.objects.filter(post=post).order_by("id")],
+        )
+
+    @override_settings(COMMENTS_BULK_MAX_SIZE=1)
+    async def test_bulk_create_comments_too_many(self):
+        user = await sync_to_async(UserFactory)()
+        post = await sync_to_async(PostFactory)(author=user)
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        client = TestAsyncClient(CommentController)
+        response = await client.post(
+            path=f"/posts/{post.id}/comments/bulk",
+            json={"comments": [{"text": "first"}, {"text": "second"}]},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_bulk_create_comments_unauthorized(self):
+        post = await sync_to_async(PostFactory)()
+        client = TestAsyncClient(CommentController)
+        response = await client.post(
+            path=f"/posts/{post.id}/comments/bulk",
+            json={"comments": [{"text": "first"}]},
+        )
+        self.assertEqual(response.status_code, 401)
+
+    async def test_create_comment_post_not_found(self):
+        user = await sync_to_async(UserFactory)()
+        post = await sync_to_async(PostFactory)(is_published=False)
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        client = TestAsyncClient(CommentController)
+        response = await client.post(
+            path=f"/posts/{post.id}/comments/",
+            json={"text": "first"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 404)
+        response = await client.post(
+            path=f"/posts/{post.id}/comments/bulk",
+            json={"comments": [{"text": "first"}]},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(await Comment.objects.filter(post=post).aexists())
+
+    async def test_create_reply_success(self):
+        user = await sync_to_async(UserFactory)()
+        parent = await sync_to_async(CommentFactory)()
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        client = TestAsyncClient(CommentController)
+        response = await client.post(
+            path=f"/posts/{parent.post_id}/comments/{parent.id}/replies",
+            json={"text": "reply"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(await Comment.objects.filter(parent=parent, text="reply").aexists())
+
+    async def test_create_reply_parent_not_found(self):
+        user = await sync_to_async(UserFactory)()
+        post = await sync_to_async(PostFactory)()
+        parent = await sync_to_async(CommentFactory)()
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        client = TestAsyncClient(CommentController)
+        response = await client.post(
+            path=f"/posts/{post.id}/comments/{parent.id}/replies",
+            json={"text": "reply"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()["detail"], "Comment not found")
+
+    async def test_get_comments_by_post_success(self):
+        post = await sync_to_async(PostFactory)()
+        await sync_to_async(CommentFactory.create_batch)(3, post=post)
+        await sync_to_async(CommentFactory)(post=post, is_blocked=True)
+        client = TestAsyncClient(CommentController)
+        response = await client.get(path=f"/posts/{post.id}/comments/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["items"]), 3)
+        self.assertIsNone(response.json()["next_cursor"])
+
+    async def test_get_comments_by_post_paginated(self):
+        post = await sync_to_async(PostFactory)()
+        comments = await sync_to_async(CommentFactory.create_batch)(5, post=post)
+        client = TestAsyncClient(CommentController)
+
+        seen_ids = []
+        next_cursor = ""
+        while next_cursor is not None:
+            response = await client.get(path=f"/posts/{post.id}/comments/?limit=2&cursor={next_cursor}")
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.json()["items"]), 2)
+            seen_ids += [comment["id"] for comment in response.json()["items"]]
+            next_cursor = response.json()["next_cursor"]
+
+        self.assertEqual(seen_ids, sorted((comment.id for comment in comments), reverse=True))
+
+    async def test_get_comments_by_post_stream(self):
+        post = await sync_to_async(PostFactory)()
+        comments = await sync_to_async(CommentFactory.create_batch)(3, post=post)
+        client = TestAsyncClient(CommentController)
+        response = await client.get(path=f"/posts/{post.id}/comments/?stream=true")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = response.content.decode().splitlines()
+        self.assertEqual(
+            [json.loads(line)["id"] for line in lines],
+            sorted((comment.id for comment in comments), reverse=True),
+        )
+
+    async def test_get_comments_by_post_invalid_cursor(self):
+        post = await sync_to_async(PostFactory)()
+        client = TestAsyncClient(CommentController)
+        response = await client.get(path=f"/posts/{post.id}/comments/?cursor=invalid")
+        self.assertEqual(response.status_code, 400)
+        response = await client.get(path=f"/posts/{post.id}/comments/?stream=true&cursor=invalid")
+        self.assertEqual(response.status_code, 400)
+
+    async def test_get_post_thread_success(self):
+        post = await sync_to_async(PostFactory)()
+        root = await sync_to_async(CommentFactory)(post=post)
+        reply = await sync_to_async(CommentFactory)(post=post, parent=root)
+        nested_reply = await sync_to_async(CommentFactory)(post=post, parent=reply)
+        await sync_to_async(CommentFactory)(post=post, parent=root, is_blocked=True)
+        other_root = await sync_to_async(CommentFactory)(post=post)
+        await sync_to_async(CommentFactory)()
+        client = TestAsyncClient(CommentController)
+
+        response = await client.get(path=f"/posts/{post.id}/comments/tree")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([comment["id"] for comment in response.json()], [other_root.id, root.id])
+        root_json = response.json()[1]
+        self.assertEqual([comment["id"] for comment in root_json["replies"]], [reply.id])
+        self.assertEqual(root_json["replies"][0]["replies"][0]["id"], nested_reply.id)
+
+        response = await client.get(path=f"/posts/{post.id}/comments/tree?depth=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[1]["replies"][0]["replies"], [])
+
+    async def test_get_comment_thread_success(self):
+        post = await sync_to_async(PostFactory)()
+        root = await sync_to_async(CommentFactory)(post=post)
+        reply = await sync_to_async(CommentFactory)(post=post, parent=root)
+        nested_reply = await sync_to_async(CommentFactory)(post=post, parent=reply)
+        client = TestAsyncClient(CommentController)
+
+        response = await client.get(path=f"/posts/{post.id}/comments/{reply.id}/tree")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["id"], reply.id)
+        self.assertEqual([comment["id"] for comment in response.json()["replies"]], [nested_reply.id])
+
+    async def test_get_comment_thread_not_found(self):
+        post = await sync_to_async(PostFactory)()
+        blocked = await sync_to_async(CommentFactory)(post=post, is_blocked=True)
+        client = TestAsyncClient(CommentController)
+        response = await client.get(path=f"/posts/{post.id}/comments/{blocked.id}/tree")
+        self.assertEqual(response.status_code, 404)
+        response = await client.get(path=f"/posts/{post.id}/comments/{blocked.id}/tree?depth=-1")
+        self.assertEqual(response.status_code, 400)
+
+    async def test_get_comments_by_post_not_modified(self):
+        post = await sync_to_async(PostFactory)()
+        comment = await sync_to_async(CommentFactory)(post=post)
+        client = TestAsyncClient(CommentController)
+        response = await client.get(path=f"/posts/{post.id}/comments/")
+        self.assertEqual(response["Cache-Control"], "public, max-age=0, s-maxage=10")
+        self.assertEqual(response["Surrogate-Key"], f"post-{post.id}-comments comment-{comment.id}")
+        etag = response["ETag"]
+
+        response = await client.get(path=f"/posts/{post.id}/comments/", META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 304)
+
+        await sync_to_async(CommentFactory)(post=post, parent=comment)
+        response = await client.get(path=f"/posts/{post.id}/comments/", META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["items"]), 2)
+
+    async def test_get_comments_by_post_modified_by_update(self):
+        user = await sync_to_async(UserFactory)()
+        post = await sync_to_async(PostFactory)()
+        comment = await sync_to_async(CommentFactory)(post=post, author=user)
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        client = TestAsyncClient(CommentController)
+        response = await client.get(path=f"/posts/{post.id}/comments/")
+        etag = response["ETag"]
+
+        response = await client.put(
+            path=f"/posts/{post.id}/comments/{comment.id}",
+            json={"text": "Updated text"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        response = await client.get(path=f"/posts/{post.id}/comments/", META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["items"][0]["text"], "Updated text")
+
+    async def test_get_replies_by_comment_not_modified(self):
+        post = await sync_to_async(PostFactory)()
+        comment = await sync_to_async(CommentFactory)(post=post)
+        reply = await sync_to_async(CommentFactory)(post=post, parent=comment)
+        client = TestAsyncClient(CommentController)
+        path = f"/posts/{post.id}/comments/{comment.id}/replies"
+        response = await client.get(path=path)
+        self.assertEqual(response["Surrogate-Key"], f"comment-{comment.id}-replies comment-{reply.id}")
+        etag = response["ETag"]
+
+        response = await client.get(path=path, META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 304)
+
+        await Comment.objects.filter(pk=reply.id).aupdate(is_blocked=True)
+        response = await client.get(path=path, META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+    @override_settings(SURROGATE_PURGE_HANDLER="api.comments.tests.api.test_comment.record_purge")
+    async def test_comment_writes_purge_surrogate_keys(self):
+        PURGED_KEYS.clear()
+        user = await sync_to_async(UserFactory)()
+        post = await sync_to_async(PostFactory)()
+        comment = await sync_to_async(CommentFactory)(post=post)
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        client = TestAsyncClient(CommentController)
+        response = await client.post(
+            path=f"/posts/{post.id}/comments/{comment.id}/replies",
+            json={"text": "reply"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            PURGED_KEYS,
+            [f"post-{post.id}-comments", f"post-{post.id}", f"comment-{comment.id}-replies", f"comment-{comment.id}"],
+        )
+
+        reply_id = response.json()["id"]
+        PURGED_KEYS.clear()
+        response = await client.delete(
+            path=f"/posts/{post.id}/comments/{reply_id}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(
+            PURGED_KEYS,
+            [
+                f"comment-{reply_id}",
+                f"comment-{reply_id}-replies",
+                f"post-{post.id}-comments",
+                f"post-{post.id}",
+                f"comment-{comment.id}-replies",
+                f"comment-{comment.id}",
+            ],
+        )
@@ -0,0 +1,73 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, tag
+
+from api.comments.factories import CommentFactory
+from api.comments.models import Comment
+from api.posts.factories import PostFactory
+from api.posts.models import Post
+
+
+@tag("models")
+class CommentCountersTestCase(TestCase):
+    """
+    Test case for the comment_count and reply_count counters maintenance.
+    """
+
+    def setUp(self):
+        self.post = PostFactory()
+
+    def get_counts(self, comment: Comment):
+        return (
+            Post.objects.values_list("comment_count", flat=True).get(pk=self.post.pk),
+            Comment.objects.values_list("reply_count", flat=True).get(pk=comment.pk),
+        )
+
+    def test_counters_follow_comment_changes(self):
+        """
+        Test that the counters follow reply creation, blocking, unblocking and deletion.
+        """
+        parent = CommentFactory(post=self.post)
+        reply = CommentFactory(post=self.post, parent=parent)
+        CommentFactory(post=self.post, parent=parent, is_blocked=True)
+        self.assertEqual(self.get_counts(parent), (2, 1))
+
+        reply = Comment.objects.get(pk=reply.pk)
+        reply.is_blocked = True
+        reply.save()
+        self.assertEqual(self.get_counts(parent), (1, 0))
+        reply.is_blocked = False
+        reply.save()
+        reply.save()
+        self.assertEqual(self.get_counts(parent), (2, 1))
+
+        reply.delete()
+        self.assertEqual(self.get_counts(parent), (1, 0))
+
+    def test_counters_follow_cascade_deletion(self):
+        """
+        Test that replies deleted along with their parent leave the post counter.
+        """
+        parent = CommentFactory(post=self.post)
+        CommentFactory.create_batch(2, post=self.post, parent=parent)
+        keep = CommentFactory(post=self.post)
+
+        parent.delete()
+        self.assertEqual(self.get_counts(keep), (1, 0))
+
+    def test_reconcile_comment_counts(self):
+        """
+        Test that the reconcile command fixes only the counters that drifted.
+        """
+        parent = CommentFactory(post=self.post)
+        CommentFactory(post=self.post, parent=parent)
+        CommentFactory(post=PostFactory())
+        Post.objects.filter(pk=self.post.pk).update(comment_count=7)
+        Comment.objects.filter(pk=parent.pk).update(reply_count=0)
+
+        output = StringIO()
+        call_command("reconcile_comment_counts", stdout=output)
+
+        self.assertEqual(self.get_counts(parent), (2, 1))
+        self.assertIn("1 posts and 1 comments", output.getvalue())
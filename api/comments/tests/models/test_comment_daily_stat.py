@@ -0,0 +1,68 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, tag
+from django.utils import timezone
+
+from api.comments.factories import CommentFactory
+from api.comments.models import Comment, CommentDailyStat
+from api.posts.factories import PostFactory
+
+
+@tag("models")
+class CommentDailyStatTestCase(TestCase):
+    """
+    Test case for the CommentDailyStat model maintenance.
+    """
+
+    def setUp(self):
+        self.post = PostFactory()
+
+    def get_today_stat(self) -> CommentDailyStat:
+        return CommentDailyStat.objects.get(date=timezone.localdate())
+
+    def test_stats_follow_comment_changes(self):
+        """
+        Test that the daily stats follow comment creation, blocking, unblocking and deletion.
+        """
+        comment = CommentFactory(post=self.post)
+        CommentFactory(post=self.post, is_blocked=True)
+        stat = self.get_today_stat()
+        self.assertEqual(stat.total_comments, 2)
+        self.assertEqual(stat.blocked_comments, 1)
+
+        comment = Comment.objects.get(pk=comment.pk)
+        comment.is_blocked = True
+        comment.save()
+        comment.is_blocked = False
+        comment.save()
+        comment.is_blocked = True
+        comment.save()
+        self.assertEqual(self.get_today_stat().blocked_comments, 2)
+
+        comment.delete()
+        stat = self.get_today_stat()
+        self.assertEqual(stat.total_comments, 1)
+        self.assertEqual(stat.blocked_comments, 1)
+
+    def test_stats_follow_cascade_deletion(self):
+        """
+        Test that comments deleted along with their post leave the daily stats.
+        """
+        CommentFactory.create_batch(3, post=self.post)
+        self.post.delete()
+        self.assertEqual(self.get_today_stat().total_comments, 0)
+
+    def test_backfill_comment_stats(self):
+        """
+        Test that the backfill command rebuilds the daily stats from the comments.
+        """
+        CommentFactory.create_batch(2, post=self.post)
+        CommentFactory(post=self.post, is_blocked=True)
+        CommentDailyStat.objects.all().delete()
+
+        call_command("backfill_comment_stats", stdout=StringIO())
+
+        stat = self.get_today_stat()
+        self.assertEqual(stat.total_comments, 3)
+        self.assertEqual(stat.blocked_comments, 1)
@@ -0,0 +1,112 @@
+import os
+import tempfile
+from typing import Tuple
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, TransactionTestCase, override_settings, tag
+from django.utils import timezone
+
+from api.comments.models import Comment, CommentDailyStat
+from api.comments.repositories import CommentRepository
+from api.posts.factories import PostFactory
+from api.posts.models import Post
+from api.posts.services import PostVisibilityService
+from api.users.factories import UserFactory
+
+
+@tag("repositories")
+class CommentRepositoryTestCase(TestCase):
+    """
+    Test case for the CommentRepository class.
+    """
+
+    def setUp(self):
+        file_descriptor, self.banned_words_file = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+            file.write("damn\n")
+
+    def tearDown(self):
+        os.remove(self.banned_words_file)
+
+    async def test_bulk_create_success(self):
+        """
+        Test that a batch of comments is created in order, with profane ones blocked and counted.
+        """
+        user = await sync_to_async(UserFactory)()
+        post = await sync_to_async(PostFactory)(author=user)
+        comment_repository = CommentRepository()
+        with override_settings(BANNED_WORDS_FILE=self.banned_words_file, COMMENTS_BULK_BATCH_SIZE=2):
+            comments = await comment_repository.bulk_create(
+                comments=[{"text": "first"}, {"text": "damn"}, {"text": "third"}],
+                post_id=post.pk,
+                author_id=user.pk,
+            )
+
+        self.assertEqual([comment.text for comment in comments], ["first", "damn", "third"])
+        self.assertTrue(all(comment.pk for comment in comments))
+        self.assertEqual(
+            [comment.is_blocked async for comment in Comment.objects.filter(post=post).order_by("id")],
+            [False, True, False],
+        )
+        stat = await CommentDailyStat.objects.aget(date=timezone.localdate())
+        self.assertEqual(stat.total_comments, 3)
+        self.assertEqual(stat.blocked_comments, 1)
+        await post.arefresh_from_db(fields=["comment_count"])
+        self.assertEqual(post.comment_count, 2)
+
+    async def test_bulk_create_too_many(self):
+        """
+        Test that a batch larger than the allowed size is rejected before anything is written.
+        """
+        user = await sync_to_async(UserFactory)()
+        post = await sync_to_async(PostFactory)(author=user)
+        comment_repository = CommentRepository()
+        with override_settings(COMMENTS_BULK_MAX_SIZE=1):
+            with self.assertRaises(ValueError):
+                await comment_repository.bulk_create(
+                    comments=[{"text": "first"}, {"text": "second"}],
+                    post_id=post.pk,
+                    author_id=user.pk,
+                )
+        self.assertFalse(await Comment.objects.filter(post=post).aexists())
+
+
+@tag("repositories")
+class CommentRepositoryDeletedPostTestCase(TransactionTestCase):
+    """
+    Test case for comments created on a post deleted by another process while its visibility was cached.
+
+    The inserts have to commit for the foreign key to be checked, hence the TransactionTestCase.
+    """
+
+    def setUp(self):
+        PostVisibilityService.clear()
+
+    def tearDown(self):
+        PostVisibilityService.clear()
+
+    async def _deleted_post(self) -> Tuple[int, int]:
+        user = await sync_to_async(UserFactory)()
+        post = await sync_to_async(PostFactory)(author=user)
+        PostVisibilityService.set(post.pk, True)
+        await Post.objects.filter(pk=post.pk).adelete()
+        PostVisibilityService.set(post.pk, True)
+        return post.pk, user.pk
+
+    async def test_create_on_deleted_post(self):
+        """
+        Test that a comment on a deleted post still cached as visible reports the post missing.
+        """
+        post_id, author_id = await self._deleted_post()
+        with self.assertRaises(Post.DoesNotExist):
+            await CommentRepository().create(comment={"text": "late"}, post_id=post_id, author_id=author_id)
+        self.assertIsNone(PostVisibilityService.get(post_id))
+
+    async def test_bulk_create_on_deleted_post(self):
+        """
+        Test that a batch of comments on a deleted post still cached as visible reports the post missing.
+        """
+        post_id, author_id = await self._deleted_post()
+        with self.assertRaises(Post.DoesNotExist):
+            await CommentRepository().bulk_create(comments=[{"text": "late"}], post_id=post_id, author_id=author_id)
+        self.assertFalse(await Comment.objects.filter(post_id=post_id).aexists())
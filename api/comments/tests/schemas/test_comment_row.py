@@ -0,0 +1,29 @@
+from django.test import TestCase, tag
+
+from api.comments.factories import CommentFactory
+from api.comments.models import Comment
+from api.comments.schemas import CommentResponseSchema, CommentRow
+from api.services import JSONResponseService
+
+
+@tag("schemas")
+class CommentRowTest(TestCase):
+    """
+    Test the CommentRow projection row.
+    """
+
+    def test_fields_match_the_response_schema(self):
+        """
+        Test that the row selects exactly the fields of CommentResponseSchema.
+        """
+        self.assertEqual(set(CommentRow.FIELDS), set(CommentResponseSchema.model_fields))
+
+    def test_renders_like_the_response_schema(self):
+        """
+        Test that a row read with values_list renders the same JSON as the schema of the comment.
+        """
+        comment = CommentFactory()
+        row = CommentRow(*Comment.objects.values_list(*CommentRow.FIELDS).get(pk=comment.pk))
+        schema = CommentResponseSchema.from_orm(comment)
+
+        self.assertEqual(JSONResponseService.render_line(row), JSONResponseService.render_line(schema.model_dump()))
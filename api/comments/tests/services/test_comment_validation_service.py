@@ -0,0 +1,68 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings, tag
+
+from api.comments.factories import CommentFactory
+from api.comments.models import Comment
+from api.comments.services import CommentValidationService
+from api.posts.factories import PostFactory
+from api.posts.models import Post
+from api.posts.services import PostVisibilityService
+
+
+@tag("services")
+class CommentValidationServiceTestCase(TestCase):
+    """
+    Test case for the CommentValidationService class.
+    """
+
+    def setUp(self):
+        PostVisibilityService.clear()
+
+    def tearDown(self):
+        PostVisibilityService.clear()
+
+    def test_validate_post_cached(self):
+        """
+        Test that the visibility of a post is queried once, then served from the cache.
+        """
+        post = PostFactory()
+        with self.assertNumQueries(1):
+            async_to_sync(CommentValidationService.validate)(post.pk)
+        with self.assertNumQueries(0):
+            async_to_sync(CommentValidationService.validate)(post.pk)
+
+    def test_validate_post_not_visible(self):
+        """
+        Test that missing, unpublished and blocked posts are rejected, the second time without a query.
+        """
+        unpublished = PostFactory(is_published=False)
+        blocked = PostFactory(is_blocked=True)
+        for post_id in (unpublished.pk, blocked.pk, 0):
+            with self.assertRaises(Post.DoesNotExist):
+                async_to_sync(CommentValidationService.validate)(post_id)
+            with self.assertNumQueries(0), self.assertRaises(Post.DoesNotExist):
+                async_to_sync(CommentValidationService.validate)(post_id, parent_id=1)
+
+    def test_validate_parent(self):
+        """
+        Test that a reply needs an available parent of the same post, checked with a single query.
+        """
+        post = PostFactory()
+        parent = CommentFactory(post=post)
+        other_comment = CommentFactory(post=PostFactory())
+        blocked = CommentFactory(post=post, is_blocked=True)
+        with self.assertNumQueries(1):
+            async_to_sync(CommentValidationService.validate)(post.pk, parent_id=parent.pk)
+        for parent_id in (other_comment.pk, blocked.pk):
+            with self.assertNumQueries(1), self.assertRaises(Comment.DoesNotExist):
+                async_to_sync(CommentValidationService.validate)(post.pk, parent_id=parent_id)
+
+    @override_settings(POST_VISIBILITY_CACHE_SIZE=1)
+    def test_cache_size(self):
+        """
+        Test that the least recently used posts are dropped beyond the cache size.
+        """
+        PostVisibilityService.set(1, True)
+        PostVisibilityService.set(2, False)
+        self.assertIsNone(PostVisibilityService.get(1))
+        self.assertFalse(PostVisibilityService.get(2))
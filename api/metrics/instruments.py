@@ -0,0 +1,87 @@
+import functools
+import inspect
+import time
+
+from api.metrics.registry import MetricsRegistry
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total",
+    "HTTP requests handled, by method, route and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests, by method and route.",
+    ["method", "route"],
+)
+REPOSITORY_CALLS = registry.counter(
+    "repository_calls_total",
+    "Repository method calls, by repository, method and outcome.",
+    ["repository", "method", "outcome"],
+)
+REPOSITORY_CALL_DURATION = registry.histogram(
+    "repository_call_duration_seconds",
+    "Time spent in repository methods, by repository and method.",
+    ["repository", "method"],
+)
+PROFANITY_CHECKS = registry.counter(
+    "profanity_checks_total",
+    "Texts checked for profanity, by result.",
+    ["result"],
+)
+PROFANITY_CHECK_DURATION = registry.histogram(
+    "profanity_check_duration_seconds",
+    "Time spent checking texts for profanity, by mode.",
+    ["mode"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+)
+JWT_AUTHENTICATIONS = registry.counter(
+    "jwt_authentications_total",
+    "JWT authentication attempts, by outcome.",
+    ["outcome"],
+)
+JWT_AUTHENTICATION_DURATION = registry.histogram(
+    "jwt_authentication_duration_seconds",
+    "Time spent authenticating JWT tokens.",
+)
+
+
+def instrument_repository(repository: str):
+    """
+    Class decorator counting and timing every public coroutine method of a repository.
+
+    :param repository: value of the repository label.
+    """
+
+    def timed(method_name: str, function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "success"
+            try:
+                return await function(*args, **kwargs)
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                REPOSITORY_CALL_DURATION.observe(
+                    time.perf_counter() - started, repository=repository, method=method_name
+                )
+                REPOSITORY_CALLS.inc(repository=repository, method=method_name, outcome=outcome)
+
+        return wrapper
+
+    def decorate(cls):
+        for name, attribute in list(vars(cls).items()):
+            if name.startswith("_"):
+                continue
+            if isinstance(attribute, (staticmethod, classmethod)):
+                if inspect.iscoroutinefunction(attribute.__func__):
+                    setattr(cls, name, type(attribute)(timed(name, attribute.__func__)))
+            elif inspect.iscoroutinefunction(attribute):
+                setattr(cls, name, timed(name, attribute))
+        return cls
+
+    return decorate
@@ -0,0 +1,45 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpRequest, HttpResponse
+
+from api.metrics.instruments import HTTP_REQUEST_DURATION, HTTP_REQUESTS
+
+
+class MetricsMiddleware:
+    """
+    Middleware counting and timing every request by method, URL pattern and status code.
+
+    Attributes:
+        - get_response (callable): The next handler in the middleware chain.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self._record(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self._record(request, response, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def _record(request: HttpRequest, response: HttpResponse, duration: float) -> None:
+        resolver_match = getattr(request, "resolver_match", None)
+        route = f"/{resolver_match.route}" if resolver_match else "<unresolved>"
+        HTTP_REQUESTS.inc(method=request.method, route=route, status=str(response.status_code))
+        HTTP_REQUEST_DURATION.observe(duration, method=request.method, route=route)
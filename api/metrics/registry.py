@@ -0,0 +1,330 @@
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+
+class MemoryValueStore:
+    """
+    Metric values of the current process, kept in memory.
+
+    Attributes:
+        - inc (method): Add an amount to a value.
+        - collect (method): Get every value.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, key: str, amount: float) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def collect(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class MmapValueStore:
+    """
+    Metric values shared by worker processes through memory-mapped files in a directory.
+
+    Every process writes to its own file only, so increments need no cross-process lock, and
+    reading the metrics sums the files of every process, the exited ones included, which keeps
+    counters monotonic across worker restarts.
+
+    A file starts with the number of bytes in use, followed by entries made of the key length,
+    the UTF-8 key padded to 8 bytes and the value as a double.
+
+    Attributes:
+        - directory (str): The directory holding a file per process.
+        - inc (method): Add an amount to a value.
+        - collect (method): Get every value, summed over every process.
+    """
+
+    INITIAL_SIZE = 64 * 1024
+    HEADER = struct.Struct("<I4x")
+    KEY_LENGTH = struct.Struct("<I")
+    VALUE = struct.Struct("<d")
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._pid: Optional[int] = None
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._positions: Dict[str, int] = {}
+        self._used = self.HEADER.size
+        self._lock = threading.Lock()
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"metrics_{pid}.db")
+
+    @classmethod
+    def _entries(cls, data, used: int) -> Iterable[Tuple[str, int]]:
+        """
+        Iterate over the keys of a file and the positions of their values.
+        """
+        position = cls.HEADER.size
+        while position < used:
+            (key_length,) = cls.KEY_LENGTH.unpack_from(data, position)
+            key_start = position + cls.KEY_LENGTH.size
+            value_position = key_start + key_length + (-(cls.KEY_LENGTH.size + key_length) % 8)
+            yield bytes(data[key_start : key_start + key_length]).decode(), value_position
+            position = value_position + cls.VALUE.size
+
+    def _open(self) -> None:
+        """
+        Map the file of the current process, again after a fork.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._pid = os.getpid()
+        self._file = open(self._path(self._pid), "a+b")
+        if os.fstat(self._file.fileno()).st_size < self.INITIAL_SIZE:
+            self._file.truncate(self.INITIAL_SIZE)
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+
+        (used,) = self.HEADER.unpack_from(self._mmap, 0)
+        self._used = used or self.HEADER.size
+        self._positions = dict(self._entries(self._mmap, self._used))
+
+    def _add_entry(self, key: str) -> int:
+        """
+        Append a key with a zero value, growing the file if needed.
+
+        :return: position of the value.
+        """
+        encoded = key.encode()
+        padding = -(self.KEY_LENGTH.size + len(encoded)) % 8
+        entry_size = self.KEY_LENGTH.size + len(encoded) + padding + self.VALUE.size
+
+        if self._used + entry_size > len(self._mmap):
+            size = len(self._mmap)
+            while self._used + entry_size > size:
+                size *= 2
+            self._mmap.close()
+            self._file.truncate(size)
+            self._mmap = mmap.mmap(self._file.fileno(), 0)
+
+        position = self._used
+        self.KEY_LENGTH.pack_into(self._mmap, position, len(encoded))
+        self._mmap[position + self.KEY_LENGTH.size : position + self.KEY_LENGTH.size + len(encoded)] = encoded
+        value_position = position + entry_size - self.VALUE.size
+        self.VALUE.pack_into(self._mmap, value_position, 0.0)
+
+        self._used += entry_size
+        self.HEADER.pack_into(self._mmap, 0, self._used)
+        self._positions[key] = value_position
+        return value_position
+
+    def inc(self, key: str, amount: float) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._open()
+            position = self._positions.get(key)
+            if position is None:
+                position = self._add_entry(key)
+            (value,) = self.VALUE.unpack_from(self._mmap, position)
+            self.VALUE.pack_into(self._mmap, position, value + amount)
+
+    def collect(self) -> Dict[str, float]:
+        values: Dict[str, float] = {}
+        for path in glob.glob(os.path.join(self.directory, "metrics_*.db")):
+            with open(path, "rb") as file:
+                data = file.read()
+            if len(data) < self.HEADER.size:
+                continue
+            (used,) = self.HEADER.unpack_from(data, 0)
+            for key, position in self._entries(data, used):
+                values[key] = values.get(key, 0.0) + self.VALUE.unpack_from(data, position)[0]
+        return values
+
+
+class Metric:
+    """
+    Base class of the metrics, identified in the store by their name, sample kind and labels.
+
+    Attributes:
+        - name (str): The name of the metric.
+        - documentation (str): The help text of the metric.
+        - label_names (Sequence[str]): The names of the labels every sample must have.
+    """
+
+    type_name = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, label_names: Sequence[str]):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def _key(self, kind: str, labels: dict, bound: Optional[str] = None) -> str:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects the labels {', '.join(self.label_names)}")
+        return json.dumps([self.name, kind, [str(labels[name]) for name in self.label_names], bound])
+
+
+class Counter(Metric):
+    """
+    A metric that only goes up.
+    """
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """
+        Add an amount to the counter.
+
+        :param amount: amount to add.
+        :param labels: label values.
+        """
+        self.registry.store.inc(self._key("total", labels), amount)
+
+
+class Histogram(Metric):
+    """
+    A metric counting observations in buckets, with their count and sum.
+
+    Attributes:
+        - buckets (Tuple[float]): The upper bounds of the buckets.
+    """
+
+    type_name = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        Record an observation.
+
+        :param value: observed value.
+        :param labels: label values.
+        """
+        store = self.registry.store
+        bound = next((bucket for bucket in self.buckets if value <= bucket), None)
+        store.inc(self._key("bucket", labels, "+Inf" if bound is None else repr(float(bound))), 1)
+        store.inc(self._key("sum", labels), value)
+        store.inc(self._key("count", labels), 1)
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the duration of a block, in seconds.
+
+        :param labels: label values.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+
+class MetricsRegistry:
+    """
+    A registry of metrics, rendered in the Prometheus text format.
+
+    The values go to memory, or to a memory-mapped file per process in the METRICS_DIR
+    directory when it is set, so that multi-process workers are aggregated when rendering.
+
+    Attributes:
+        - store (MemoryValueStore | MmapValueStore): The store of the metric values.
+        - counter (method): Register a counter.
+        - histogram (method): Register a histogram.
+        - render (method): Render every metric in the Prometheus text format.
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._store = None
+
+    @property
+    def store(self):
+        if self._store is None:
+            directory = getattr(settings, "METRICS_DIR", None)
+            self._store = MmapValueStore(directory) if directory else MemoryValueStore()
+        return self._store
+
+    @store.setter
+    def store(self, store) -> None:
+        self._store = store
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"The metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        """
+        Register a counter.
+        """
+        return self._register(Counter(self, name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """
+        Register a histogram.
+        """
+        return self._register(Histogram(self, name, documentation, label_names, buckets=buckets))
+
+    @staticmethod
+    def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+        if not names:
+            return ""
+        escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for value in values)
+        return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+    @staticmethod
+    def _format_value(value: float) -> str:
+        return str(int(value)) if float(value).is_integer() else repr(value)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text format.
+
+        :return: exposition text.
+        """
+        samples: Dict[str, Dict[tuple, Dict[Tuple[str, Optional[str]], float]]] = {}
+        for key, value in self.store.collect().items():
+            name, kind, label_values, bound = json.loads(key)
+            samples.setdefault(name, {}).setdefault(tuple(label_values), {})[(kind, bound)] = value
+
+        lines: List[str] = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type_name}")
+            for label_values, values in sorted(samples.get(name, {}).items()):
+                labels = self._format_labels(metric.label_names, label_values)
+                if isinstance(metric, Histogram):
+                    cumulative = 0.0
+                    for bound in [*map(lambda bucket: repr(float(bucket)), metric.buckets), "+Inf"]:
+                        cumulative += values.get(("bucket", bound), 0.0)
+                        bucket_labels = self._format_labels((*metric.label_names, "le"), (*label_values, bound))
+                        lines.append(f"{name}_bucket{bucket_labels} {self._format_value(cumulative)}")
+                    lines.append(f"{name}_sum{labels} {self._format_value(values.get(('sum', None), 0.0))}")
+                    lines.append(f"{name}_count{labels} {self._format_value(values.get(('count', None), 0.0))}")
+                else:
+                    lines.append(f"{name}{labels} {self._format_value(values.get(('total', None), 0.0))}")
+        return "\n".join(lines) + "\n"
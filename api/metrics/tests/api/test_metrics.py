@@ -0,0 +1,56 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings, tag
+from ninja_jwt.tokens import AccessToken
+
+from api.posts.factories import PostFactory
+from api.users.factories import UserFactory
+
+
+@tag("api")
+class MetricsViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    async def test_metrics_are_exported(self):
+        post = await sync_to_async(PostFactory)()
+        user = await sync_to_async(UserFactory)()
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        client = AsyncClient()
+        await client.get("/api/posts/")
+        await client.put(
+            f"/api/posts/{post.pk}",
+            data={"title": "Title", "content": "Content", "is_published": True},
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        response = await client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+
+        body = response.content.decode()
+        self.assertIn('http_requests_total{method="GET",route="/api/posts/",status="200"}', body)
+        self.assertIn('http_request_duration_seconds_bucket{method="GET",route="/api/posts/",le="+Inf"}', body)
+        self.assertIn(
+            'repository_calls_total{repository="post",method="get_published_page_rows",outcome="success"}', body
+        )
+        self.assertIn('repository_calls_total{repository="post",method="update",outcome="error"}', body)
+        self.assertIn('jwt_authentications_total{outcome="success"}', body)
+        self.assertIn("# TYPE profanity_check_duration_seconds histogram", body)
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.1"], METRICS_TOKEN="")
+    async def test_metrics_forbidden_outside_allowed_ips(self):
+        response = await AsyncClient().get("/metrics")
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_ALLOWED_IPS=[], METRICS_TOKEN="scrape-secret")
+    async def test_metrics_with_token(self):
+        client = AsyncClient()
+        response = await client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        self.assertEqual(response.status_code, 200)
+
+        response = await client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+        self.assertEqual(response.status_code, 403)
+        response = await client.get("/metrics")
+        self.assertEqual(response.status_code, 403)
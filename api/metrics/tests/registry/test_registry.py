@@ -0,0 +1,127 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, tag
+
+from api.metrics.registry import MemoryValueStore, MetricsRegistry, MmapValueStore
+
+
+@tag("metrics")
+class MetricsRegistryTestCase(SimpleTestCase):
+    """
+    Test case for the MetricsRegistry class.
+    """
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.registry.store = MemoryValueStore()
+
+    def test_render_counter(self):
+        """
+        Test that counters are rendered per label set, with escaped label values.
+        """
+        counter = self.registry.counter("jobs_total", "Jobs run.", ["queue"])
+        counter.inc(queue="default")
+        counter.inc(2, queue="default")
+        counter.inc(0.5, queue='say "hi"')
+
+        self.assertEqual(
+            self.registry.render(),
+            "# HELP jobs_total Jobs run.\n"
+            "# TYPE jobs_total counter\n"
+            'jobs_total{queue="default"} 3\n'
+            'jobs_total{queue="say \\"hi\\""} 0.5\n',
+        )
+
+    def test_render_histogram(self):
+        """
+        Test that histogram buckets are rendered cumulatively, with the sum and the count.
+        """
+        histogram = self.registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(3)
+
+        lines = self.registry.render().splitlines()
+        self.assertEqual(
+            lines[2:],
+            [
+                'latency_seconds_bucket{le="0.1"} 1',
+                'latency_seconds_bucket{le="1.0"} 2',
+                'latency_seconds_bucket{le="+Inf"} 3',
+                "latency_seconds_sum 3.55",
+                "latency_seconds_count 3",
+            ],
+        )
+
+    def test_labels_must_match(self):
+        """
+        Test that a sample with missing or unknown labels is rejected.
+        """
+        counter = self.registry.counter("jobs_total", "Jobs run.", ["queue"])
+        with self.assertRaises(ValueError):
+            counter.inc()
+        with self.assertRaises(ValueError):
+            counter.inc(queue="default", worker="1")
+        with self.assertRaises(ValueError):
+            self.registry.counter("jobs_total", "Jobs run again.")
+
+
+@tag("metrics")
+class MmapValueStoreTestCase(SimpleTestCase):
+    """
+    Test case for the MmapValueStore class.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_processes_are_aggregated(self):
+        """
+        Test that the values written by every process are summed.
+        """
+        with mock.patch("os.getpid", return_value=1001):
+            first_store = MmapValueStore(self.directory)
+            first_store.inc("a", 1)
+            first_store.inc("b", 2.5)
+        with mock.patch("os.getpid", return_value=1002):
+            second_store = MmapValueStore(self.directory)
+            second_store.inc("a", 4)
+
+        self.assertEqual(MmapValueStore(self.directory).collect(), {"a": 5.0, "b": 2.5})
+
+    def test_values_survive_reopening_and_growth(self):
+        """
+        Test that a store picks up its own file again and grows it when full.
+        """
+        keys = [f"metric_{index:04d}" * 8 for index in range(1000)]
+        with mock.patch("os.getpid", return_value=1001):
+            store = MmapValueStore(self.directory)
+            for key in keys:
+                store.inc(key, 1)
+            reopened_store = MmapValueStore(self.directory)
+            reopened_store.inc(keys[0], 1)
+
+        values = reopened_store.collect()
+        self.assertEqual(len(values), len(keys))
+        self.assertEqual(values[keys[0]], 2)
+        self.assertEqual(values[keys[-1]], 1)
+
+    def test_fork_gets_own_file(self):
+        """
+        Test that a store used from a forked process writes to the file of that process.
+        """
+        store = MmapValueStore(self.directory)
+        with mock.patch("os.getpid", return_value=1001):
+            store.inc("a", 1)
+        with mock.patch("os.getpid", return_value=1002):
+            store.inc("a", 1)
+
+        self.assertEqual(store.collect(), {"a": 2.0})
+        self.assertEqual(
+            sorted(os.listdir(self.directory)),
+            ["metrics_1001.db", "metrics_1002.db"],
+        )
@@ -0,0 +1,28 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from api.metrics.instruments import registry
+
+
+def is_allowed(request: HttpRequest) -> bool:
+    """
+    Check whether a request may read the metrics: it comes from an address of METRICS_ALLOWED_IPS, or it carries
+    METRICS_TOKEN as a bearer token.
+    """
+    if request.META.get("REMOTE_ADDR") in settings.METRICS_ALLOWED_IPS:
+        return True
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    return bool(settings.METRICS_TOKEN) and scheme == "Bearer" and hmac.compare_digest(token, settings.METRICS_TOKEN)
+
+
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    """
+    Export every metric in the Prometheus text format, aggregated over the worker processes, to allowed clients.
+    """
+    if not is_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type=registry.CONTENT_TYPE)
@@ -0,0 +1,20 @@
+from typing import cast
+
+from django.http import HttpRequest
+from ninja.parser import Parser
+from ninja.types import DictStrAny
+
+from api.renderers import orjson, uses_orjson
+
+
+class FastJSONParser(Parser):
+    """
+    Request body parser decoding with orjson, falling back to the stdlib json module of Parser.
+
+    orjson.JSONDecodeError is a json.JSONDecodeError, so malformed bodies are still answered with 400.
+    """
+
+    def parse_body(self, request: HttpRequest) -> DictStrAny:
+        if not uses_orjson():
+            return super().parse_body(request)
+        return cast(DictStrAny, orjson.loads(request.body))
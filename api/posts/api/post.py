@@ -1,26 +1,29 @@
-from typing import List
+from dataclasses import asdict
+from typing import List, Optional, Union
 
-from asgiref.sync import sync_to_async
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponse
 from ninja_extra import api_controller, route, status
 from ninja_extra import permissions
 from ninja_extra.exceptions import APIException
-from ninja_jwt.authentication import AsyncJWTAuth
 
 from api.posts.models import Post
 from api.posts.repositories.post_repository import PostRepository
-from api.posts.schemas import PostCreateSchema, PostResponseSchema
-from api.services import UserService
+from api.posts.schemas import PostCreateSchema, PostPageSchema, PostResponseSchema, PostTitleSchema
+from api.posts.services import PostCacheService
+from api.services import CursorPaginationService, HttpCacheService, JSONResponseService, UserService
+from api.users.authentication import UserJWTAuth
 
 
-@api_controller("/posts", tags=["posts"], auth=AsyncJWTAuth(), permissions=[permissions.IsAuthenticatedOrReadOnly])
+@api_controller("/posts", tags=["posts"], auth=UserJWTAuth(), permissions=[permissions.IsAuthenticatedOrReadOnly])
 class PostController:
     """
     Controller for user functionality.
 
     Attributes:
         - create_post (method): Create a new post.
-        - get_all_published_posts (method): Get all published posts.
+        - get_all_published_posts (method): Get a page of published posts.
+        - search_posts (method): Search the published posts.
+        - typeahead_posts (method): Autocomplete the titles of published posts.
         - get_post (method): Get a post by ID.
         - update_post (method): Update an existing post.
         - delete_post (method): Delete a post.
@@ -44,33 +47,157 @@ class PostController:
         except Exception as err:
             raise APIException(detail=str(err))
 
-    @route.get("/", response={status.HTTP_200_OK: List[PostResponseSchema]}, auth=None)
-    async def get_all_published_posts(self) -> List[PostResponseSchema]:
+    @route.get("/", response={status.HTTP_200_OK: PostPageSchema, status.HTTP_304_NOT_MODIFIED: None}, auth=None)
+    async def get_all_published_posts(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        cursor: Optional[str] = None,
+        limit: int = CursorPaginationService.DEFAULT_LIMIT,
+    ) -> Union[PostPageSchema, HttpResponse]:
         """
-        Get all published posts.
+        Get a page of published posts, newest first, or 304 Not Modified if the ETag sent is still current.
 
-        :return: published posts
+        :param request: http request object
+        :param response: temporal response object, carrying the caching headers
+        :param cursor: cursor of the page, returned as next_cursor by the previous page
+        :param limit: page size
+        :return: published posts of the page and the cursor of the next page
         """
         try:
+            post_cache_service = PostCacheService()
             post_repository = PostRepository()
-            posts = await post_repository.get_all_published()
-            posts_schema = await sync_to_async(lambda: [PostResponseSchema.from_orm(post) for post in posts])()
-            return posts_schema
+            cached_page = await post_cache_service.get_listing(cursor=cursor, limit=limit)
+            if cached_page is not None:
+                versions = [self._version(item) for item in cached_page["items"]]
+                has_next = cached_page["next_cursor"] is not None
+            elif HttpCacheService.is_conditional(request):
+                versions, has_next = await post_repository.get_published_page_versions(cursor=cursor, limit=limit)
+            else:
+                versions, has_next = None, False
+
+            if versions is not None:
+                keys = [HttpCacheService.POSTS_KEY, *(HttpCacheService.post_key(version[0]) for version in versions)]
+                etag = HttpCacheService.etag(versions, has_next=has_next)
+                not_modified = HttpCacheService.not_modified(request, etag, "posts", keys)
+                if not_modified is not None:
+                    return not_modified
+                if cached_page is not None:
+                    HttpCacheService.apply(response, etag, "posts", keys)
+                    return JSONResponseService.render(request, cached_page, response)
+
+            rows, next_cursor = await post_repository.get_published_page_rows(cursor=cursor, limit=limit)
+            versions = [(row.id, row.updated_at, row.comment_count) for row in rows]
+            keys = [HttpCacheService.POSTS_KEY, *(HttpCacheService.post_key(row.id) for row in rows)]
+            HttpCacheService.apply(
+                response, HttpCacheService.etag(versions, has_next=next_cursor is not None), "posts", keys
+            )
+            await post_cache_service.set_listing(
+                cursor=cursor,
+                limit=limit,
+                payload={"items": [asdict(row) for row in rows], "next_cursor": next_cursor},
+            )
+            return JSONResponseService.render(request, {"items": rows, "next_cursor": next_cursor}, response)
+
+        except ValueError as err:
+            exception = APIException(str(err))
+            exception.status_code = status.HTTP_400_BAD_REQUEST
+            raise exception
+
         except Exception as err:
             raise APIException(detail=str(err))
 
-    @route.get("/{post_id}", response={status.HTTP_200_OK: PostResponseSchema}, auth=None)
-    async def get_post(self, post_id: int) -> PostResponseSchema:
+    @route.get("/search", response={status.HTTP_200_OK: PostPageSchema}, auth=None)
+    async def search_posts(
+        self,
+        q: str,
+        cursor: Optional[str] = None,
+        limit: int = CursorPaginationService.DEFAULT_LIMIT,
+    ) -> PostPageSchema:
+        """
+        Search the published posts, best match first.
+
+        :param q: words to search for in the title and the content, all of them must match
+        :param cursor: cursor of the page, returned as next_cursor by the previous page
+        :param limit: page size
+        :return: matching posts of the page and the cursor of the next page
         """
-        Get a post by ID.
+        try:
+            post_repository = PostRepository()
+            posts, next_cursor = await post_repository.search_published(query=q, cursor=cursor, limit=limit)
+            return PostPageSchema(
+                items=[PostResponseSchema.from_orm(post) for post in posts],
+                next_cursor=next_cursor,
+            )
+
+        except ValueError as err:
+            exception = APIException(str(err))
+            exception.status_code = status.HTTP_400_BAD_REQUEST
+            raise exception
+
+        except Exception as err:
+            raise APIException(detail=str(err))
 
+    @route.get("/typeahead", response={status.HTTP_200_OK: List[PostTitleSchema]}, auth=None)
+    async def typeahead_posts(self, q: str, limit: int = 10) -> List[PostTitleSchema]:
+        """
+        Autocomplete the titles of published posts containing the text typed so far, anywhere in the title.
+
+        Text shorter than 3 characters only matches the start of a title, and gets the titles in alphabetical
+        order. Longer text gets the best titles among the first 5000 matches, not among all of them.
+
+        :param q: text typed so far
+        :param limit: number of titles to return, at most 20
+        :return: matching titles, the ones starting with the text first, then the shortest
+        """
+        post_repository = PostRepository()
+        titles = await post_repository.suggest_titles(query=q, limit=limit)
+        return [PostTitleSchema(id=post_id, title=title) for post_id, title in titles]
+
+    @route.get(
+        "/{post_id}",
+        response={status.HTTP_200_OK: PostResponseSchema, status.HTTP_304_NOT_MODIFIED: None},
+        auth=None,
+    )
+    async def get_post(
+        self, request: HttpRequest, response: HttpResponse, post_id: int
+    ) -> Union[PostResponseSchema, HttpResponse]:
+        """
+        Get a post by ID, or 304 Not Modified if the ETag sent is still current.
+
+        :param request: http request object
+        :param response: temporal response object, carrying the caching headers
         :param post_id: post ID
         :return: post
         """
         try:
+            post_cache_service = PostCacheService()
             post_repository = PostRepository()
+            keys = [HttpCacheService.post_key(post_id)]
+            cached_post = await post_cache_service.get_post(post_id=post_id)
+            if cached_post is not None:
+                version = self._version(cached_post)
+            elif HttpCacheService.is_conditional(request):
+                version = await post_repository.get_version(post_id=post_id)
+            else:
+                version = None
+
+            if version is not None:
+                etag = HttpCacheService.etag([version])
+                not_modified = HttpCacheService.not_modified(request, etag, "post", keys)
+                if not_modified is not None:
+                    return not_modified
+                if cached_post is not None:
+                    HttpCacheService.apply(response, etag, "post", keys)
+                    return cached_post
+
             post = await post_repository.get_by_id(post_id=post_id)
-            return PostResponseSchema.from_orm(post)
+            HttpCacheService.apply(
+                response, HttpCacheService.etag([(post.pk, post.updated_at, post.comment_count)]), "post", keys
+            )
+            post_schema = PostResponseSchema.from_orm(post)
+            await post_cache_service.set_post(post_id=post_id, payload=post_schema.dict())
+            return post_schema
 
         except Post.DoesNotExist:
             exception = APIException("Post not found")
@@ -80,6 +207,16 @@ class PostController:
         except Exception as err:
             raise APIException(detail=str(err))
 
+    @staticmethod
+    def _version(payload: dict) -> tuple:
+        """
+        Get the version of a cached post payload, as the repository gets it from the database.
+
+        :param payload: serialized post
+        :return: ID, updated_at and comment count of the post
+        """
+        return payload["id"], payload["updated_at"], payload["comment_count"]
+
     @route.put("/{post_id}", response={status.HTTP_200_OK: PostResponseSchema})
     async def update_post(self, request: HttpRequest, post_id: int, post_data: PostCreateSchema) -> PostResponseSchema:
         """
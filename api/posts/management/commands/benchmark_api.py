@@ -0,0 +1,453 @@
+import asyncio
+import json
+import math
+import random
+import time
+from contextvars import ContextVar
+from datetime import timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from api.comments.factories import CommentFactory
+from api.comments.models import Comment
+from api.comments.services import CommentStatsService
+from api.posts.factories import PostFactory
+from api.users.factories import UserFactory
+from api.users.services import TokenService
+
+API_PREFIX = "/api"
+USER_PASSWORD = "password"
+
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar("benchmark_request_queries", default=None)
+
+
+def count_queries(execute, sql, params, many, context):
+    """
+    Count a query against the request being benchmarked, if any.
+    """
+    counter = _request_queries.get()
+    if counter is not None:
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+class Scenario(NamedTuple):
+    """
+    A benchmarked endpoint.
+
+    Attributes:
+        - name (str): The name of the scenario in the report.
+        - method (str): The HTTP method.
+        - expected_status (int): The status code of a successful response.
+        - build (Callable): A function of the request index returning the path and the client keyword arguments.
+    """
+
+    name: str
+    method: str
+    expected_status: int
+    build: Callable[[int], tuple]
+
+
+class Command(BaseCommand):
+    """
+    Load test every API endpoint in-process and report its latency, throughput and query count.
+
+    A throwaway test database is created and seeded with the factories, then every scenario
+    sends its requests concurrently through the ASGI test client. The report can be saved as
+    JSON and compared against a previous run to catch regressions.
+    """
+
+    help = "Benchmark the latency, throughput and queries per request of every API endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20, help="Number of users to seed.")
+        parser.add_argument("--posts", type=int, default=200, help="Number of posts to seed.")
+        parser.add_argument("--comments", type=int, default=2000, help="Number of comments to seed.")
+        parser.add_argument("--requests", type=int, default=200, help="Number of requests per scenario.")
+        parser.add_argument("--concurrency", type=int, default=10, help="Number of requests in flight at once.")
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            help="Run only the scenarios starting with this name, may be repeated.",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Random seed of the dataset and the requests.")
+        parser.add_argument("--output", help="Write the report as JSON to this file.")
+        parser.add_argument("--compare", help="Compare the report with a JSON report of a previous run.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be positive.")
+
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as file:
+                baseline = json.load(file)
+
+        randomizer = random.Random(options["seed"])
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write(
+                f"Seeding {options['users']} users, {options['posts']} posts and {options['comments']} comments..."
+            )
+            dataset = self._seed(randomizer, options)
+            scenarios = self._scenarios(randomizer, dataset)
+            if options["scenarios"]:
+                scenarios = [
+                    scenario
+                    for scenario in scenarios
+                    if any(scenario.name.startswith(prefix) for prefix in options["scenarios"])
+                ]
+            cache.clear()
+
+            with connection.execute_wrapper(count_queries):
+                results = async_to_sync(self._run)(scenarios, options["requests"], options["concurrency"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            "meta": {
+                "created_at": timezone.now().isoformat(),
+                "vendor": connection.vendor,
+                "users": options["users"],
+                "posts": options["posts"],
+                "comments": options["comments"],
+                "requests": options["requests"],
+                "concurrency": options["concurrency"],
+            },
+            "scenarios": results,
+        }
+        self._print_report(results, baseline)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
+
+    @staticmethod
+    def _seed(randomizer: random.Random, options: dict) -> dict:
+        """
+        Seed users, posts and comments, plus spare posts and comments for the delete scenarios.
+
+        :return: seeded objects and the authentication header of every user.
+        """
+        users = UserFactory.create_batch(options["users"], password=USER_PASSWORD)
+        headers = {user.pk: {"Authorization": f"Bearer {TokenService.issue(user)[0]}"} for user in users}
+        posts = [PostFactory(author=randomizer.choice(users)) for _ in range(options["posts"])]
+        spare_posts = [PostFactory(author=randomizer.choice(users)) for _ in range(options["requests"])]
+
+        def build_comments(count: int, parents: Optional[List[Comment]] = None) -> List[Comment]:
+            comments = []
+            for _ in range(count):
+                parent = randomizer.choice(parents) if parents else None
+                comments.append(
+                    CommentFactory.build(
+                        author=randomizer.choice(users),
+                        post=parent.post if parent else randomizer.choice(posts),
+                        parent=parent,
+                    )
+                )
+            return Comment.objects.bulk_create(comments)
+
+        top_level_count = options["comments"] * 7 // 10
+        comments = build_comments(top_level_count)
+        comments += build_comments(options["comments"] - top_level_count, parents=comments)
+        spare_comments = build_comments(options["requests"])
+        CommentStatsService.backfill()
+
+        return {
+            "users": users,
+            "headers": headers,
+            "posts": posts,
+            "spare_posts": spare_posts,
+            "comments": comments,
+            "spare_comments": spare_comments,
+        }
+
+    @staticmethod
+    def _scenarios(randomizer: random.Random, dataset: dict) -> List[Scenario]:
+        """
+        Build a scenario for every endpoint, the ones deleting data last.
+        """
+        users, headers = dataset["users"], dataset["headers"]
+        posts, comments = dataset["posts"], dataset["comments"]
+        spare_posts, spare_comments = dataset["spare_posts"], dataset["spare_comments"]
+        today = timezone.now().date()
+
+        def json_body(data: dict, author_id: Optional[int] = None) -> dict:
+            kwargs = {"data": json.dumps(data), "content_type": "application/json"}
+            if author_id is not None:
+                kwargs["headers"] = headers[author_id]
+            return kwargs
+
+        def comment_path(comment: Comment, suffix: str = "") -> str:
+            return f"{API_PREFIX}/posts/{comment.post_id}/comments/{comment.pk}{suffix}"
+
+        def any_user_id() -> int:
+            return randomizer.choice(users).pk
+
+        return [
+            Scenario(
+                "auth.login",
+                "post",
+                200,
+                lambda index: (
+                    f"{API_PREFIX}/auth/login",
+                    json_body({"email": randomizer.choice(users).email, "password": USER_PASSWORD}),
+                ),
+            ),
+            Scenario("posts.list", "get", 200, lambda index: (f"{API_PREFIX}/posts/", {})),
+            Scenario(
+                "posts.detail",
+                "get",
+                200,
+                lambda index: (f"{API_PREFIX}/posts/{randomizer.choice(posts).pk}", {}),
+            ),
+            Scenario(
+                "comments.list",
+                "get",
+                200,
+                lambda index: (f"{API_PREFIX}/posts/{randomizer.choice(posts).pk}/comments/", {}),
+            ),
+            Scenario(
+                "comments.stream",
+                "get",
+                200,
+                lambda index: (
+                    f"{API_PREFIX}/posts/{randomizer.choice(posts).pk}/comments/",
+                    {"data": {"stream": "true"}},
+                ),
+            ),
+            Scenario("comments.detail", "get", 200, lambda index: (comment_path(randomizer.choice(comments)), {})),
+            Scenario(
+                "comments.replies",
+                "get",
+                200,
+                lambda index: (comment_path(randomizer.choice(comments), "/replies"), {}),
+            ),
+            Scenario(
+                "comments.post_tree",
+                "get",
+                200,
+                lambda index: (f"{API_PREFIX}/posts/{randomizer.choice(posts).pk}/comments/tree", {}),
+            ),
+            Scenario(
+                "comments.comment_tree",
+                "get",
+                200,
+                lambda index: (comment_path(randomizer.choice(comments), "/tree"), {}),
+            ),
+            Scenario(
+                "analytics.daily_breakdown",
+                "get",
+                200,
+                lambda index: (
+                    f"{API_PREFIX}/comments-daily-breakdown/",
+                    {"data": {"date_from": str(today - timedelta(days=30)), "date_to": str(today)}},
+                ),
+            ),
+            Scenario(
+                "users.register",
+                "post",
+                201,
+                lambda index: (
+                    f"{API_PREFIX}/users/register",
+                    json_body(
+                        {
+                            "first_name": "Bench",
+                            "last_name": "Mark",
+                            "email": f"benchmark{index}@example.com",
+                            "password": USER_PASSWORD,
+                        }
+                    ),
+                ),
+            ),
+            Scenario(
+                "posts.create",
+                "post",
+                201,
+                lambda index: (
+                    f"{API_PREFIX}/posts/",
+                    json_body(
+                        {"title": f"Post {index}", "content": "Benchmark content", "is_published": True},
+                        author_id=any_user_id(),
+                    ),
+                ),
+            ),
+            Scenario(
+                "posts.update",
+                "put",
+                200,
+                lambda index: (
+                    lambda post: (
+                        f"{API_PREFIX}/posts/{post.pk}",
+                        json_body(
+                            {"title": f"Updated {index}", "content": "Updated content", "is_published": True},
+                            author_id=post.author_id,
+                        ),
+                    )
+                )(randomizer.choice(posts)),
+            ),
+            Scenario(
+                "comments.create",
+                "post",
+                201,
+                lambda index: (
+                    f"{API_PREFIX}/posts/{randomizer.choice(posts).pk}/comments/",
+                    json_body({"text": f"Comment {index}"}, author_id=any_user_id()),
+                ),
+            ),
+            Scenario(
+                "comments.bulk_create",
+                "post",
+                201,
+                lambda index: (
+                    f"{API_PREFIX}/posts/{randomizer.choice(posts).pk}/comments/bulk",
+                    json_body(
+                        {"comments": [{"text": f"Comment {index}.{number}"} for number in range(50)]},
+                        author_id=any_user_id(),
+                    ),
+                ),
+            ),
+            Scenario(
+                "comments.reply",
+                "post",
+                201,
+                lambda index: (
+                    comment_path(randomizer.choice(comments), "/replies"),
+                    json_body({"text": f"Reply {index}"}, author_id=any_user_id()),
+                ),
+            ),
+            Scenario(
+                "comments.update",
+                "put",
+                200,
+                lambda index: (
+                    lambda comment: (
+                        comment_path(comment),
+                        json_body({"text": f"Updated {index}"}, author_id=comment.author_id),
+                    )
+                )(randomizer.choice(comments)),
+            ),
+            Scenario(
+                "comments.delete",
+                "delete",
+                204,
+                lambda index: (
+                    comment_path(spare_comments[index]),
+                    {"headers": headers[spare_comments[index].author_id]},
+                ),
+            ),
+            Scenario(
+                "posts.delete",
+                "delete",
+                204,
+                lambda index: (
+                    f"{API_PREFIX}/posts/{spare_posts[index].pk}",
+                    {"headers": headers[spare_posts[index].author_id]},
+                ),
+            ),
+        ]
+
+    async def _run(self, scenarios: List[Scenario], requests: int, concurrency: int) -> Dict[str, dict]:
+        """
+        Run every scenario in turn, with its requests sent concurrently.
+
+        :return: results per scenario.
+        """
+        client = AsyncClient()
+        results = {}
+        for scenario in scenarios:
+            self.stdout.write(f"Running {scenario.name}...")
+            results[scenario.name] = await self._run_scenario(client, scenario, requests, concurrency)
+        return results
+
+    @staticmethod
+    async def _run_scenario(client: AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> dict:
+        """
+        Send the requests of a scenario, at most `concurrency` of them at once.
+
+        :return: latency percentiles in milliseconds, requests per second, mean queries per request and errors.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies, query_counts = [], []
+        errors = 0
+
+        async def send(index: int) -> None:
+            nonlocal errors
+            path, kwargs = scenario.build(index)
+            async with semaphore:
+                counter = [0]
+                token = _request_queries.set(counter)
+                started = time.perf_counter()
+                try:
+                    response = await getattr(client, scenario.method)(path, **kwargs)
+                    if response.streaming:
+                        async for _ in response.streaming_content:
+                            pass
+                finally:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    _request_queries.reset(token)
+                query_counts.append(counter[0])
+                if response.status_code != scenario.expected_status:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send(index) for index in range(requests)))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            "requests": requests,
+            "errors": errors,
+            "p50_ms": round(Command._percentile(latencies, 50), 3),
+            "p95_ms": round(Command._percentile(latencies, 95), 3),
+            "p99_ms": round(Command._percentile(latencies, 99), 3),
+            "requests_per_second": round(requests / elapsed, 1),
+            "queries_per_request": round(sum(query_counts) / len(query_counts), 2),
+        }
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], percent: float) -> float:
+        """
+        Nearest-rank percentile of sorted values.
+        """
+        rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+        return sorted_values[rank - 1]
+
+    def _print_report(self, results: Dict[str, dict], baseline: Optional[dict]) -> None:
+        """
+        Print the results as a table, with the change of p95 and throughput against a baseline if given.
+        """
+        header = f"{'scenario':<28}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'queries':>10}{'errors':>8}"
+        if baseline:
+            header += f"{'p95 diff':>11}{'req/s diff':>12}"
+        self.stdout.write(self.style.MIGRATE_HEADING(header))
+
+        for name, result in results.items():
+            line = (
+                f"{name:<28}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+                f"{result['requests_per_second']:>10.1f}{result['queries_per_request']:>10.2f}{result['errors']:>8}"
+            )
+            previous = (baseline or {}).get("scenarios", {}).get(name)
+            if previous:
+                p95_change = self._change(previous["p95_ms"], result["p95_ms"])
+                throughput_change = self._change(previous["requests_per_second"], result["requests_per_second"])
+                line += f"{p95_change:>11}{throughput_change:>12}"
+            self.stdout.write(self.style.ERROR(line) if result["errors"] else line)
+
+    @staticmethod
+    def _change(previous: float, current: float) -> str:
+        if not previous:
+            return "n/a"
+        return f"{(current - previous) / previous * 100:+.1f}%"
@@ -0,0 +1,160 @@
+import asyncio
+import math
+import random
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from api.comments.factories import CommentFactory
+from api.comments.models import Comment
+from api.comments.schemas import CommentResponseSchema
+from api.posts.factories import PostFactory
+from api.users.factories import UserFactory
+
+
+class Command(BaseCommand):
+    """
+    Compare the list read paths wrapping the whole ORM call in sync_to_async with the native async iteration.
+
+    The old path runs the query and the serialization of the rows in the thread-sensitive executor, a single
+    thread per thread-sensitive context. The ASGI handler gives every request a context of its own, here all
+    reads share one, as the sync calls of a request do. The native path only runs the fetches of the chunks
+    there and serializes on the event loop. Next to the latency of the reads, a probe measures how long any
+    other sync_to_async call of the same context has to wait for that thread meanwhile.
+    """
+
+    help = "Benchmark list reads through sync_to_async against native async queryset iteration."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=50, help="Number of posts to seed.")
+        parser.add_argument("--comments", type=int, default=10000, help="Number of comments to seed.")
+        parser.add_argument("--requests", type=int, default=200, help="Number of reads per path.")
+        parser.add_argument("--concurrency", type=int, default=20, help="Number of reads in flight at once.")
+        parser.add_argument("--chunk-size", type=int, default=100, help="Chunk size of the aiterator path.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed of the dataset and the reads.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("--requests, --concurrency and --chunk-size must be positive.")
+
+        randomizer = random.Random(options["seed"])
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write(f"Seeding {options['posts']} posts and {options['comments']} comments...")
+            post_ids = self._seed(randomizer, options["posts"], options["comments"])
+            results = async_to_sync(self._run)(randomizer, post_ids, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'path':<16} {'p50 ms':>9} {'p95 ms':>9} {'req/s':>9} {'wait p50':>9} {'wait p95':>9}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<16} {result['p50']:>9.2f} {result['p95']:>9.2f} {result['throughput']:>9.1f} "
+                f"{result['wait_p50']:>9.2f} {result['wait_p95']:>9.2f}"
+            )
+
+    @staticmethod
+    def _seed(randomizer: random.Random, post_count: int, comment_count: int) -> List[int]:
+        """
+        Seed posts with comments spread over them.
+
+        :return: IDs of the posts.
+        """
+        users = UserFactory.create_batch(5)
+        posts = [PostFactory(author=randomizer.choice(users)) for _ in range(post_count)]
+        Comment.objects.bulk_create(
+            [
+                CommentFactory.build(author=randomizer.choice(users), post=randomizer.choice(posts))
+                for _ in range(comment_count)
+            ],
+            batch_size=500,
+        )
+        return [post.pk for post in posts]
+
+    @staticmethod
+    def _paths(chunk_size: int) -> Dict[str, Callable[[int], Awaitable[list]]]:
+        """
+        Build the read paths, each returning the serialized comments of a post.
+        """
+
+        async def wrapped(post_id: int) -> list:
+            queryset = Comment.available.filter(post_id=post_id)
+            return await sync_to_async(
+                lambda: [CommentResponseSchema.from_orm(comment).dict() for comment in queryset]
+            )()
+
+        async def native(post_id: int) -> list:
+            comments = [comment async for comment in Comment.available.filter(post_id=post_id)]
+            return [CommentResponseSchema.from_orm(comment).dict() for comment in comments]
+
+        async def chunked(post_id: int) -> list:
+            queryset = Comment.available.filter(post_id=post_id)
+            return [CommentResponseSchema.from_orm(comment).dict() async for comment in queryset.aiterator(chunk_size)]
+
+        return {"sync_to_async": wrapped, "async_for": native, "aiterator": chunked}
+
+    async def _run(self, randomizer: random.Random, post_ids: List[int], options: dict) -> Dict[str, dict]:
+        """
+        Run the reads of every path in turn, with a probe of the thread-sensitive executor alongside.
+
+        :return: results per path.
+        """
+        results = {}
+        for name, path in self._paths(options["chunk_size"]).items():
+            self.stdout.write(f"Running {name}...")
+            targets = [randomizer.choice(post_ids) for _ in range(options["requests"])]
+            results[name] = await self._run_path(path, targets, options["concurrency"])
+        return results
+
+    @classmethod
+    async def _run_path(cls, path: Callable[[int], Awaitable[list]], targets: List[int], concurrency: int) -> dict:
+        """
+        Send the reads of a path, at most `concurrency` of them at once.
+
+        :return: read latency percentiles and probe wait percentiles in milliseconds, and reads per second.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies, waits = [], []
+        done = asyncio.Event()
+
+        async def read(post_id: int) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                await path(post_id)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        async def probe() -> None:
+            while not done.is_set():
+                started = time.perf_counter()
+                await sync_to_async(lambda: None)()
+                waits.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.001)
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(read(post_id) for post_id in targets))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+        return {
+            "p50": cls._percentile(latencies, 50),
+            "p95": cls._percentile(latencies, 95),
+            "throughput": len(targets) / elapsed,
+            "wait_p50": cls._percentile(waits, 50),
+            "wait_p95": cls._percentile(waits, 95),
+        }
+
+    @staticmethod
+    def _percentile(values: List[float], percentile: int) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * percentile / 100) - 1)]
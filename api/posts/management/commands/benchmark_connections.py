@@ -0,0 +1,83 @@
+import math
+import time
+from typing import Callable, List
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    """
+    Measure what opening a database connection adds to a request, under the current connection settings.
+
+    Every simulated request runs a trivial query. In the "reconnect" mode the connection is closed after
+    every request, as with CONN_MAX_AGE=0 and no pool, in the "reuse" mode it is kept open, as with
+    persistent connections. With the psycopg pool enabled, closing hands the connection back to the pool,
+    so the "reconnect" mode measures a pool checkout instead of a new connection.
+    """
+
+    help = "Benchmark the connection setup cost per request, with and without connection reuse."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="Number of simulated requests per mode.")
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to benchmark (defaults to the default database).",
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be positive.")
+
+        connection = connections[options["database"]]
+        pool = connection.settings_dict.get("OPTIONS", {}).get("pool")
+        self.stdout.write(
+            f"{connection.vendor}, CONN_MAX_AGE={connection.settings_dict['CONN_MAX_AGE']}, "
+            f"CONN_HEALTH_CHECKS={connection.settings_dict['CONN_HEALTH_CHECKS']}, pool={'on' if pool else 'off'}"
+        )
+
+        def query() -> None:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+
+        def reconnect() -> None:
+            query()
+            connection.close()
+
+        query()
+        results = {
+            "reconnect": self._measure(reconnect, options["requests"]),
+            "reuse": self._measure(query, options["requests"]),
+        }
+        connection.close()
+
+        self.stdout.write(f"{'mode':<10} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+        for mode, latencies in results.items():
+            self.stdout.write(
+                f"{mode:<10} {sum(latencies) / len(latencies):>9.3f} "
+                f"{self._percentile(latencies, 50):>9.3f} {self._percentile(latencies, 95):>9.3f}"
+            )
+
+        saved = sum(results["reconnect"]) / len(results["reconnect"]) - sum(results["reuse"]) / len(results["reuse"])
+        self.stdout.write(self.style.SUCCESS(f"Connection reuse saves {saved:.3f} ms per request."))
+
+    @staticmethod
+    def _measure(request: Callable[[], None], count: int) -> List[float]:
+        """
+        Run simulated requests one after another.
+
+        :return: latency of every request, in milliseconds.
+        """
+        latencies = []
+        for _ in range(count):
+            started = time.perf_counter()
+            request()
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies
+
+    @staticmethod
+    def _percentile(values: List[float], percentile: int) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * percentile / 100) - 1)]
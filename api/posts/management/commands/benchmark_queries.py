@@ -0,0 +1,209 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from api.comments.models import Comment
+from api.posts.models import Post
+from api.users.models import User
+
+BENCHMARKED_INDEXES = {
+    Post: ["post_published_created_idx"],
+    Comment: [
+        "comment_post_created_idx",
+        "comment_parent_created_idx",
+    ],
+}
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the main read queries with and without their indexes.
+
+    A dataset is seeded into a throwaway test database, destroyed at the end, so the
+    configured database is never written to and its indexes are never dropped. Every
+    query is timed and explained with the indexes in place, then again after dropping them.
+    """
+
+    help = "Compare query plans and latency of the main read queries with and without their indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=5000, help="Number of posts to seed.")
+        parser.add_argument("--comments", type=int, default=100000, help="Number of comments to seed.")
+        parser.add_argument("--repeat", type=int, default=20, help="Number of runs of every query.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed of the dataset.")
+
+    def handle(self, *args, **options):
+        randomizer = random.Random(options["seed"])
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write(f"Seeding {options['posts']} posts and {options['comments']} comments...")
+            post_id, comment_id = self._seed(randomizer, options["posts"], options["comments"])
+            queries = self._queries(post_id, comment_id)
+
+            with_indexes = self._measure(queries, options["repeat"])
+            self._drop_indexes()
+            without_indexes = self._measure(queries, options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        for label in queries:
+            indexed, unindexed = with_indexes[label], without_indexes[label]
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{label}"))
+            self.stdout.write(
+                f"  with indexes:    median {indexed['median']:.2f} ms, p95 {indexed['p95']:.2f} ms\n"
+                f"  without indexes: median {unindexed['median']:.2f} ms, p95 {unindexed['p95']:.2f} ms\n"
+                f"  speedup:         {unindexed['median'] / max(indexed['median'], 1e-6):.1f}x"
+            )
+            self.stdout.write("  plan with indexes:")
+            self.stdout.write("    " + indexed["plan"].replace("\n", "\n    "))
+            self.stdout.write("  plan without indexes:")
+            self.stdout.write("    " + unindexed["plan"].replace("\n", "\n    "))
+
+    @staticmethod
+    @contextmanager
+    def _explicit_created_at(*models):
+        """
+        Let seeded rows keep their own creation dates instead of the current time.
+        """
+        fields = [model._meta.get_field("created_at") for model in models]
+        for field in fields:
+            field.auto_now_add = False
+        try:
+            yield
+        finally:
+            for field in fields:
+                field.auto_now_add = True
+
+    def _seed(self, randomizer: random.Random, posts_count: int, comments_count: int) -> tuple:
+        """
+        Seed posts and comments spread over a year, a fifth of the comments going to a single viral post.
+
+        :return: id of the viral post and id of its most replied comment.
+        """
+        now = timezone.now()
+        author = User.objects.create(email="benchmark@example.com", username="benchmark@example.com")
+
+        def random_date():
+            return now - timedelta(seconds=randomizer.randint(0, 365 * 24 * 3600))
+
+        with self._explicit_created_at(Post, Comment):
+            posts = Post.objects.bulk_create(
+                [
+                    Post(
+                        title=f"Post {index}",
+                        content="Benchmark content",
+                        author=author,
+                        created_at=random_date(),
+                        is_published=randomizer.random() < 0.9,
+                        is_blocked=randomizer.random() < 0.05,
+                    )
+                    for index in range(posts_count)
+                ],
+                batch_size=1000,
+            )
+            viral_post = posts[0]
+
+            def random_post():
+                return viral_post if randomizer.random() < 0.2 else randomizer.choice(posts)
+
+            top_level_count = comments_count * 7 // 10
+            top_level = Comment.objects.bulk_create(
+                [
+                    Comment(
+                        text=f"Comment {index}",
+                        author=author,
+                        post=random_post(),
+                        created_at=random_date(),
+                        is_blocked=randomizer.random() < 0.05,
+                    )
+                    for index in range(top_level_count)
+                ],
+                batch_size=1000,
+            )
+            viral_comments = [comment for comment in top_level if comment.post_id == viral_post.pk]
+            replied_comment = viral_comments[0]
+
+            def random_parent():
+                return replied_comment if randomizer.random() < 0.05 else randomizer.choice(top_level)
+
+            Comment.objects.bulk_create(
+                [
+                    Comment(
+                        text=f"Reply {index}",
+                        author=author,
+                        post_id=parent.post_id,
+                        parent=parent,
+                        created_at=random_date(),
+                        is_blocked=randomizer.random() < 0.05,
+                    )
+                    for index, parent in enumerate(random_parent() for _ in range(comments_count - top_level_count))
+                ],
+                batch_size=1000,
+            )
+
+        self._analyze()
+        return viral_post.pk, replied_comment.pk
+
+    @staticmethod
+    def _queries(post_id: int, comment_id: int) -> dict:
+        """
+        Build the benchmarked querysets, as issued by the repositories and services.
+        """
+        return {
+            "published posts, first page": Post.published.order_by("-created_at", "-id")[:20],
+            "comments of a viral post, first page": (
+                Comment.available.filter(post_id=post_id).order_by("-created_at", "-id")[:20]
+            ),
+            "replies to a comment": Comment.available.filter(post_id=post_id, parent_id=comment_id),
+        }
+
+    @staticmethod
+    def _measure(queries: dict, repeat: int) -> dict:
+        """
+        Time and explain every query.
+
+        :return: median and p95 latency in milliseconds, and the query plan, per query.
+        """
+        results = {}
+        for label, queryset in queries.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            results[label] = {
+                "median": statistics.median(timings),
+                "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+                "plan": queryset.explain(),
+            }
+        return results
+
+    def _drop_indexes(self) -> None:
+        """
+        Drop the benchmarked indexes of the throwaway test database.
+        """
+        with connection.cursor() as cursor:
+            for names in BENCHMARKED_INDEXES.values():
+                for name in names:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+        self._analyze()
+
+    @staticmethod
+    def _analyze() -> None:
+        """
+        Refresh the planner statistics.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
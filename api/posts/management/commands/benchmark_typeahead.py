@@ -0,0 +1,160 @@
+import math
+import random
+import resource
+import time
+from itertools import accumulate
+from typing import Callable, List
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from api.posts.models import Post
+from api.posts.services import PostTypeaheadService, TitleSubstringIndex
+from api.users.factories import UserFactory
+
+
+class Command(BaseCommand):
+    """
+    Check the title autocompletion latency against a target on a large synthetic set of titles.
+
+    On PostgreSQL the titles are inserted into a throwaway test database and looked up through the pg_trgm
+    index. Elsewhere the in-memory TitleSubstringIndex is built from them directly, reporting its build time and
+    memory too. A linear scan of the titles, as a title__icontains query without an index would do, is timed
+    for comparison. The command fails if the 99th percentile exceeds the target.
+    """
+
+    help = "Benchmark post title autocompletion against a latency target."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=1_000_000, help="Number of titles to generate.")
+        parser.add_argument("--vocabulary", type=int, default=20_000, help="Number of distinct words in titles.")
+        parser.add_argument("--lookups", type=int, default=2000, help="Number of lookups to time.")
+        parser.add_argument("--limit", type=int, default=10, help="Number of titles per lookup.")
+        parser.add_argument("--target-ms", type=float, default=10.0, help="Latency target of the 99th percentile.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed of the titles and the lookups.")
+
+    def handle(self, *args, **options):
+        if options["posts"] < 1 or options["lookups"] < 1 or options["vocabulary"] < 1:
+            raise CommandError("--posts, --vocabulary and --lookups must be positive.")
+
+        randomizer = random.Random(options["seed"])
+        self.stdout.write(f"Generating {options['posts']} titles...")
+        titles = self._titles(randomizer, options["posts"], options["vocabulary"])
+        queries = self._queries(randomizer, titles, options["lookups"])
+
+        if connection.vendor == "postgresql":
+            latencies = self._run_trigram(titles, queries, options["limit"])
+        else:
+            latencies = self._run_prefix_index(randomizer, titles, queries, options["limit"])
+
+        scan_latencies = self._time(
+            [query.casefold() for query in queries[:20]],
+            lambda query: [title for title in titles if query in title.casefold()][: options["limit"]],
+        )
+        self.stdout.write(f"{'path':<14} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for name, values in (("index", latencies), ("linear scan", scan_latencies)):
+            self.stdout.write(
+                f"{name:<14} {self._percentile(values, 50):>9.3f} {self._percentile(values, 95):>9.3f} "
+                f"{self._percentile(values, 99):>9.3f} {max(values):>9.3f}"
+            )
+
+        p99 = self._percentile(latencies, 99)
+        if p99 > options["target_ms"]:
+            raise CommandError(f"p99 of {p99:.3f} ms exceeds the {options['target_ms']} ms target.")
+        self.stdout.write(self.style.SUCCESS(f"p99 of {p99:.3f} ms is within the {options['target_ms']} ms target."))
+
+    @staticmethod
+    def _titles(randomizer: random.Random, count: int, vocabulary_size: int) -> List[str]:
+        """
+        Generate titles of 3 to 8 words, drawn from a vocabulary with a Zipf-like frequency distribution.
+        """
+        syllables = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ber", "dan", "gor", "pel", "stu", "wen"]
+        vocabulary = sorted(
+            {"".join(randomizer.choices(syllables, k=randomizer.randint(2, 4))) for _ in range(vocabulary_size)}
+        )
+        cum_weights = list(accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+        return [
+            " ".join(randomizer.choices(vocabulary, cum_weights=cum_weights, k=randomizer.randint(3, 8))).capitalize()
+            for _ in range(count)
+        ]
+
+    @staticmethod
+    def _queries(randomizer: random.Random, titles: List[str], count: int) -> List[str]:
+        """
+        Build queries as typed so far: the start of a word of a title, or of two consecutive words.
+        """
+        queries = []
+        for _ in range(count):
+            words = randomizer.choice(titles).split()
+            start = randomizer.randrange(len(words))
+            typed = " ".join(words[start : start + randomizer.randint(1, 2)])
+            queries.append(typed[: randomizer.randint(1, len(typed))])
+        return queries
+
+    def _run_prefix_index(
+        self, randomizer: random.Random, titles: List[str], queries: List[str], limit: int
+    ) -> List[float]:
+        """
+        Build the in-memory index, then time lookups and incremental updates.
+
+        :return: lookup latencies, in milliseconds.
+        """
+        memory_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        index = TitleSubstringIndex()
+        index.build(enumerate(titles, start=1))
+        build_time = time.perf_counter() - started
+        memory_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.stdout.write(
+            f"Built the in-memory index in {build_time:.1f} s, "
+            f"peak memory grew by {(memory_after - memory_before) / 1024:.0f} MB."
+        )
+
+        latencies = self._time(queries, lambda query: index.lookup(query, limit))
+        updates = [(randomizer.randint(1, len(titles)), randomizer.choice(titles)) for _ in range(200)]
+        update_latencies = self._time(updates, lambda update: index.add(*update))
+        self.stdout.write(
+            f"Incremental updates: p50 {self._percentile(update_latencies, 50):.3f} ms, "
+            f"p99 {self._percentile(update_latencies, 99):.3f} ms."
+        )
+        return latencies
+
+    def _run_trigram(self, titles: List[str], queries: List[str], limit: int) -> List[float]:
+        """
+        Insert the titles into a throwaway test database, then time lookups through the trigram index.
+
+        :return: lookup latencies, in milliseconds.
+        """
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            author = UserFactory()
+            self.stdout.write("Inserting the titles...")
+            Post.objects.bulk_create(
+                (Post(title=title, content="", author=author, is_published=True) for title in titles),
+                batch_size=5000,
+            )
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE posts_post")
+            suggest = async_to_sync(PostTypeaheadService.suggest)
+            return self._time(queries, lambda query: suggest(query, limit))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    @staticmethod
+    def _time(items: list, call: Callable) -> List[float]:
+        latencies = []
+        for item in items:
+            started = time.perf_counter()
+            call(item)
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies
+
+    @staticmethod
+    def _percentile(values: List[float], percentile: int) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * percentile / 100) - 1)]
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from api.posts.services import PostSearchService
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the post search index from the posts table.
+    """
+
+    help = "Rebuild the post search index from the posts table, for posts written outside of PostRepository."
+
+    def handle(self, *args, **options):
+        count = PostSearchService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} posts."))
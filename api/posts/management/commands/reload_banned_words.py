@@ -0,0 +1,38 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from api.services.profanity_service import ProfanityFilter
+
+
+class Command(BaseCommand):
+    """
+    Reload the banned words dictionary.
+
+    The file modification time is bumped, so every running worker picks up
+    the current list on its next profanity check.
+    """
+
+    help = "Reload the banned words dictionary in every running process."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            dest="file_path",
+            default=None,
+            help="Path of the banned words file (defaults to the BANNED_WORDS_FILE setting).",
+        )
+
+    def handle(self, *args, **options):
+        profanity_filter = ProfanityFilter(options["file_path"])
+        file_path = profanity_filter.dictionary.file_path
+
+        if not os.path.exists(file_path):
+            self.stderr.write(self.style.WARNING(f"{file_path} does not exist, no words are banned."))
+            return
+
+        os.utime(file_path)
+        profanity_filter.reload()
+        self.stdout.write(
+            self.style.SUCCESS(f"Loaded {len(profanity_filter.banned_words)} banned words from {file_path}.")
+        )
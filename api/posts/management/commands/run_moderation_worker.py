@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.services import ModerationService
+
+
+class Command(BaseCommand):
+    """
+    Run the profanity moderation worker.
+
+    Pending posts and comments are moderated in batches until none are left,
+    then the queue is polled again after the given interval.
+    """
+
+    help = "Moderate posts and comments saved with moderation pending."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ModerationService.DEFAULT_BATCH_SIZE,
+            help="Maximum number of posts and of comments moderated per batch.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait before polling again once the queue is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Moderate everything currently pending, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        moderation_service = ModerationService()
+
+        try:
+            while True:
+                moderated = moderation_service.moderate_pending(batch_size=options["batch_size"])
+                if moderated:
+                    self.stdout.write(f"Moderated {moderated} posts and comments.")
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS("Moderation worker stopped."))
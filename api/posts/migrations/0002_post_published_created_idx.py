@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-18 14:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_blocked", False), ("is_published", True)),
+                fields=["-created_at", "-id"],
+                name="post_published_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-18 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0002_post_published_created_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="moderation_pending",
+            field=models.BooleanField(default=False, verbose_name="moderation pending"),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("moderation_pending", True)),
+                fields=["id"],
+                name="post_moderation_pending_idx",
+            ),
+        ),
+    ]
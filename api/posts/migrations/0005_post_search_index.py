@@ -0,0 +1,50 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:20
+
+from django.db import migrations
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+)
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Create the search index of the posts, and index the existing ones.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            f"ALTER TABLE posts_post ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+        )
+        schema_editor.execute("CREATE INDEX post_search_vector_idx ON posts_post USING GIN (search_vector)")
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE posts_post_fts USING fts5(title, content, tokenize = 'porter unicode61')"
+        )
+        schema_editor.execute(
+            "INSERT INTO posts_post_fts (rowid, title, content) SELECT id, title, content FROM posts_post"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    """
+    Drop the search index of the posts.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS post_search_vector_idx")
+        schema_editor.execute("ALTER TABLE posts_post DROP COLUMN IF EXISTS search_vector")
+    elif vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS posts_post_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0004_post_comment_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:45
+
+from django.db import migrations
+
+
+def create_title_trigram_index(apps, schema_editor):
+    """
+    Create the trigram index of the post titles on PostgreSQL, and the btree index of their lowercased form
+    for the lookups too short for trigrams.
+    """
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute("CREATE INDEX post_title_trgm_idx ON posts_post USING GIN (title gin_trgm_ops)")
+        schema_editor.execute('CREATE INDEX post_title_prefix_idx ON posts_post ((lower(title) COLLATE "C"))')
+
+
+def drop_title_trigram_index(apps, schema_editor):
+    """
+    Drop the title indexes on PostgreSQL.
+    """
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS post_title_prefix_idx")
+        schema_editor.execute("DROP INDEX IF EXISTS post_title_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0005_post_search_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_title_trigram_index, drop_title_trigram_index),
+    ]
@@ -1,21 +1,63 @@
+from typing import Dict, Optional, Tuple
+
 from django.db import models
 
+from api.services.moderation_service import ModerationService
+
 
 class PostManager(models.Manager):
     """
     Custom manager for the Post model that only returns published posts.
 
+    Posts awaiting moderation are left out too when the pending policy hides them. The raw queries of search
+    and typeahead and the in-memory typeahead index filter with the same visibility, so a policy change
+    applies to all of them at once.
+
     Attributes:
+        - visibility (method): Get the field values of the posts the manager returns.
+        - visibility_sql (method): Build the visibility as SQL conditions for raw queries.
+        - is_visible (method): Check whether a loaded post is one the manager returns.
         - get_queryset (method): Get the queryset of published posts.
     """
 
+    @staticmethod
+    def visibility() -> Dict[str, bool]:
+        """
+        Get the field values of the posts the manager returns.
+
+        :return: value required for every filtered field.
+        """
+        visibility = {"is_published": True, "is_blocked": False}
+        if ModerationService.hides_pending():
+            visibility["moderation_pending"] = False
+        return visibility
+
+    @classmethod
+    def visibility_sql(cls, alias: Optional[str] = None) -> Tuple[str, list]:
+        """
+        Build the visibility as SQL conditions for raw queries.
+
+        :param alias: alias of the posts table, None for unqualified columns.
+        :return: conditions joined with AND, and their parameters.
+        """
+        prefix = f"{alias}." if alias else ""
+        visibility = cls.visibility()
+        return " AND ".join(f"{prefix}{field} = %s" for field in visibility), list(visibility.values())
+
+    @classmethod
+    def is_visible(cls, post: models.Model) -> bool:
+        """
+        Check whether a loaded post is one the manager returns.
+
+        :param post: post.
+        :return: True if the post is visible.
+        """
+        return all(getattr(post, field) == value for field, value in cls.visibility().items())
+
     def get_queryset(self):
         """
         Get the queryset of published posts.
 
         :return: queryset of published posts.
         """
-        return super().get_queryset().filter(
-            is_published=True,
-            is_blocked=False,
-        )
+        return super().get_queryset().filter(**self.visibility())
@@ -2,6 +2,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from api.posts.models.manager import PostManager
+from api.services.moderation_service import ModerationService
 from api.services.profanity_service import ProfanityFilter
 
 
@@ -17,6 +18,8 @@ class Post(models.Model):
         - is published (bool): Whether the post is published or not.
         - author (User): The author of the post.
         - is_blocked (bool): Whether the post is blocked or not.
+        - moderation_pending (bool): Whether the post still awaits the profanity check.
+        - comment_count (int): The number of comments and replies of the post that are not blocked.
 
         - publishes (PostManager): The custom manager for the Post model.
     """
@@ -28,6 +31,8 @@ class Post(models.Model):
     author = models.ForeignKey("users.User", related_name="posts", on_delete=models.CASCADE)
     is_published = models.BooleanField(_("is published"), default=False)
     is_blocked = models.BooleanField(_("is blocked"), default=False)
+    moderation_pending = models.BooleanField(_("moderation pending"), default=False)
+    comment_count = models.PositiveIntegerField(_("comment count"), default=0, editable=False)
 
     objects = models.Manager()
     published = PostManager()
@@ -36,6 +41,18 @@ class Post(models.Model):
         verbose_name = _("Post")
         verbose_name_plural = _("Posts")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_published=True, is_blocked=False),
+                name="post_published_created_idx",
+            ),
+            models.Index(
+                fields=["id"],
+                condition=models.Q(moderation_pending=True),
+                name="post_moderation_pending_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -59,9 +76,12 @@ class Post(models.Model):
             - update_fields (list): The fields to update.
         """
 
-        profanity_filter = ProfanityFilter()
+        if ModerationService.is_async():
+            self.moderation_pending = True
+        else:
+            profanity_filter = ProfanityFilter()
 
-        if profanity_filter.is_profane(self.title) or profanity_filter.is_profane(self.content):
-            self.is_blocked = True
+            if profanity_filter.is_profane(self.title) or profanity_filter.is_profane(self.content):
+                self.is_blocked = True
 
         super().save(*args, force_insert, force_update, using, update_fields)
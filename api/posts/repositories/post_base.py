@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional, Tuple
 
 from api.posts.models import Post
+from api.posts.schemas import PostRow
 
 
 class PostBaseRepository(ABC):
@@ -12,7 +13,12 @@ class PostBaseRepository(ABC):
     - create: creates a new post in the database.
     - update: updates an existing post in the database.
     - get_all_published: retrieves all published posts from the database.
+    - get_published_page_versions: retrieves the versions of a page of published posts.
+    - get_published_page_rows: retrieves a page of published post rows.
     - get_by_id: retrieves a post from the database by ID.
+    - get_version: retrieves the version of a post by ID.
+    - search_published: searches the published posts.
+    - suggest_titles: autocompletes the titles of published posts.
     """
 
     @abstractmethod
@@ -23,10 +29,30 @@ class PostBaseRepository(ABC):
     async def get_all_published(self) -> List[Post]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_published_page_rows(self, cursor: Optional[str], limit: int) -> Tuple[List[PostRow], Optional[str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_published_page_versions(self, cursor: Optional[str], limit: int) -> Tuple[List[tuple], bool]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_published(self, query: str, cursor: Optional[str], limit: int) -> Tuple[List[Post], Optional[str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def suggest_titles(self, query: str, limit: int) -> List[Tuple[int, str]]:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_id(self, post_id: int) -> Post:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_version(self, post_id: int) -> tuple:
+        raise NotImplementedError
+
     @abstractmethod
     async def update(self, post_id: int, post: dict, author_id: int) -> Post:
         raise NotImplementedError
@@ -1,10 +1,14 @@
-from asgiref.sync import sync_to_async
+from typing import List, Optional, Tuple
 
+from api.metrics.instruments import instrument_repository
 from api.posts.models import Post
 from api.posts.repositories.post_base import PostBaseRepository
-from api.services import UserService
+from api.posts.schemas import PostRow
+from api.posts.services import PostCacheService, PostSearchService, PostTypeaheadService, PostVisibilityService
+from api.services import AuthorWriteService, CursorPaginationService, HttpCacheService
 
 
+@instrument_repository("post")
 class PostRepository(PostBaseRepository):
     """
     Post repository class to handle database operations.
@@ -13,7 +17,14 @@ class PostRepository(PostBaseRepository):
     - create: Create a new post.
     - update: Update an existing post.
     - get_all_published: Get all published posts.
+    - get_published_page_versions: Get the versions of a page of published posts.
+    - get_published_page_rows: Get a page of published post rows.
     - get_by_id: Get a post by ID.
+    - get_version: Get the version of a post by ID.
+    - search_published: Search the published posts.
+    - suggest_titles: Autocomplete the titles of published posts.
+
+    Writes hand the surrogate keys of the responses they make stale to HttpCacheService.purge.
     """
 
     async def create(self, post: dict, author_id: int) -> Post:
@@ -31,7 +42,12 @@ class PostRepository(PostBaseRepository):
         if not post.get("content"):
             raise ValueError("The Content must be set")
 
-        return await Post.objects.acreate(author_id=author_id, **post)
+        created_post = await Post.objects.acreate(author_id=author_id, **post)
+        await PostSearchService.index(created_post)
+        PostTypeaheadService.index(created_post)
+        await PostCacheService().invalidate_listings()
+        await HttpCacheService.purge([HttpCacheService.POSTS_KEY])
+        return created_post
 
     async def get_all_published(self) -> list[Post]:
         """
@@ -39,7 +55,53 @@ class PostRepository(PostBaseRepository):
 
         :return: list of published posts.
         """
-        return await sync_to_async(Post.published.all)()
+        return [post async for post in Post.published.all()]
+
+    async def get_published_page_rows(self, cursor: Optional[str], limit: int) -> Tuple[List[PostRow], Optional[str]]:
+        """
+        Get a page of published posts from the database, newest first, as rows with the fields of
+        PostResponseSchema only.
+
+        :param cursor: cursor of the page, None for the first page.
+        :param limit: page size.
+        :return: published post rows of the page and the cursor of the next page.
+        """
+        return await CursorPaginationService.paginate(
+            Post.published.all(), cursor=cursor, limit=limit, projection=PostRow
+        )
+
+    async def get_published_page_versions(self, cursor: Optional[str], limit: int) -> Tuple[List[tuple], bool]:
+        """
+        Get the versions of a page of published posts, without loading the posts.
+
+        :param cursor: cursor of the page, None for the first page.
+        :param limit: page size.
+        :return: ID, updated_at and comment count of the posts of the page, and whether a next page follows.
+        """
+        return await CursorPaginationService.versions(
+            Post.published.all(), cursor=cursor, limit=limit, counter="comment_count"
+        )
+
+    async def search_published(self, query: str, cursor: Optional[str], limit: int) -> Tuple[List[Post], Optional[str]]:
+        """
+        Search the published posts from the search index, best match first.
+
+        :param query: words to search for.
+        :param cursor: cursor of the page, None for the first page.
+        :param limit: page size.
+        :return: posts of the page and the cursor of the next page.
+        """
+        return await PostSearchService.search(query, cursor=cursor, limit=limit)
+
+    async def suggest_titles(self, query: str, limit: int) -> List[Tuple[int, str]]:
+        """
+        Autocomplete the titles of published posts.
+
+        :param query: text typed so far.
+        :param limit: number of titles to return at most.
+        :return: post ID and title of the matching posts, the ones starting with the query first.
+        """
+        return await PostTypeaheadService.suggest(query, limit=limit)
 
     async def get_by_id(self, post_id: int) -> Post:
         """
@@ -50,9 +112,18 @@ class PostRepository(PostBaseRepository):
         """
         return await Post.objects.aget(pk=post_id)
 
+    async def get_version(self, post_id: int) -> tuple:
+        """
+        Get the version of a post by ID, without loading the post.
+
+        :param post_id: post ID.
+        :return: ID, updated_at and comment count of the post.
+        """
+        return await Post.objects.values_list("id", "updated_at", "comment_count").aget(pk=post_id)
+
     async def update(self, post_id: int, post: dict, author_id: int) -> Post:
         """
-        Update an existing post in the database.
+        Update an existing post in the database with a single statement checking the author too.
 
         :param post_id: post ID.
         :param post: updated post data.
@@ -66,28 +137,26 @@ class PostRepository(PostBaseRepository):
         if not post.get("content"):
             raise ValueError("The Content must be set")
 
-        user_service = UserService()
-        post_to_update = await self.get_by_id(post_id)
-
-        await user_service.check_author_permission(post_to_update.author_id, author_id)
-        await Post.objects.filter(pk=post_id).aupdate(**post)
-
-        return await self.get_by_id(post_id)
+        updated_post = await AuthorWriteService.update(Post.objects.all(), pk=post_id, author_id=author_id, values=post)
+        await PostSearchService.index(updated_post)
+        PostTypeaheadService.index(updated_post)
+        PostVisibilityService.forget(post_id)
+        await PostCacheService().invalidate_post(post_id)
+        await HttpCacheService.purge([HttpCacheService.post_key(post_id), HttpCacheService.POSTS_KEY])
+        return updated_post
 
     async def delete(self, post_id: int, author_id: int) -> Post:
         """
-        Delete a post from the database.
+        Delete a post of the author from the database.
 
         :param post_id: post ID.
         :param author_id: user ID.
         :return: deleted post.
         """
-        user_service = UserService()
-        post_to_delete = await self.get_by_id(post_id)
-
-        await user_service.check_author_permission(
-            obj_author_id=post_to_delete.author_id,
-            author_id=author_id,
-        )
-
-        return await post_to_delete.adelete()
+        deleted = await AuthorWriteService.delete(Post.objects.all(), pk=post_id, author_id=author_id)
+        await PostSearchService.remove(post_id)
+        PostTypeaheadService.remove(post_id)
+        PostVisibilityService.forget(post_id)
+        await PostCacheService().invalidate_post(post_id)
+        await HttpCacheService.purge([HttpCacheService.post_key(post_id), HttpCacheService.POSTS_KEY])
+        return deleted
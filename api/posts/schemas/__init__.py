@@ -1,8 +1,14 @@
 from .post_create_schema import PostCreateSchema
 from .post_response_schema import PostResponseSchema
+from .post_page_schema import PostPageSchema
+from .post_title_schema import PostTitleSchema
+from .post_row import PostRow
 
 
 __all__ = [
     "PostCreateSchema",
     "PostResponseSchema",
+    "PostPageSchema",
+    "PostTitleSchema",
+    "PostRow",
 ]
@@ -0,0 +1,18 @@
+from typing import List, Optional
+
+from ninja_schema import Schema
+
+from api.posts.schemas.post_response_schema import PostResponseSchema
+
+
+class PostPageSchema(Schema):
+    """
+    Post page schema with the posts of a page and the cursor of the next one.
+
+    Attributes:
+        - items (List[PostResponseSchema]): The posts of the page.
+        - next_cursor (str): The cursor of the next page, None on the last page.
+    """
+
+    items: List[PostResponseSchema]
+    next_cursor: Optional[str] = None
@@ -15,6 +15,7 @@ class PostResponseSchema(ModelSchema):
         - created_at (datetime): The date and time the post was created.
         - updated_at (datetime): The date and time the post was last updated.
         - is_published (bool): Whether the post is published or not.
+        - comment_count (int): The number of comments and replies of the post that are not blocked.
     """
 
     class Config:
@@ -26,4 +27,5 @@ class PostResponseSchema(ModelSchema):
             "created_at",
             "updated_at",
             "is_published",
+            "comment_count",
         ]
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import ClassVar, Tuple
+
+
+@dataclass(slots=True)
+class PostRow:
+    """
+    Post with the fields of PostResponseSchema only, read with values_list instead of a Post instance.
+
+    Attributes:
+        - FIELDS (tuple): The fields to select, in the order of the attributes.
+        - id (int): The ID of the post.
+        - title (str): The title of the post.
+        - content (str): The content of the post.
+        - created_at (datetime): The date and time the post was created.
+        - updated_at (datetime): The date and time the post was last updated.
+        - is_published (bool): Whether the post is published or not.
+        - comment_count (int): The number of comments and replies of the post that are not blocked.
+    """
+
+    FIELDS: ClassVar[Tuple[str, ...]] = (
+        "id",
+        "title",
+        "content",
+        "created_at",
+        "updated_at",
+        "is_published",
+        "comment_count",
+    )
+
+    id: int
+    title: str
+    content: str
+    created_at: datetime
+    updated_at: datetime
+    is_published: bool
+    comment_count: int
+
+    @property
+    def pk(self) -> int:
+        return self.id
@@ -0,0 +1,14 @@
+from ninja_schema import Schema
+
+
+class PostTitleSchema(Schema):
+    """
+    Post title schema for autocompletion suggestions.
+
+    Attributes:
+        - id (int): The ID of the post.
+        - title (str): The title of the post.
+    """
+
+    id: int
+    title: str
@@ -0,0 +1,13 @@
+from .post_cache_service import PostCacheService
+from .post_search_service import PostSearchService
+from .post_typeahead_service import PostTypeaheadService, TitleSubstringIndex
+from .post_visibility_service import PostVisibilityService
+
+
+__all__ = [
+    "PostCacheService",
+    "PostSearchService",
+    "PostTypeaheadService",
+    "PostVisibilityService",
+    "TitleSubstringIndex",
+]
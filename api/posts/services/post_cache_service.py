@@ -0,0 +1,135 @@
+import hashlib
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+
+from api.services import CursorPaginationService
+
+
+class PostCacheService:
+    """
+    Service class for caching serialized post payloads.
+
+    Post details are cached per post. Listing pages are cached per cursor and limit
+    under a listing version, which is bumped on every post write, so all cached pages
+    are dropped at once without having to know their keys. Cursors are decoded first and
+    hashed into the key, so a malformed one is rejected before reaching the cache.
+
+    Attributes:
+        - get_post (method): Get a cached post payload.
+        - set_post (method): Cache a post payload.
+        - get_listing (method): Get a cached listing page payload.
+        - set_listing (method): Cache a listing page payload.
+        - invalidate_post (method): Drop a cached post and every cached listing page.
+        - invalidate_listings (method): Drop every cached listing page.
+        - forget_post (method): Drop a cached post, from sync code.
+        - forget_listings (method): Drop every cached listing page, from sync code.
+    """
+
+    DETAIL_KEY = "posts:detail:{post_id}"
+    LISTING_KEY = "posts:listing:{version}:{cursor}:{limit}"
+    LISTING_VERSION_KEY = "posts:listing:version"
+
+    def __init__(self, cache_alias: str = DEFAULT_CACHE_ALIAS):
+        self.cache = caches[cache_alias]
+        self.timeout = settings.POST_CACHE_TIMEOUT
+
+    async def get_post(self, post_id: int) -> Optional[dict]:
+        """
+        Get a cached post payload.
+
+        :param post_id: post ID.
+        :return: post payload, None if it is not cached.
+        """
+        return await self.cache.aget(self.DETAIL_KEY.format(post_id=post_id))
+
+    async def set_post(self, post_id: int, payload: dict) -> None:
+        """
+        Cache a post payload.
+
+        :param post_id: post ID.
+        :param payload: serialized post.
+        """
+        await self.cache.aset(self.DETAIL_KEY.format(post_id=post_id), payload, self.timeout)
+
+    async def get_listing(self, cursor: Optional[str], limit: int) -> Optional[dict]:
+        """
+        Get a cached listing page payload.
+
+        :param cursor: cursor of the page.
+        :param limit: page size.
+        :return: page payload, None if it is not cached.
+        :raises ValueError: if the cursor is invalid.
+        """
+        return await self.cache.aget(await self._listing_key(cursor, limit))
+
+    async def set_listing(self, cursor: Optional[str], limit: int, payload: dict) -> None:
+        """
+        Cache a listing page payload.
+
+        :param cursor: cursor of the page.
+        :param limit: page size.
+        :param payload: serialized page.
+        """
+        await self.cache.aset(await self._listing_key(cursor, limit), payload, self.timeout)
+
+    async def invalidate_post(self, post_id: int) -> None:
+        """
+        Drop a cached post and every cached listing page.
+
+        :param post_id: post ID.
+        """
+        await self.cache.adelete(self.DETAIL_KEY.format(post_id=post_id))
+        await self.invalidate_listings()
+
+    async def invalidate_listings(self) -> None:
+        """
+        Drop every cached listing page by moving to a new listing version.
+        """
+        try:
+            await self.cache.aincr(self.LISTING_VERSION_KEY)
+        except ValueError:
+            await self.cache.aset(self.LISTING_VERSION_KEY, time.time_ns(), None)
+
+    def forget_post(self, post_id: int) -> None:
+        """
+        Drop a cached post, from sync code.
+
+        :param post_id: post ID.
+        """
+        self.cache.delete(self.DETAIL_KEY.format(post_id=post_id))
+
+    def forget_listings(self) -> None:
+        """
+        Drop every cached listing page by moving to a new listing version, from sync code.
+        """
+        try:
+            self.cache.incr(self.LISTING_VERSION_KEY)
+        except ValueError:
+            self.cache.set(self.LISTING_VERSION_KEY, time.time_ns(), None)
+
+    async def _listing_key(self, cursor: Optional[str], limit: int) -> str:
+        """
+        Build the key of a listing page under the current listing version.
+
+        A missing version starts from the current time, so pages cached under a lost version are never reused.
+
+        :raises ValueError: if the cursor is invalid.
+        """
+        position = ""
+        if cursor:
+            created_at, pk = CursorPaginationService.decode_cursor(cursor)
+            position = hashlib.blake2b(f"{created_at.isoformat()}|{pk}".encode(), digest_size=16).hexdigest()
+
+        version = await self.cache.aget(self.LISTING_VERSION_KEY)
+        if version is None:
+            await self.cache.aadd(self.LISTING_VERSION_KEY, time.time_ns(), None)
+            version = await self.cache.aget(self.LISTING_VERSION_KEY)
+
+        return self.LISTING_KEY.format(
+            version=version,
+            cursor=position,
+            limit=CursorPaginationService.clamp_limit(limit),
+        )
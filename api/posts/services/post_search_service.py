@@ -0,0 +1,184 @@
+import base64
+import binascii
+import re
+from typing import List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+
+from api.posts.models import Post, PostManager
+from api.services import CursorPaginationService
+
+
+class PostSearchService:
+    """
+    Service class for ranked full-text search over published posts.
+
+    On PostgreSQL posts have a generated, GIN-indexed search_vector column weighting the title above the
+    content, which the database keeps in step with the row itself. On SQLite an FTS5 table shadows the title
+    and the content of every post, kept in step by PostRepository, and rebuilt by the rebuild_search_index
+    command if other writes let it drift. Either way the results are restricted to the published posts.
+
+    Pages are ranked, so the cursor holds the offset of the next page instead of a row position.
+
+    Attributes:
+        - FTS_TABLE (str): The name of the SQLite FTS5 table.
+        - SEARCH_CONFIG (str): The PostgreSQL text search configuration.
+        - index (method): Add or replace a post in the search index.
+        - remove (method): Remove a post from the search index.
+        - rebuild (method): Rebuild the search index from the posts table.
+        - search (method): Fetch a page of the published posts matching a query, best match first.
+    """
+
+    FTS_TABLE = "posts_post_fts"
+    SEARCH_CONFIG = "english"
+    TITLE_WEIGHT = 4.0
+    CONTENT_WEIGHT = 1.0
+
+    @staticmethod
+    def _uses_fts_table() -> bool:
+        return connection.vendor == "sqlite"
+
+    @classmethod
+    async def index(cls, post: Post) -> None:
+        """
+        Add or replace a post in the search index.
+
+        :param post: post to index.
+        """
+        if cls._uses_fts_table():
+            await sync_to_async(cls._execute)(
+                [
+                    (f"DELETE FROM {cls.FTS_TABLE} WHERE rowid = %s", [post.pk]),
+                    (
+                        f"INSERT INTO {cls.FTS_TABLE} (rowid, title, content) VALUES (%s, %s, %s)",
+                        [post.pk, post.title, post.content],
+                    ),
+                ]
+            )
+
+    @classmethod
+    async def remove(cls, post_id: int) -> None:
+        """
+        Remove a post from the search index.
+
+        :param post_id: post ID.
+        """
+        if cls._uses_fts_table():
+            await sync_to_async(cls._execute)([(f"DELETE FROM {cls.FTS_TABLE} WHERE rowid = %s", [post_id])])
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        Rebuild the search index from the posts table.
+
+        :return: number of indexed posts.
+        """
+        if not cls._uses_fts_table():
+            return Post.objects.count()
+
+        table = connection.ops.quote_name(Post._meta.db_table)
+        cls._execute(
+            [
+                (f"DELETE FROM {cls.FTS_TABLE}", []),
+                (f"INSERT INTO {cls.FTS_TABLE} (rowid, title, content) SELECT id, title, content FROM {table}", []),
+            ]
+        )
+        return Post.objects.count()
+
+    @staticmethod
+    def _execute(statements: List[Tuple[str, list]]) -> None:
+        with connection.cursor() as cursor:
+            for sql, params in statements:
+                cursor.execute(sql, params)
+
+    @staticmethod
+    def encode_cursor(offset: int) -> str:
+        """
+        Encode the offset of a page into a cursor.
+
+        :param offset: number of results before the page.
+        :return: opaque cursor.
+        """
+        return base64.urlsafe_b64encode(f"rank|{offset}".encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> int:
+        """
+        Decode a cursor into the offset of a page.
+
+        :param cursor: opaque cursor.
+        :return: number of results before the page.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            kind, offset = raw.split("|")
+            if kind != "rank" or int(offset) < 0:
+                raise ValueError
+            return int(offset)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError("Invalid cursor")
+
+    @classmethod
+    async def search(cls, query: str, cursor: Optional[str], limit: int) -> Tuple[List[Post], Optional[str]]:
+        """
+        Fetch a page of the published posts matching a query, best match first.
+
+        :param query: words to search for, all of them must match.
+        :param cursor: cursor of the page, None for the first page.
+        :param limit: page size.
+        :return: posts of the page and the cursor of the next page.
+        """
+        offset = cls.decode_cursor(cursor) if cursor else 0
+        limit = CursorPaginationService.clamp_limit(limit)
+
+        if cls._uses_fts_table():
+            sql, params = cls._fts_sql(query)
+        elif connection.vendor == "postgresql":
+            sql, params = cls._tsvector_sql(query)
+        else:
+            raise ValueError(f"Search is not supported on {connection.vendor}")
+
+        if sql is None:
+            return [], None
+
+        posts = [post async for post in Post.objects.raw(f"{sql} LIMIT %s OFFSET %s", [*params, limit + 1, offset])]
+        next_cursor = cls.encode_cursor(offset + limit) if len(posts) > limit else None
+        return posts[:limit], next_cursor
+
+    @classmethod
+    def _fts_sql(cls, query: str) -> Tuple[Optional[str], list]:
+        """
+        Build the SQLite search query, matching every word of the query as a quoted FTS5 string.
+        """
+        words = re.findall(r"\w+", query)
+        if not words:
+            return None, []
+
+        match = " ".join(f'"{word}"' for word in words)
+        table = connection.ops.quote_name(Post._meta.db_table)
+        published, params = PostManager.visibility_sql("post")
+        sql = f"""
+            SELECT post.* FROM {cls.FTS_TABLE}
+            JOIN {table} post ON post.id = {cls.FTS_TABLE}.rowid
+            WHERE {cls.FTS_TABLE} MATCH %s AND {published}
+            ORDER BY bm25({cls.FTS_TABLE}, {cls.TITLE_WEIGHT}, {cls.CONTENT_WEIGHT}), post.id DESC
+        """
+        return sql, [match, *params]
+
+    @classmethod
+    def _tsvector_sql(cls, query: str) -> Tuple[Optional[str], list]:
+        """
+        Build the PostgreSQL search query, parsing the query the way web search engines do.
+        """
+        if not query.strip():
+            return None, []
+
+        table = connection.ops.quote_name(Post._meta.db_table)
+        published, params = PostManager.visibility_sql("post")
+        sql = f"""
+            SELECT post.* FROM {table} post, websearch_to_tsquery(%s, %s) query
+            WHERE post.search_vector @@ query AND {published}
+            ORDER BY ts_rank_cd(post.search_vector, query) DESC, post.id DESC
+        """
+        return sql, [cls.SEARCH_CONFIG, query, *params]
@@ -0,0 +1,349 @@
+import re
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, connections
+
+from api.posts.models import Post, PostManager
+
+WORD = re.compile(r"\w+")
+
+
+class TitleSubstringIndex:
+    """
+    In-memory index of the words of post titles, for substring lookups.
+
+    Every distinct word maps to the IDs of the posts whose title contains it, and every suffix of every
+    distinct word is kept in a list sorted for bisection, so the words containing a fragment are the ones
+    with a suffix starting with it. Titles repeat a small vocabulary, so the suffixes stay few, and a new
+    word inserts only its own suffixes. Words are interned, as most of them repeat across titles.
+
+    IDs of replaced or removed titles are left in place until the next build. Lookups check every candidate
+    against the current title.
+
+    Queries shorter than SUBSTRING_MIN_LENGTH only match the start of a title, as PostTypeaheadService does on
+    PostgreSQL, where trigrams cannot serve them.
+
+    Attributes:
+        - SCAN_LIMIT (int): The number of candidate post IDs a lookup scans at most.
+        - SUBSTRING_MIN_LENGTH (int): The length from which a query matches anywhere in a title.
+        - build (method): Replace the index content.
+        - add (method): Add or replace a title.
+        - remove (method): Remove a title.
+        - lookup (method): Get the titles containing a query.
+    """
+
+    SCAN_LIMIT = 5000
+    SUBSTRING_MIN_LENGTH = 3
+
+    def __init__(self):
+        self._suffixes: List[Tuple[str, str]] = []
+        self._postings: Dict[str, array] = {}
+        self._titles: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    @staticmethod
+    def _words_of(title: str) -> List[str]:
+        return sorted({sys.intern(word) for word in WORD.findall(title.casefold())})
+
+    @staticmethod
+    def _suffixes_of(word: str) -> List[Tuple[str, str]]:
+        return [(word[start:], word) for start in range(len(word))]
+
+    def build(self, rows: Iterable[Tuple[int, str]]) -> None:
+        """
+        Replace the index content.
+
+        :param rows: post ID and title of every indexed post.
+        """
+        titles = dict(rows)
+        postings: Dict[str, array] = {}
+        for post_id, title in titles.items():
+            for word in self._words_of(title):
+                posting = postings.get(word)
+                if posting is None:
+                    posting = postings[word] = array("q")
+                posting.append(post_id)
+        self._suffixes = sorted(suffix for word in postings for suffix in self._suffixes_of(word))
+        self._postings = postings
+        self._titles = titles
+
+    def add(self, post_id: int, title: str) -> None:
+        """
+        Add or replace a title.
+
+        :param post_id: post ID.
+        :param title: title of the post.
+        """
+        for word in self._words_of(title):
+            posting = self._postings.get(word)
+            if posting is None:
+                posting = self._postings[word] = array("q")
+                for suffix in self._suffixes_of(word):
+                    insort(self._suffixes, suffix)
+            posting.append(post_id)
+        self._titles[post_id] = title
+
+    def remove(self, post_id: int) -> None:
+        """
+        Remove a title.
+
+        :param post_id: post ID.
+        """
+        self._titles.pop(post_id, None)
+
+    def _candidates(self, fragment: str, prefix_only: bool = False) -> Iterator[int]:
+        """
+        Get the post IDs of the words containing a fragment, or only starting with it, the words starting with it
+        first, at most SCAN_LIMIT of them.
+        """
+        words = set()
+        position = bisect_left(self._suffixes, (fragment,))
+        while position < len(self._suffixes) and self._suffixes[position][0].startswith(fragment):
+            suffix, word = self._suffixes[position]
+            if not prefix_only or suffix == word:
+                words.add(word)
+            position += 1
+
+        scanned = 0
+        for word in sorted(words, key=lambda word: (not word.startswith(fragment), word)):
+            for post_id in self._postings[word]:
+                if scanned >= self.SCAN_LIMIT:
+                    return
+                scanned += 1
+                yield post_id
+
+    def lookup(self, query: str, limit: int) -> List[Tuple[int, str]]:
+        """
+        Get the titles containing a query, the ones starting with it first, then the shortest.
+
+        Candidates come from the words containing the longest word of the query, at most SCAN_LIMIT of
+        them, so a very common fragment returns the best of the first matches rather than of all of them.
+        A query shorter than SUBSTRING_MIN_LENGTH gets the titles starting with it, in alphabetical order.
+
+        :param query: text typed so far.
+        :param limit: number of titles to return at most.
+        :return: post ID and title of the matching posts.
+        """
+        needle = " ".join(query.casefold().split())
+        words = WORD.findall(needle)
+        if not words:
+            return []
+
+        if len(needle) < self.SUBSTRING_MIN_LENGTH:
+            matches = self._match(self._candidates(words[0], prefix_only=True), lambda title: title.startswith(needle))
+            matches.sort(key=lambda match: (match[1].casefold(), match[0]))
+            return matches[:limit]
+
+        matches = self._match(self._candidates(max(words, key=len)), lambda title: needle in title, limit * 5)
+        matches.sort(key=lambda match: (not match[1].casefold().startswith(needle), len(match[1]), match[0]))
+        return matches[:limit]
+
+    def _match(
+        self, candidates: Iterator[int], accepts: Callable[[str], bool], limit: Optional[int] = None
+    ) -> List[Tuple[int, str]]:
+        """
+        Check candidates against their current title, stopping after limit matches, if set.
+
+        :param candidates: candidate post IDs, possibly repeated.
+        :param accepts: check of the casefolded title.
+        :param limit: number of matches to collect at most.
+        :return: post ID and title of the matching candidates.
+        """
+        seen = set()
+        matches = []
+        for post_id in candidates:
+            if post_id in seen:
+                continue
+            seen.add(post_id)
+            title = self._titles.get(post_id)
+            if title is not None and accepts(title.casefold()):
+                matches.append((post_id, title))
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+
+class PostTypeaheadService:
+    """
+    Service class for autocompleting the titles of published posts.
+
+    On PostgreSQL titles are matched with ILIKE, served by a pg_trgm GIN index, and only the first SCAN_LIMIT
+    matches are ranked. Trigrams cannot serve queries shorter than SUBSTRING_MIN_LENGTH, so those match the start
+    of the title instead, served by a btree index on the lowercased title. Elsewhere a TitleSubstringIndex
+    of the published titles is built in memory on first use, kept in step by the writes of PostRepository
+    in the current process, and rebuilt after TYPEAHEAD_INDEX_TTL seconds to pick up the writes of other
+    processes and of other code paths. Both match the same way. Only the first build blocks
+    lookups, and concurrent ones wait for it rather than building their own: later builds run in a background
+    thread while the previous index keeps serving, and the writes made meanwhile are replayed on the new one.
+
+    Attributes:
+        - MAX_LIMIT (int): The largest number of titles returned.
+        - suggest (method): Get the published titles matching a query.
+        - index (method): Add, replace or drop a post in the in-memory index after a write.
+        - remove (method): Drop a post from the in-memory index.
+        - reset (method): Drop the in-memory index.
+    """
+
+    MAX_LIMIT = 20
+
+    _index: Optional[TitleSubstringIndex] = None
+    _built_at = 0.0
+    _pending: Optional[List[Tuple[int, Optional[str]]]] = None
+    _lock = threading.Lock()
+    _build_lock = threading.Lock()
+
+    @staticmethod
+    def _uses_trigram_index() -> bool:
+        return connection.vendor == "postgresql"
+
+    @classmethod
+    async def suggest(cls, query: str, limit: int) -> List[Tuple[int, str]]:
+        """
+        Get the published titles matching a query, the ones starting with it first, then the shortest.
+
+        :param query: text typed so far.
+        :param limit: number of titles to return at most.
+        :return: post ID and title of the matching posts.
+        """
+        limit = max(1, min(limit, cls.MAX_LIMIT))
+        if not query.strip():
+            return []
+
+        if cls._uses_trigram_index():
+            return await sync_to_async(cls._suggest_trigram)(query.strip(), limit)
+
+        index = cls._index
+        if index is None:
+            index = await sync_to_async(cls._build_first)()
+        elif time.monotonic() - cls._built_at > settings.TYPEAHEAD_INDEX_TTL:
+            cls._rebuild_in_background()
+        with cls._lock:
+            return index.lookup(query, limit)
+
+    @classmethod
+    def _suggest_trigram(cls, query: str, limit: int) -> List[Tuple[int, str]]:
+        needle = " ".join(query.split())
+        escaped = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        published, published_params = PostManager.visibility_sql()
+        table = connection.ops.quote_name(Post._meta.db_table)
+        if len(needle) < TitleSubstringIndex.SUBSTRING_MIN_LENGTH:
+            sql = f"""
+                SELECT id, title FROM {table}
+                WHERE lower(title) COLLATE "C" LIKE %s AND {published}
+                ORDER BY lower(title) COLLATE "C", id
+                LIMIT %s
+            """
+            params = [f"{escaped.lower()}%", *published_params, limit]
+        else:
+            sql = f"""
+                SELECT id, title FROM (
+                    SELECT id, title FROM {table} WHERE title ILIKE %s AND {published} LIMIT %s
+                ) matches
+                ORDER BY title ILIKE %s DESC, length(title), id
+                LIMIT %s
+            """
+            params = [f"%{escaped}%", *published_params, TitleSubstringIndex.SCAN_LIMIT, f"{escaped}%", limit]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [tuple(row) for row in cursor.fetchall()]
+
+    @classmethod
+    def _build(cls) -> TitleSubstringIndex:
+        """
+        Build the in-memory index from the published posts, then replay the writes made during the build.
+
+        :return: built index.
+        """
+        index = TitleSubstringIndex()
+        index.build(Post.published.order_by().values_list("id", "title").iterator(chunk_size=10000))
+        with cls._lock:
+            for post_id, title in cls._pending or []:
+                if title is None:
+                    index.remove(post_id)
+                else:
+                    index.add(post_id, title)
+            cls._index = index
+            cls._built_at = time.monotonic()
+            cls._pending = None
+        return index
+
+    @classmethod
+    def _build_first(cls) -> TitleSubstringIndex:
+        """
+        Build the in-memory index, unless a concurrent lookup built it meanwhile.
+
+        :return: built index.
+        """
+        with cls._build_lock:
+            return cls._index or cls._build()
+
+    @classmethod
+    def _rebuild_in_background(cls) -> None:
+        """
+        Start rebuilding the in-memory index in a background thread, unless a rebuild is running already.
+        """
+        with cls._lock:
+            if cls._pending is not None:
+                return
+            cls._pending = []
+        threading.Thread(target=cls._rebuild, daemon=True).start()
+
+    @classmethod
+    def _rebuild(cls) -> None:
+        try:
+            cls._build()
+        finally:
+            with cls._lock:
+                cls._pending = None
+            connections.close_all()
+
+    @classmethod
+    def _apply(cls, post_id: int, title: Optional[str]) -> None:
+        """
+        Add, replace or drop (with a None title) a post in the in-memory index, if the index is built.
+        """
+        with cls._lock:
+            if cls._index is None:
+                return
+            if title is None:
+                cls._index.remove(post_id)
+            else:
+                cls._index.add(post_id, title)
+            if cls._pending is not None:
+                cls._pending.append((post_id, title))
+
+    @classmethod
+    def index(cls, post: Post) -> None:
+        """
+        Add, replace or drop a post in the in-memory index after a write, if the index is built.
+
+        :param post: written post.
+        """
+        cls._apply(post.pk, post.title if PostManager.is_visible(post) else None)
+
+    @classmethod
+    def remove(cls, post_id: int) -> None:
+        """
+        Drop a post from the in-memory index, if the index is built.
+
+        :param post_id: post ID.
+        """
+        cls._apply(post_id, None)
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Drop the in-memory index, so the next lookup builds it again.
+        """
+        with cls._lock:
+            cls._index = None
+            cls._built_at = 0.0
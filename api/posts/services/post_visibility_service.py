@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+
+
+class PostVisibilityService:
+    """
+    Service class for a bounded in-process cache of whether posts are visible, that is published and not blocked.
+
+    Entries expire after POST_VISIBILITY_CACHE_TTL seconds, and the least recently used ones are dropped beyond
+    POST_VISIBILITY_CACHE_SIZE entries, 0 disabling the cache. Post writes of the current process drop the entry
+    of the post right away, the TTL bounds how long other processes see a stale value.
+
+    Attributes:
+        - get (method): Get the cached visibility of a post.
+        - set (method): Cache the visibility of a post.
+        - forget (method): Drop the cached visibility of a post.
+        - clear (method): Drop every entry.
+    """
+
+    _entries: "OrderedDict[int, tuple]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _enabled() -> bool:
+        return settings.POST_VISIBILITY_CACHE_SIZE > 0
+
+    @classmethod
+    def get(cls, post_id: int) -> Optional[bool]:
+        """
+        Get the cached visibility of a post.
+
+        :param post_id: post ID.
+        :return: True if the post is visible, False if it is not, None if it is not cached.
+        """
+        if not cls._enabled():
+            return None
+
+        with cls._lock:
+            entry = cls._entries.get(post_id)
+            if entry is None:
+                return None
+            visible, expires_at = entry
+            if expires_at <= time.monotonic():
+                del cls._entries[post_id]
+                return None
+            cls._entries.move_to_end(post_id)
+            return visible
+
+    @classmethod
+    def set(cls, post_id: int, visible: bool) -> None:
+        """
+        Cache the visibility of a post.
+
+        :param post_id: post ID.
+        :param visible: whether the post is visible.
+        """
+        if not cls._enabled():
+            return
+
+        with cls._lock:
+            cls._entries[post_id] = (visible, time.monotonic() + settings.POST_VISIBILITY_CACHE_TTL)
+            cls._entries.move_to_end(post_id)
+            while len(cls._entries) > settings.POST_VISIBILITY_CACHE_SIZE:
+                cls._entries.popitem(last=False)
+
+    @classmethod
+    def forget(cls, post_id: int) -> None:
+        """
+        Drop the cached visibility of a post.
+
+        :param post_id: post ID.
+        """
+        with cls._lock:
+            cls._entries.pop(post_id, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Drop every entry.
+        """
+        with cls._lock:
+            cls._entries.clear()
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.posts.models import Post
+from api.posts.services import PostVisibilityService
+
+
+@receiver(post_save, sender=Post, dispatch_uid="posts_forget_visibility_on_save")
+@receiver(post_delete, sender=Post, dispatch_uid="posts_forget_visibility_on_delete")
+def forget_visibility(sender, instance: Post, **kwargs) -> None:
+    """
+    Drop the cached visibility of a saved or deleted post, so publishing or blocking it is seen right away.
+    """
+    PostVisibilityService.forget(instance.pk)
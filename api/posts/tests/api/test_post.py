@@ -1,15 +1,33 @@
+import warnings
+
 from asgiref.sync import sync_to_async
-from django.test import TestCase, tag
+from django.core.cache import CacheKeyWarning, cache
+from django.test import TestCase, override_settings, tag
 from ninja_extra.testing import TestAsyncClient
 from ninja_jwt.tokens import AccessToken
 
+from api.comments.factories import CommentFactory
 from api.posts.api import PostController
 from api.posts.factories import PostFactory
+from api.posts.models import Post
+from api.posts.repositories.post_repository import PostRepository
+from api.posts.services import PostTypeaheadService
 from api.users.factories import UserFactory
 
+PURGED_KEYS = []
+
+
+def record_purge(keys):
+    PURGED_KEYS.extend(keys)
+
 
 @tag("api")
 class PostControllerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        PostTypeaheadService.reset()
+        PURGED_KEYS.clear()
+
     async def test_create_post_success(self):
         user = await sync_to_async(UserFactory)(
             email="test@gmail.com",
@@ -64,7 +82,82 @@ class PostControllerTest(TestCase):
         client = TestAsyncClient(PostController)
         response = await client.get(path="/")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.json()), 3)
+        self.assertEqual(len(response.json()["items"]), 3)
+        self.assertIsNone(response.json()["next_cursor"])
+
+    async def test_get_all_published_posts_paginated(self):
+        user = await sync_to_async(UserFactory)()
+        posts = await sync_to_async(PostFactory.create_batch)(5, author=user)
+        client = TestAsyncClient(PostController)
+        first_page = await client.get(path="/?limit=2")
+        self.assertEqual(first_page.status_code, 200)
+        self.assertEqual(len(first_page.json()["items"]), 2)
+        self.assertIsNotNone(first_page.json()["next_cursor"])
+
+        seen_ids = [post["id"] for post in first_page.json()["items"]]
+        next_cursor = first_page.json()["next_cursor"]
+        while next_cursor:
+            page = await client.get(path=f"/?limit=2&cursor={next_cursor}")
+            self.assertEqual(page.status_code, 200)
+            seen_ids += [post["id"] for post in page.json()["items"]]
+            next_cursor = page.json()["next_cursor"]
+
+        self.assertEqual(seen_ids, sorted((post.id for post in posts), reverse=True))
+
+    async def test_get_all_published_posts_invalid_cursor(self):
+        client = TestAsyncClient(PostController)
+        response = await client.get(path="/?cursor=invalid")
+        self.assertEqual(response.status_code, 400)
+
+    async def test_get_all_published_posts_invalid_cursor_never_reaches_the_cache(self):
+        client = TestAsyncClient(PostController)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", CacheKeyWarning)
+            response = await client.get(path=f"/?cursor={'not a cursor ' * 30}")
+        self.assertEqual(response.status_code, 400)
+
+    async def test_search_posts_success(self):
+        user = await sync_to_async(UserFactory)()
+        post_repository = PostRepository()
+        post = await post_repository.create(
+            post={"title": "Running shoes", "content": "Light and fast.", "is_published": True},
+            author_id=user.pk,
+        )
+        await post_repository.create(
+            post={"title": "Draft about running", "content": "Not yet.", "is_published": False},
+            author_id=user.pk,
+        )
+        client = TestAsyncClient(PostController)
+        response = await client.get(path="/search?q=running")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["id"] for item in response.json()["items"]], [post.pk])
+        self.assertIsNone(response.json()["next_cursor"])
+
+    async def test_search_posts_paginated(self):
+        user = await sync_to_async(UserFactory)()
+        post_repository = PostRepository()
+        content_match = await post_repository.create(
+            post={"title": "Weekend", "content": "We went to the garden.", "is_published": True},
+            author_id=user.pk,
+        )
+        title_match = await post_repository.create(
+            post={"title": "Garden notes", "content": "Tomatoes.", "is_published": True},
+            author_id=user.pk,
+        )
+        client = TestAsyncClient(PostController)
+        first_page = await client.get(path="/search?q=garden&limit=1")
+        self.assertEqual(first_page.status_code, 200)
+        self.assertEqual([item["id"] for item in first_page.json()["items"]], [title_match.pk])
+
+        next_page = await client.get(path=f"/search?q=garden&limit=1&cursor={first_page.json()['next_cursor']}")
+        self.assertEqual(next_page.status_code, 200)
+        self.assertEqual([item["id"] for item in next_page.json()["items"]], [content_match.pk])
+        self.assertIsNone(next_page.json()["next_cursor"])
+
+    async def test_search_posts_invalid_cursor(self):
+        client = TestAsyncClient(PostController)
+        response = await client.get(path="/search?q=garden&cursor=invalid")
+        self.assertEqual(response.status_code, 400)
 
     async def test_get_post_success(self):
         post = await sync_to_async(PostFactory)()
@@ -153,3 +246,140 @@ class PostControllerTest(TestCase):
             headers={"Authorization": f"Bearer {token}"},
         )
         self.assertEqual(response.status_code, 404)
+
+    async def test_get_post_cached_until_update(self):
+        user = await sync_to_async(UserFactory)()
+        post = await sync_to_async(PostFactory)(author=user, title="Cached Title")
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        client = TestAsyncClient(PostController)
+        response = await client.get(path=f"/{post.id}")
+        self.assertEqual(response.json()["title"], "Cached Title")
+
+        await Post.objects.filter(pk=post.id).aupdate(title="Changed Title")
+        response = await client.get(path=f"/{post.id}")
+        self.assertEqual(response.json()["title"], "Cached Title")
+
+        await client.put(
+            path=f"/{post.id}",
+            json={
+                "title": "Updated Title",
+                "content": "Updated Content",
+                "is_published": True,
+            },
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        response = await client.get(path=f"/{post.id}")
+        self.assertEqual(response.json()["title"], "Updated Title")
+
+    async def test_get_all_published_posts_cached_until_create(self):
+        user = await sync_to_async(UserFactory)()
+        await sync_to_async(PostFactory)(author=user)
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        client = TestAsyncClient(PostController)
+        response = await client.get(path="/")
+        self.assertEqual(len(response.json()["items"]), 1)
+
+        await sync_to_async(PostFactory)(author=user)
+        response = await client.get(path="/")
+        self.assertEqual(len(response.json()["items"]), 1)
+
+        await client.post(
+            path="/",
+            json={
+                "title": "Test Title",
+                "content": "Test Content",
+                "is_published": True,
+            },
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        response = await client.get(path="/")
+        self.assertEqual(len(response.json()["items"]), 3)
+
+    async def test_get_all_published_posts_cached_until_comment_count_changes(self):
+        post = await sync_to_async(PostFactory)()
+        client = TestAsyncClient(PostController)
+        response = await client.get(path="/")
+        self.assertEqual(response.json()["items"][0]["comment_count"], 0)
+        etag = response["ETag"]
+
+        await sync_to_async(CommentFactory)(post=post)
+        response = await client.get(path="/", META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["items"][0]["comment_count"], 1)
+
+    async def test_get_post_not_modified(self):
+        user = await sync_to_async(UserFactory)()
+        post = await sync_to_async(PostFactory)(author=user)
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        client = TestAsyncClient(PostController)
+        response = await client.get(path=f"/{post.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "public, max-age=0, s-maxage=60")
+        self.assertEqual(response["Surrogate-Key"], f"post-{post.id}")
+        etag = response["ETag"]
+
+        response = await client.get(path=f"/{post.id}", META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        await sync_to_async(cache.clear)()
+        response = await client.get(path=f"/{post.id}", META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 304)
+
+        await Post.objects.filter(pk=post.id).aupdate(comment_count=1)
+        response = await client.get(path=f"/{post.id}", META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        etag = response["ETag"]
+
+        await client.put(
+            path=f"/{post.id}",
+            json={"title": "Updated Title", "content": "Updated Content", "is_published": True},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        response = await client.get(path=f"/{post.id}", META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["title"], "Updated Title")
+
+    async def test_get_post_not_found_with_etag(self):
+        client = TestAsyncClient(PostController)
+        response = await client.get(path="/999", META={"HTTP_IF_NONE_MATCH": 'W/"stale"'})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_get_all_published_posts_not_modified(self):
+        user = await sync_to_async(UserFactory)()
+        posts = await sync_to_async(PostFactory.create_batch)(2, author=user)
+        client = TestAsyncClient(PostController)
+        response = await client.get(path="/?limit=1")
+        self.assertEqual(response["Surrogate-Key"], f"posts post-{posts[1].id}")
+        etag = response["ETag"]
+
+        response = await client.get(path="/?limit=1", META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 304)
+
+        await sync_to_async(cache.clear)()
+        response = await client.get(path="/?limit=1", META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 304)
+
+        await Post.objects.filter(pk=posts[0].id).adelete()
+        await sync_to_async(cache.clear)()
+        response = await client.get(path="/?limit=1", META={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()["next_cursor"])
+
+    @override_settings(SURROGATE_PURGE_HANDLER="api.posts.tests.api.test_post.record_purge")
+    async def test_post_writes_purge_surrogate_keys(self):
+        user = await sync_to_async(UserFactory)()
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        client = TestAsyncClient(PostController)
+        response = await client.post(
+            path="/",
+            json={"title": "Test Title", "content": "Test Content", "is_published": True},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        post_id = response.json()["id"]
+        self.assertEqual(PURGED_KEYS, ["posts"])
+
+        await client.delete(path=f"/{post_id}", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(PURGED_KEYS, ["posts", f"post-{post_id}", "posts"])
@@ -1,7 +1,8 @@
-from django.test import TestCase, tag
+from django.db import connection
+from django.test import TestCase, override_settings, tag
 
 from api.posts.factories import PostFactory
-from api.posts.models import Post
+from api.posts.models import Post, PostManager
 from api.users.factories import UserFactory
 
 
@@ -40,3 +41,29 @@ class PostModelManagerTestCase(TestCase):
         self.assertIsNotNone(published_posts.first().created_at)
         self.assertIsNotNone(published_posts.first().updated_at)
         self.assertIsNotNone(published_posts.first().author)
+
+    def test_visibility_is_shared_by_the_queryset_raw_sql_and_loaded_posts(self):
+        """
+        Test that the manager, its SQL conditions and its check of loaded posts agree under both pending policies.
+        """
+        user = UserFactory()
+        PostFactory(is_published=True, author=user)
+        PostFactory(is_published=False, author=user)
+        PostFactory(is_blocked=True, author=user)
+        pending = PostFactory(is_published=True, author=user)
+        Post.objects.filter(pk=pending.pk).update(moderation_pending=True)
+        table = connection.ops.quote_name(Post._meta.db_table)
+
+        for policy, visible_count in (("hide", 1), ("show", 2)):
+            with self.subTest(policy=policy), override_settings(PROFANITY_PENDING_POLICY=policy):
+                conditions, params = PostManager.visibility_sql("post")
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SELECT post.id FROM {table} post WHERE {conditions} ORDER BY post.id", params)
+                    raw_ids = [row[0] for row in cursor.fetchall()]
+
+                published_ids = list(Post.published.order_by("id").values_list("id", flat=True))
+                self.assertEqual(len(published_ids), visible_count)
+                self.assertEqual(raw_ids, published_ids)
+                self.assertEqual(
+                    [post.pk for post in Post.objects.order_by("id") if PostManager.is_visible(post)], published_ids
+                )
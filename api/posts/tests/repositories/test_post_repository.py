@@ -130,3 +130,57 @@ class PostFactory(TestCase):
         with self.assertRaises(Post.DoesNotExist) as context:
             await post_repository.delete(post_id=None, author_id=user.pk)
         self.assertEqual(str(context.exception), "Post matching query does not exist.")
+
+    async def test_search_published_follows_writes(self):
+        """
+        Test that the search index follows post creation, update and deletion, and skips unpublished posts.
+        """
+        user = await sync_to_async(UserFactory)()
+        post_repository = PostRepository()
+        post = await post_repository.create(
+            post={"title": "Running shoes", "content": "Light and fast.", "is_published": True},
+            author_id=user.pk,
+        )
+        await post_repository.create(
+            post={"title": "Draft about running", "content": "Not yet.", "is_published": False},
+            author_id=user.pk,
+        )
+
+        posts, next_cursor = await post_repository.search_published(query="run", cursor=None, limit=10)
+        self.assertEqual([found.pk for found in posts], [post.pk])
+        self.assertIsNone(next_cursor)
+
+        await post_repository.update(
+            post_id=post.pk,
+            post={"title": "Hiking boots", "content": "Sturdy.", "is_published": True},
+            author_id=user.pk,
+        )
+        self.assertEqual((await post_repository.search_published(query="shoes", cursor=None, limit=10))[0], [])
+        self.assertEqual(len((await post_repository.search_published(query="boots", cursor=None, limit=10))[0]), 1)
+
+        await post_repository.delete(post_id=post.pk, author_id=user.pk)
+        self.assertEqual((await post_repository.search_published(query="boots", cursor=None, limit=10))[0], [])
+
+    async def test_search_published_ranked_pages(self):
+        """
+        Test that title matches rank first and that pages follow each other through the cursor.
+        """
+        user = await sync_to_async(UserFactory)()
+        post_repository = PostRepository()
+        content_match = await post_repository.create(
+            post={"title": "Weekend", "content": "We went to the garden.", "is_published": True},
+            author_id=user.pk,
+        )
+        title_match = await post_repository.create(
+            post={"title": "Garden notes", "content": "Tomatoes.", "is_published": True},
+            author_id=user.pk,
+        )
+
+        posts, next_cursor = await post_repository.search_published(query="garden", cursor=None, limit=1)
+        self.assertEqual([found.pk for found in posts], [title_match.pk])
+        posts, next_cursor = await post_repository.search_published(query="garden", cursor=next_cursor, limit=1)
+        self.assertEqual([found.pk for found in posts], [content_match.pk])
+        self.assertIsNone(next_cursor)
+
+        with self.assertRaises(ValueError):
+            await post_repository.search_published(query="garden", cursor="invalid", limit=1)
@@ -0,0 +1,29 @@
+from django.test import TestCase, tag
+
+from api.posts.factories import PostFactory
+from api.posts.models import Post
+from api.posts.schemas import PostResponseSchema, PostRow
+from api.services import JSONResponseService
+
+
+@tag("schemas")
+class PostRowTest(TestCase):
+    """
+    Test the PostRow projection row.
+    """
+
+    def test_fields_match_the_response_schema(self):
+        """
+        Test that the row selects exactly the fields of PostResponseSchema.
+        """
+        self.assertEqual(set(PostRow.FIELDS), set(PostResponseSchema.model_fields))
+
+    def test_renders_like_the_response_schema(self):
+        """
+        Test that a row read with values_list renders the same JSON as the schema of the post.
+        """
+        post = PostFactory()
+        row = PostRow(*Post.objects.values_list(*PostRow.FIELDS).get(pk=post.pk))
+        schema = PostResponseSchema.from_orm(post)
+
+        self.assertEqual(JSONResponseService.render_line(row), JSONResponseService.render_line(schema.model_dump()))
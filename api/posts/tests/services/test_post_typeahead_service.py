@@ -0,0 +1,152 @@
+import threading
+import time
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, TestCase, tag
+
+from api.posts.factories import PostFactory
+from api.posts.repositories.post_repository import PostRepository
+from api.posts.services import PostTypeaheadService, TitleSubstringIndex
+from api.users.factories import UserFactory
+
+
+@tag("services")
+class TitleSubstringIndexTestCase(SimpleTestCase):
+    """
+    Test case for the TitleSubstringIndex class.
+    """
+
+    def setUp(self):
+        self.index = TitleSubstringIndex()
+        self.index.build(
+            [
+                (1, "Gardening for beginners"),
+                (2, "The garden"),
+                (3, "Winter garden tips"),
+                (4, "Cooking pasta"),
+            ]
+        )
+
+    def test_lookup_ranks_prefix_matches_first(self):
+        """
+        Test that titles starting with the query come first, then the shortest ones.
+        """
+        self.assertEqual(
+            [post_id for post_id, _ in self.index.lookup("gard", limit=10)],
+            [1, 2, 3],
+        )
+        self.assertEqual(self.index.lookup("garden tip", limit=10), [(3, "Winter garden tips")])
+        self.assertEqual(self.index.lookup("GARDEN", limit=1), [(1, "Gardening for beginners")])
+        self.assertEqual(self.index.lookup("  ", limit=10), [])
+
+    def test_lookup_matches_anywhere_in_the_title(self):
+        """
+        Test that the query matches inside words and across words, as ILIKE does on PostgreSQL.
+        """
+        self.index.build([(1, "Hello world"), (2, "Unhelpful advice")])
+
+        self.assertEqual(self.index.lookup("ello", limit=10), [(1, "Hello world")])
+        self.assertEqual(self.index.lookup("help", limit=10), [(2, "Unhelpful advice")])
+        self.assertEqual([post_id for post_id, _ in self.index.lookup("hel", limit=10)], [1, 2])
+        self.assertEqual(self.index.lookup("lo wo", limit=10), [(1, "Hello world")])
+        self.index.add(3, "Yellow")
+        self.assertEqual([post_id for post_id, _ in self.index.lookup("ello", limit=10)], [3, 1])
+
+    def test_short_lookup_matches_the_start_of_the_title(self):
+        """
+        Test that a query shorter than SUBSTRING_MIN_LENGTH matches the start of the title, alphabetically.
+        """
+        self.index.add(5, "gamma rays")
+
+        self.assertEqual([post_id for post_id, _ in self.index.lookup("ga", limit=10)], [5, 1])
+        self.assertEqual(self.index.lookup("T", limit=10), [(2, "The garden")])
+        self.assertEqual(self.index.lookup("ti", limit=10), [])
+
+    def test_add_and_remove(self):
+        """
+        Test that titles can be added, replaced and removed incrementally.
+        """
+        self.index.add(5, "Garden party")
+        self.index.add(4, "Pasta in the garden")
+        self.index.remove(1)
+
+        self.assertEqual([post_id for post_id, _ in self.index.lookup("garden", limit=10)], [5, 2, 3, 4])
+        self.assertEqual(self.index.lookup("cooking", limit=10), [])
+        self.assertEqual(len(self.index), 4)
+
+
+@tag("services")
+class PostTypeaheadServiceTestCase(TestCase):
+    """
+    Test case for the PostTypeaheadService class.
+    """
+
+    def setUp(self):
+        PostTypeaheadService.reset()
+
+    def tearDown(self):
+        PostTypeaheadService.reset()
+
+    async def test_suggest_follows_repository_writes(self):
+        """
+        Test that the index is built from the published posts, then kept in step by the repository.
+        """
+        user = await sync_to_async(UserFactory)()
+        await sync_to_async(PostFactory)(title="Python tips", author=user)
+        await sync_to_async(PostFactory)(title="Python drafts", author=user, is_published=False)
+        self.assertEqual([title for _, title in await PostTypeaheadService.suggest("pyth", limit=10)], ["Python tips"])
+
+        post_repository = PostRepository()
+        post = await post_repository.create(
+            post={"title": "Python", "content": "Basics.", "is_published": True},
+            author_id=user.pk,
+        )
+        self.assertEqual(
+            [title for _, title in await PostTypeaheadService.suggest("pyth", limit=10)],
+            ["Python", "Python tips"],
+        )
+
+        await post_repository.delete(post_id=post.pk, author_id=user.pk)
+        self.assertEqual([title for _, title in await PostTypeaheadService.suggest("pyth", limit=10)], ["Python tips"])
+
+    def test_build_replays_writes_made_during_a_rebuild(self):
+        """
+        Test that the writes made while the index is rebuilt are applied to the new index.
+        """
+        user = UserFactory()
+        kept = PostFactory(title="Rust tips", author=user)
+        dropped = PostFactory(title="Rust drafts", author=user)
+        PostTypeaheadService._build()
+
+        PostTypeaheadService._pending = []
+        PostTypeaheadService.remove(dropped.pk)
+        PostTypeaheadService._apply(kept.pk + 100, "Rust news")
+        index = PostTypeaheadService._build()
+
+        self.assertEqual([title for _, title in index.lookup("rust", limit=10)], ["Rust tips", "Rust news"])
+        self.assertIsNone(PostTypeaheadService._pending)
+
+    def test_concurrent_first_lookups_build_once(self):
+        """
+        Test that lookups arriving before the index is built wait for a single build.
+        """
+        builds = []
+
+        def build():
+            builds.append(threading.get_ident())
+            time.sleep(0.05)
+            index = TitleSubstringIndex()
+            index.build([(1, "Go tips")])
+            PostTypeaheadService._index = index
+            return index
+
+        with mock.patch.object(PostTypeaheadService, "_build", side_effect=build):
+            threads = [threading.Thread(target=PostTypeaheadService._build_first) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(PostTypeaheadService._index.lookup("go", limit=10), [(1, "Go tips")])
@@ -0,0 +1,6 @@
+from .profiling import ProfilingController
+
+
+__all__ = [
+    "ProfilingController",
+]
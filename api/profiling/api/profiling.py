@@ -0,0 +1,34 @@
+from typing import List
+
+from ninja_extra import api_controller, permissions, route, status
+
+from api.profiling.schemas import RouteProfileSchema
+from api.profiling.services import ProfilingService
+from api.users.authentication import UserJWTAuth
+
+
+@api_controller("/profiling", tags=["profiling"], auth=UserJWTAuth(), permissions=[permissions.IsAdminUser])
+class ProfilingController:
+    """
+    Controller for the request profiles, available to admin users only.
+
+    Attributes:
+        - get_route_profiles (method): Get the aggregated profile of every route.
+        - reset_route_profiles (method): Drop the aggregated profiles.
+    """
+
+    @route.get("/", response={status.HTTP_200_OK: List[RouteProfileSchema]})
+    async def get_route_profiles(self) -> List[RouteProfileSchema]:
+        """
+        Get the aggregated profile of every route served by this process, slowest first.
+
+        :return: profiles per route
+        """
+        return [RouteProfileSchema(**route_profile) for route_profile in ProfilingService.snapshot()]
+
+    @route.delete("/", response={status.HTTP_204_NO_CONTENT: None})
+    async def reset_route_profiles(self) -> None:
+        """
+        Drop the aggregated profiles of this process.
+        """
+        ProfilingService.reset()
@@ -0,0 +1,68 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import request_started
+from django.http import HttpRequest, HttpResponse
+
+from api.profiling.services import ProfilingService
+
+
+class ProfilingMiddleware:
+    """
+    Middleware profiling every request, enabled by the PROFILING_ENABLED setting.
+
+    Every response gets a Server-Timing header with the query count and the time spent in
+    queries, in rendering and in the rest of the handler, and every request is added to the
+    aggregates of its route.
+
+    Attributes:
+        - get_response (callable): The next handler in the middleware chain.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        request_started.connect(ProfilingService.install_query_recorder, dispatch_uid="profiling_query_recorder")
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = ProfilingService.start()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+            return self._finish(request, response, time.perf_counter() - started)
+        finally:
+            ProfilingService.stop(token)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        token = ProfilingService.start()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+            return self._finish(request, response, time.perf_counter() - started)
+        finally:
+            ProfilingService.stop(token)
+
+    @staticmethod
+    def _finish(request: HttpRequest, response: HttpResponse, total_time: float) -> HttpResponse:
+        """
+        Add the Server-Timing header to a response and record the request.
+        """
+        profile = ProfilingService.current()
+        response["Server-Timing"] = ProfilingService.server_timing(total_time, profile)
+
+        resolver_match = getattr(request, "resolver_match", None)
+        route = resolver_match.route if resolver_match else "<unresolved>"
+        ProfilingService.record(f"{request.method} /{route}", total_time, profile)
+        return response
@@ -0,0 +1,16 @@
+from typing import Any
+
+from django.http import HttpRequest
+
+from api.profiling.services import ProfilingService
+from api.renderers import FastJSONRenderer
+
+
+class ProfilingJSONRenderer(FastJSONRenderer):
+    """
+    JSON renderer adding the rendering time to the profile of the current request.
+    """
+
+    def render(self, request: HttpRequest, data: Any, *, response_status: int) -> Any:
+        with ProfilingService.measure_serialization():
+            return super().render(request, data, response_status=response_status)
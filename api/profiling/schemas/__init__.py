@@ -0,0 +1,6 @@
+from .route_profile_schema import RouteProfileSchema
+
+
+__all__ = [
+    "RouteProfileSchema",
+]
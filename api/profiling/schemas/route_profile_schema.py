@@ -0,0 +1,30 @@
+from typing import Dict
+
+from ninja_schema import Schema
+
+
+class RouteProfileSchema(Schema):
+    """
+    Route profile schema with the aggregated timings of the requests to a route.
+
+    Attributes:
+        - route (str): The method and URL pattern of the route.
+        - count (int): The number of requests.
+        - mean_total_ms (float): The mean time spent handling a request.
+        - mean_db_ms (float): The mean time spent running queries.
+        - mean_serialization_ms (float): The mean time spent rendering the response body.
+        - mean_handler_ms (float): The mean time spent in the rest of the handler.
+        - mean_queries (float): The mean number of queries.
+        - max_queries (int): The largest number of queries of a request.
+        - histogram (Dict[str, int]): The number of requests at or below every latency bound, in milliseconds.
+    """
+
+    route: str
+    count: int
+    mean_total_ms: float
+    mean_db_ms: float
+    mean_serialization_ms: float
+    mean_handler_ms: float
+    mean_queries: float
+    max_queries: int
+    histogram: Dict[str, int]
@@ -0,0 +1,7 @@
+from .profiling_service import ProfilingService, RequestProfile
+
+
+__all__ = [
+    "ProfilingService",
+    "RequestProfile",
+]
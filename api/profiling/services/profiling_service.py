@@ -0,0 +1,219 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional
+
+from django.db import connections
+
+
+class RequestProfile:
+    """
+    Timings of a single request, collected while it is handled.
+
+    Attributes:
+        - query_count (int): The number of SQL queries run.
+        - db_time (float): The time spent running SQL queries, in seconds.
+        - serialization_time (float): The time spent rendering the response body, in seconds.
+    """
+
+    __slots__ = ("query_count", "db_time", "serialization_time")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serialization_time = 0.0
+
+
+class ProfilingService:
+    """
+    Service class for per-request profiling and per-route aggregates.
+
+    The profile of the current request lives in a context variable, which sync_to_async copies
+    into the worker thread, so queries run from async views are attributed to the right request.
+    The aggregates are kept per process.
+
+    Attributes:
+        - BUCKETS_MS (tuple): The upper bounds of the latency histogram buckets, in milliseconds.
+        - start (method): Start profiling the current request.
+        - stop (method): Stop profiling the current request.
+        - current (method): Get the profile of the current request.
+        - record_query (method): Database execute wrapper timing a query.
+        - install_query_recorder (method): Attach the execute wrapper to the connections of the current thread.
+        - measure_serialization (method): Time the rendering of a response body.
+        - record (method): Add a finished request to the aggregates of its route.
+        - server_timing (method): Format a profile as a Server-Timing header.
+        - snapshot (method): Get the aggregates of every route.
+        - reset (method): Drop the aggregates of every route.
+    """
+
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    _current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+    _routes: Dict[str, dict] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def start(cls) -> Token:
+        """
+        Start profiling the current request.
+
+        :return: token to stop profiling with.
+        """
+        return cls._current.set(RequestProfile())
+
+    @classmethod
+    def stop(cls, token: Token) -> None:
+        """
+        Stop profiling the current request.
+
+        :param token: token returned by start.
+        """
+        cls._current.reset(token)
+
+    @classmethod
+    def current(cls) -> Optional[RequestProfile]:
+        """
+        Get the profile of the current request.
+
+        :return: profile, None outside of a profiled request.
+        """
+        return cls._current.get()
+
+    @classmethod
+    def record_query(cls, execute, sql, params, many, context):
+        """
+        Database execute wrapper adding every query to the profile of the current request.
+        """
+        profile = cls._current.get()
+        if profile is None:
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            profile.db_time += time.perf_counter() - started
+            profile.query_count += 1
+
+    @classmethod
+    def install_query_recorder(cls, **kwargs) -> None:
+        """
+        Attach the execute wrapper to every connection of the current thread.
+
+        Connected to request_started, which runs in the thread the ORM calls of the request run in.
+        """
+        for connection in connections.all():
+            if cls.record_query not in connection.execute_wrappers:
+                connection.execute_wrappers.append(cls.record_query)
+
+    @classmethod
+    @contextmanager
+    def measure_serialization(cls):
+        """
+        Time the rendering of a response body into the profile of the current request.
+        """
+        profile = cls._current.get()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.serialization_time += time.perf_counter() - started
+
+    @classmethod
+    def record(cls, route: str, total_time: float, profile: RequestProfile) -> None:
+        """
+        Add a finished request to the aggregates of its route.
+
+        :param route: method and URL pattern of the request.
+        :param total_time: time spent handling the request, in seconds.
+        :param profile: profile of the request.
+        """
+        total_ms = total_time * 1000
+        with cls._lock:
+            stats = cls._routes.get(route)
+            if stats is None:
+                stats = cls._routes[route] = {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "db_ms": 0.0,
+                    "serialization_ms": 0.0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "buckets": [0] * (len(cls.BUCKETS_MS) + 1),
+                }
+            stats["count"] += 1
+            stats["total_ms"] += total_ms
+            stats["db_ms"] += profile.db_time * 1000
+            stats["serialization_ms"] += profile.serialization_time * 1000
+            stats["queries"] += profile.query_count
+            stats["max_queries"] = max(stats["max_queries"], profile.query_count)
+            for index, bound in enumerate(cls.BUCKETS_MS):
+                if total_ms <= bound:
+                    break
+            else:
+                index = len(cls.BUCKETS_MS)
+            stats["buckets"][index] += 1
+
+    @staticmethod
+    def server_timing(total_time: float, profile: RequestProfile) -> str:
+        """
+        Format a profile as a Server-Timing header.
+
+        The handler time is what is left of the total once the queries and the rendering are taken out.
+
+        :param total_time: time spent handling the request, in seconds.
+        :param profile: profile of the request.
+        :return: header value.
+        """
+        handler_time = max(total_time - profile.db_time - profile.serialization_time, 0.0)
+        return ", ".join(
+            [
+                f'db;dur={profile.db_time * 1000:.2f};desc="{profile.query_count} queries"',
+                f"serialize;dur={profile.serialization_time * 1000:.2f}",
+                f"handler;dur={handler_time * 1000:.2f}",
+                f"total;dur={total_time * 1000:.2f}",
+            ]
+        )
+
+    @classmethod
+    def snapshot(cls) -> List[dict]:
+        """
+        Get the aggregates of every route, with means and a cumulative latency histogram.
+
+        :return: aggregates per route, slowest mean first.
+        """
+        with cls._lock:
+            routes = {route: dict(stats, buckets=list(stats["buckets"])) for route, stats in cls._routes.items()}
+
+        snapshot = []
+        for route, stats in routes.items():
+            count = stats["count"]
+            cumulative = 0
+            histogram = {}
+            for bound, bucket_count in zip([*map(str, cls.BUCKETS_MS), "+Inf"], stats["buckets"]):
+                cumulative += bucket_count
+                histogram[bound] = cumulative
+            snapshot.append(
+                {
+                    "route": route,
+                    "count": count,
+                    "mean_total_ms": stats["total_ms"] / count,
+                    "mean_db_ms": stats["db_ms"] / count,
+                    "mean_serialization_ms": stats["serialization_ms"] / count,
+                    "mean_handler_ms": max(stats["total_ms"] - stats["db_ms"] - stats["serialization_ms"], 0.0) / count,
+                    "mean_queries": stats["queries"] / count,
+                    "max_queries": stats["max_queries"],
+                    "histogram": histogram,
+                }
+            )
+        return sorted(snapshot, key=lambda route_stats: route_stats["mean_total_ms"], reverse=True)
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Drop the aggregates of every route.
+        """
+        with cls._lock:
+            cls._routes.clear()
@@ -0,0 +1,69 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings, tag
+from ninja_jwt.tokens import AccessToken
+
+from api.posts.factories import PostFactory
+from api.profiling.services import ProfilingService
+from api.users.factories import UserFactory
+from api.users.services import TokenService
+
+
+@tag("api")
+@override_settings(PROFILING_ENABLED=True)
+class ProfilingControllerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ProfilingService.reset()
+        self.addCleanup(ProfilingService.reset)
+
+    async def test_responses_have_server_timing(self):
+        await sync_to_async(PostFactory)()
+        response = await AsyncClient().get("/api/posts/")
+        self.assertEqual(response.status_code, 200)
+
+        metrics = dict(metric.split(";", 1) for metric in response["Server-Timing"].split(", "))
+        self.assertEqual(set(metrics), {"db", "serialize", "handler", "total"})
+        self.assertNotIn('desc="0 queries"', metrics["db"])
+
+    async def test_admin_gets_route_profiles(self):
+        admin = await sync_to_async(UserFactory)(is_staff=True)
+        token = await sync_to_async(AccessToken.for_user)(user=admin)
+        headers = {"Authorization": f"Bearer {token}"}
+        client = AsyncClient()
+        await client.get("/api/posts/")
+        await client.get("/api/posts/")
+
+        response = await client.get("/api/profiling/", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        profiles = {profile["route"]: profile for profile in response.json()}
+        self.assertEqual(profiles["GET /api/posts/"]["count"], 2)
+        self.assertGreaterEqual(profiles["GET /api/posts/"]["max_queries"], 1)
+        self.assertEqual(profiles["GET /api/posts/"]["histogram"]["+Inf"], 2)
+
+        response = await client.delete("/api/profiling/", headers=headers)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual([profile["route"] for profile in ProfilingService.snapshot()], ["DELETE /api/profiling/"])
+
+    async def test_route_profiles_are_admin_only(self):
+        user = await sync_to_async(UserFactory)()
+        token = await sync_to_async(AccessToken.for_user)(user=user)
+        response = await AsyncClient().get("/api/profiling/", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 403)
+
+        response = await AsyncClient().get("/api/profiling/")
+        self.assertEqual(response.status_code, 401)
+
+    async def test_demoted_admin_loses_access(self):
+        admin = await sync_to_async(UserFactory)(is_staff=True)
+        token, _ = await sync_to_async(TokenService.issue)(admin)
+        headers = {"Authorization": f"Bearer {token}"}
+        client = AsyncClient()
+        response = await client.get("/api/profiling/", headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+        admin.is_staff = False
+        await sync_to_async(admin.save)()
+        self.assertEqual(admin.token_version, 1)
+        response = await client.get("/api/profiling/", headers=headers)
+        self.assertEqual(response.status_code, 401)
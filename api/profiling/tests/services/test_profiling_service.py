@@ -0,0 +1,70 @@
+from django.test import SimpleTestCase, tag
+
+from api.profiling.services import ProfilingService, RequestProfile
+
+
+@tag("services")
+class ProfilingServiceTestCase(SimpleTestCase):
+    """
+    Test case for the ProfilingService class.
+    """
+
+    def setUp(self):
+        ProfilingService.reset()
+        self.addCleanup(ProfilingService.reset)
+
+    def test_measure_serialization_adds_to_current_profile(self):
+        """
+        Test that rendering time goes to the profile of the current request only.
+        """
+        with ProfilingService.measure_serialization():
+            pass
+        self.assertIsNone(ProfilingService.current())
+
+        token = ProfilingService.start()
+        try:
+            with ProfilingService.measure_serialization():
+                sum(range(1000))
+            self.assertGreater(ProfilingService.current().serialization_time, 0)
+        finally:
+            ProfilingService.stop(token)
+        self.assertIsNone(ProfilingService.current())
+
+    def test_server_timing(self):
+        """
+        Test that the handler time is the total without the queries and the rendering.
+        """
+        profile = RequestProfile()
+        profile.query_count = 3
+        profile.db_time = 0.004
+        profile.serialization_time = 0.001
+        self.assertEqual(
+            ProfilingService.server_timing(0.010, profile),
+            'db;dur=4.00;desc="3 queries", serialize;dur=1.00, handler;dur=5.00, total;dur=10.00',
+        )
+
+    def test_snapshot_aggregates_routes(self):
+        """
+        Test that requests are aggregated per route with a cumulative latency histogram.
+        """
+        profile = RequestProfile()
+        profile.query_count = 2
+        profile.db_time = 0.002
+        ProfilingService.record("GET /api/posts/", 0.004, profile)
+        ProfilingService.record("GET /api/posts/", 0.040, profile)
+        ProfilingService.record("GET /api/posts/", 9.0, RequestProfile())
+        ProfilingService.record("POST /api/posts/", 0.001, RequestProfile())
+
+        snapshot = ProfilingService.snapshot()
+        self.assertEqual([route["route"] for route in snapshot], ["GET /api/posts/", "POST /api/posts/"])
+
+        posts = snapshot[0]
+        self.assertEqual(posts["count"], 3)
+        self.assertAlmostEqual(posts["mean_total_ms"], (4 + 40 + 9000) / 3)
+        self.assertAlmostEqual(posts["mean_queries"], 4 / 3)
+        self.assertEqual(posts["max_queries"], 2)
+        self.assertEqual(posts["histogram"]["5"], 1)
+        self.assertEqual(posts["histogram"]["25"], 1)
+        self.assertEqual(posts["histogram"]["50"], 2)
+        self.assertEqual(posts["histogram"]["5000"], 2)
+        self.assertEqual(posts["histogram"]["+Inf"], 3)
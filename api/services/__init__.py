@@ -1,8 +1,18 @@
+from .author_write_service import AuthorWriteService
+from .http_cache_service import HttpCacheService
+from .json_response_service import JSONResponseService
+from .moderation_service import ModerationService
+from .pagination_service import CursorPaginationService
 from .profanity_service import ProfanityFilter
 from .user_service import UserService
 
 
 __all__ = [
+    "AuthorWriteService",
+    "HttpCacheService",
+    "JSONResponseService",
+    "ModerationService",
+    "CursorPaginationService",
     "ProfanityFilter",
     "UserService",
 ]
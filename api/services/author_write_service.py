@@ -0,0 +1,100 @@
+from typing import Tuple
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import Model, QuerySet
+from django.db.models.sql import UpdateQuery
+from django.utils import timezone
+
+from api.services.user_service import UserService
+
+
+class AuthorWriteService:
+    """
+    Service class for writes allowed to the author of a row only.
+
+    The author check is folded into the statement itself, so a successful write is a single
+    round trip. Only when no row matched is the row looked up again, to tell a missing row
+    from a row owned by someone else.
+
+    Attributes:
+        - RETURNING_VENDORS (tuple): The database vendors supporting UPDATE ... RETURNING.
+        - update (method): Update a row of the author and return it.
+        - delete (method): Delete a row of the author.
+    """
+
+    RETURNING_VENDORS = ("postgresql", "sqlite")
+
+    @classmethod
+    def _can_return_rows(cls, using: str) -> bool:
+        connection = connections[using]
+        return connection.vendor in cls.RETURNING_VENDORS and connection.features.can_return_columns_from_insert
+
+    @staticmethod
+    async def _raise_for_missing(queryset: QuerySet, pk: int, author_id: int) -> None:
+        """
+        Explain why no row matched a write: the row does not exist, or it belongs to another author.
+
+        :param queryset: queryset the row was looked up in.
+        :param pk: primary key of the row.
+        :param author_id: id of the user performing the write.
+        """
+        owner_id = await queryset.filter(pk=pk).values_list("author_id", flat=True).afirst()
+        if owner_id is None:
+            model = queryset.model
+            raise model.DoesNotExist(f"{model._meta.object_name} matching query does not exist.")
+        await UserService.check_author_permission(obj_author_id=owner_id, author_id=author_id)
+
+    @classmethod
+    async def update(cls, queryset: QuerySet, pk: int, author_id: int, values: dict) -> Model:
+        """
+        Update a row of the author and return it as stored.
+
+        On databases supporting it, this is one UPDATE ... RETURNING statement. Elsewhere,
+        the updated row is fetched right after the update. Queryset updates skip auto_now
+        fields, so those are set here, as save() would.
+
+        :param queryset: queryset to look the row up in, with plain column filters only.
+        :param pk: primary key of the row.
+        :param author_id: id of the user performing the update.
+        :param values: new field values.
+        :return: updated row.
+        """
+        owned = queryset.filter(pk=pk, author_id=author_id)
+        now = timezone.now()
+        values = {
+            **{field.name: now for field in owned.model._meta.concrete_fields if getattr(field, "auto_now", False)},
+            **values,
+        }
+
+        if cls._can_return_rows(owned.db):
+            query = owned.query.chain(UpdateQuery)
+            query.add_update_values(values)
+            query.annotations = {}
+            sql, params = query.get_compiler(owned.db).as_sql()
+            returning = owned.model._default_manager.db_manager(owned.db).raw(f"{sql} RETURNING *", params)
+            rows = await sync_to_async(list)(returning)
+            updated = rows[0] if rows else None
+        else:
+            updated = None
+            if await owned.aupdate(**values):
+                updated = await owned.aget()
+
+        if updated is None:
+            await cls._raise_for_missing(queryset, pk, author_id)
+        return updated
+
+    @classmethod
+    async def delete(cls, queryset: QuerySet, pk: int, author_id: int) -> Tuple[int, dict]:
+        """
+        Delete a row of the author, together with the rows cascading from it.
+
+        :param queryset: queryset to look the row up in.
+        :param pk: primary key of the row.
+        :param author_id: id of the user performing the deletion.
+        :return: number of deleted rows and the number of deleted rows per model.
+        """
+        deleted = await queryset.filter(pk=pk, author_id=author_id).adelete()
+        if not deleted[0]:
+            await cls._raise_for_missing(queryset, pk, author_id)
+        return deleted
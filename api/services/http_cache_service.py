@@ -0,0 +1,140 @@
+import hashlib
+import logging
+from typing import Iterable, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCacheService:
+    """
+    Service class for conditional GETs and shared caching of the public read endpoints.
+
+    A response gets a weak ETag hashed from the version of every row it is made of, the ID, updated_at and
+    counter of the row, so a request whose If-None-Match matches is answered with 304 Not Modified before
+    anything is serialized. Cache-Control comes from the HTTP_CACHE_CONTROL policy of the route, and the
+    Surrogate-Key header lists the posts and comments the response depends on, so a CDN in front can drop
+    exactly the responses a write makes stale. Writes hand those keys to SURROGATE_PURGE_HANDLER, if set.
+
+    Attributes:
+        - SURROGATE_KEY_HEADER (str): The name of the header listing the surrogate keys.
+        - POSTS_KEY (str): The surrogate key of the listing of published posts.
+        - post_key (method): Get the surrogate key of a post.
+        - post_comments_key (method): Get the surrogate key of the comments of a post.
+        - comment_key (method): Get the surrogate key of a comment.
+        - comment_replies_key (method): Get the surrogate key of the replies to a comment.
+        - is_conditional (method): Check whether a request carries an ETag to revalidate.
+        - etag (method): Compute the ETag of a response from the versions of its rows.
+        - not_modified (method): Answer a request with 304 Not Modified if its ETag is still current.
+        - apply (method): Set the caching headers of a response.
+        - purge (method): Hand surrogate keys to the purge handler.
+        - forget (method): Hand surrogate keys to the purge handler, from sync code.
+    """
+
+    SURROGATE_KEY_HEADER = "Surrogate-Key"
+    POSTS_KEY = "posts"
+
+    @staticmethod
+    def post_key(post_id: int) -> str:
+        return f"post-{post_id}"
+
+    @staticmethod
+    def post_comments_key(post_id: int) -> str:
+        return f"post-{post_id}-comments"
+
+    @staticmethod
+    def comment_key(comment_id: int) -> str:
+        return f"comment-{comment_id}"
+
+    @staticmethod
+    def comment_replies_key(comment_id: int) -> str:
+        return f"comment-{comment_id}-replies"
+
+    @staticmethod
+    def is_conditional(request: HttpRequest) -> bool:
+        """
+        Check whether a request carries an ETag to revalidate.
+
+        :param request: http request.
+        :return: whether the request has an If-None-Match header.
+        """
+        return "HTTP_IF_NONE_MATCH" in request.META
+
+    @staticmethod
+    def etag(versions: Iterable[tuple], has_next: bool = False) -> str:
+        """
+        Compute the ETag of a response from the versions of its rows.
+
+        :param versions: ID, updated_at and counter of every row of the response, in order.
+        :param has_next: whether a next page follows the rows.
+        :return: weak ETag.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for version in versions:
+            digest.update("|".join(map(str, version)).encode())
+            digest.update(b"\n")
+        digest.update(b"next" if has_next else b"last")
+        return f'W/"{digest.hexdigest()}"'
+
+    @classmethod
+    def not_modified(cls, request: HttpRequest, etag: str, policy: str, keys: Iterable[str]) -> Optional[HttpResponse]:
+        """
+        Answer a request with 304 Not Modified if its If-None-Match matches the current ETag.
+
+        :param request: http request.
+        :param etag: current ETag of the response.
+        :param policy: name of the Cache-Control policy of the route.
+        :param keys: surrogate keys of the response.
+        :return: 304 response, None if the response has to be sent in full.
+        """
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            cls.apply(response, etag, policy, keys)
+        return response
+
+    @classmethod
+    def apply(cls, response: HttpResponse, etag: str, policy: str, keys: Iterable[str]) -> None:
+        """
+        Set the ETag, Cache-Control and Surrogate-Key headers of a response.
+
+        :param response: http response.
+        :param etag: ETag of the response.
+        :param policy: name of the Cache-Control policy of the route.
+        :param keys: surrogate keys of the response.
+        """
+        response["ETag"] = etag
+        response["Cache-Control"] = settings.HTTP_CACHE_CONTROL[policy]
+        response[cls.SURROGATE_KEY_HEADER] = " ".join(dict.fromkeys(keys))
+
+    @classmethod
+    async def purge(cls, keys: Iterable[str]) -> None:
+        """
+        Hand surrogate keys to SURROGATE_PURGE_HANDLER, once a write has made their responses stale.
+
+        A failing handler is logged rather than raised, as the write itself went through.
+
+        :param keys: surrogate keys to purge.
+        """
+        if settings.SURROGATE_PURGE_HANDLER:
+            await sync_to_async(cls.forget)(keys)
+
+    @staticmethod
+    def forget(keys: Iterable[str]) -> None:
+        """
+        Hand surrogate keys to SURROGATE_PURGE_HANDLER, from sync code.
+
+        :param keys: surrogate keys to purge.
+        """
+        if not settings.SURROGATE_PURGE_HANDLER:
+            return
+
+        keys: List[str] = list(dict.fromkeys(keys))
+        try:
+            import_string(settings.SURROGATE_PURGE_HANDLER)(keys)
+        except Exception:
+            logger.exception("Purging the surrogate keys %s failed", keys)
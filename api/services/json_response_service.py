@@ -0,0 +1,56 @@
+from typing import Any
+
+from django.http import HttpRequest, HttpResponse
+
+from api.profiling.renderers import ProfilingJSONRenderer
+
+
+class JSONResponseService:
+    """
+    Service class for rendering projection rows straight into JSON responses.
+
+    django-ninja validates whatever a route returns against its response schema, which takes longer than
+    fetching and rendering a large listing together. The projection rows of the repositories hold the fields
+    of their schema already, so they are rendered as they are, with the renderer of the API, and the routes
+    only keep their response schema for the API documentation.
+
+    Attributes:
+        - renderer (ProfilingJSONRenderer): The renderer of the API.
+        - render (method): Render data into a JSON response.
+        - render_line (method): Render data into a line of newline-delimited JSON.
+    """
+
+    renderer = ProfilingJSONRenderer()
+
+    @classmethod
+    def render(cls, request: HttpRequest, data: Any, temporal_response: HttpResponse) -> HttpResponse:
+        """
+        Render data into a JSON response, with the status and the headers set on the temporal response.
+
+        :param request: http request.
+        :param data: data to render.
+        :param temporal_response: temporal response of the route.
+        :return: http response.
+        """
+        response = HttpResponse(
+            cls.renderer.render(request, data, response_status=temporal_response.status_code),
+            status=temporal_response.status_code,
+            content_type=f"{cls.renderer.media_type}; charset={cls.renderer.charset}",
+        )
+        for key, value in temporal_response.items():
+            if key.lower() != "content-type":
+                response[key] = value
+        return response
+
+    @classmethod
+    def render_line(cls, data: Any) -> bytes:
+        """
+        Render data into a line of newline-delimited JSON.
+
+        :param data: data to render.
+        :return: JSON line.
+        """
+        content = cls.renderer.render(None, data, response_status=200)
+        if isinstance(content, str):
+            content = content.encode(cls.renderer.charset)
+        return content + b"\n"
@@ -0,0 +1,191 @@
+from typing import Dict, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+
+from api.services.http_cache_service import HttpCacheService
+from api.services.profanity_service import ProfanityFilter
+
+
+class ModerationService:
+    """
+    Service class for the off-request profanity moderation.
+
+    In async mode posts and comments are saved with moderation_pending set instead of
+    being checked on save. The pending rows themselves form the job queue: a worker
+    picks them up in batches, blocks the profane ones and clears the flag. The updates
+    bypass the repositories, so every batch then drops the cached responses, index
+    entries and surrogate keys of its rows itself.
+
+    Attributes:
+        - is_async (method): Check if profanity checks are deferred to the worker.
+        - hides_pending (method): Check if content awaiting moderation is hidden.
+        - moderate_pending_posts (method): Moderate a batch of pending posts.
+        - moderate_pending_comments (method): Moderate a batch of pending comments.
+        - moderate_pending (method): Moderate a batch of pending posts and comments.
+    """
+
+    DEFAULT_BATCH_SIZE = 100
+
+    def __init__(self, profanity_filter: ProfanityFilter = None):
+        self.profanity_filter = profanity_filter or ProfanityFilter()
+
+    @staticmethod
+    def is_async() -> bool:
+        """
+        Check if profanity checks are deferred to the moderation worker.
+
+        :return: True in async moderation mode.
+        """
+        return settings.PROFANITY_MODERATION_MODE == "async"
+
+    @staticmethod
+    def hides_pending() -> bool:
+        """
+        Check if content awaiting moderation is kept out of the public managers.
+
+        :return: True if pending content is hidden.
+        """
+        return settings.PROFANITY_PENDING_POLICY == "hide"
+
+    def moderate_pending_posts(self, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Moderate a batch of pending posts.
+
+        Rows are locked with SKIP LOCKED where supported, so several workers can run side by side.
+
+        :param batch_size: maximum number of posts to moderate.
+        :return: number of moderated posts.
+        """
+        Post = apps.get_model("posts", "Post")
+
+        with transaction.atomic():
+            pending_posts = list(
+                Post.objects.select_for_update(skip_locked=True)
+                .filter(moderation_pending=True)
+                .order_by("id")
+                .values_list("id", "title", "content")[:batch_size]
+            )
+            if not pending_posts:
+                return 0
+
+            title_flags = self.profanity_filter.profane_flags([title for _, title, _ in pending_posts])
+            content_flags = self.profanity_filter.profane_flags([content for _, _, content in pending_posts])
+            blocked_ids = [
+                post_id
+                for (post_id, _, _), title_flag, content_flag in zip(pending_posts, title_flags, content_flags)
+                if title_flag or content_flag
+            ]
+
+            Post.objects.filter(pk__in=blocked_ids).update(is_blocked=True, moderation_pending=False)
+            Post.objects.filter(pk__in=[post_id for post_id, _, _ in pending_posts]).exclude(pk__in=blocked_ids).update(
+                moderation_pending=False
+            )
+
+        self._forget_posts([post_id for post_id, _, _ in pending_posts])
+        return len(pending_posts)
+
+    def moderate_pending_comments(self, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Moderate a batch of pending comments, keeping the daily stats and the comment counters in step.
+
+        Rows are locked with SKIP LOCKED where supported, so several workers can run side by side.
+
+        :param batch_size: maximum number of comments to moderate.
+        :return: number of moderated comments.
+        """
+        Comment = apps.get_model("comments", "Comment")
+        from api.comments.services import CommentCounterService, CommentStatsService
+
+        with transaction.atomic():
+            pending_comments = list(
+                Comment.objects.select_for_update(skip_locked=True)
+                .filter(moderation_pending=True)
+                .order_by("id")
+                .values_list("id", "text", "created_at", "is_blocked", "post_id", "parent_id")[:batch_size]
+            )
+            if not pending_comments:
+                return 0
+
+            flags = self.profanity_filter.profane_flags([row[1] for row in pending_comments])
+            blocked_ids = []
+            newly_blocked = []
+            deltas: Dict = {}
+            for (comment_id, _, created_at, is_blocked, post_id, parent_id), is_profane in zip(pending_comments, flags):
+                if not is_profane:
+                    continue
+                blocked_ids.append(comment_id)
+                if not is_blocked:
+                    newly_blocked.append((post_id, parent_id))
+                    day = CommentStatsService.day_of(created_at)
+                    total_delta, blocked_delta = deltas.get(day, (0, 0))
+                    deltas[day] = (total_delta, blocked_delta + 1)
+
+            Comment.objects.filter(pk__in=blocked_ids).update(is_blocked=True, moderation_pending=False)
+            Comment.objects.filter(pk__in=[row[0] for row in pending_comments]).exclude(pk__in=blocked_ids).update(
+                moderation_pending=False
+            )
+            CommentStatsService.record(deltas)
+            CommentCounterService.record(*CommentCounterService.deltas(newly_blocked, sign=-1))
+
+        self._forget_comments([(row[0], row[4], row[5]) for row in pending_comments])
+        return len(pending_comments)
+
+    @staticmethod
+    def _forget_posts(post_ids: List[int]) -> None:
+        """
+        Drop the cached details, visibility and listing pages of moderated posts, update them in the typeahead
+        index and purge their surrogate keys.
+
+        :param post_ids: IDs of the moderated posts.
+        """
+        Post = apps.get_model("posts", "Post")
+        from api.posts.services import PostCacheService, PostTypeaheadService, PostVisibilityService
+
+        post_cache_service = PostCacheService()
+        for post_id in post_ids:
+            post_cache_service.forget_post(post_id)
+            PostVisibilityService.forget(post_id)
+        post_cache_service.forget_listings()
+        for post in Post.objects.filter(pk__in=post_ids).only(
+            "title", "is_published", "is_blocked", "moderation_pending"
+        ):
+            PostTypeaheadService.index(post)
+
+        HttpCacheService.forget(
+            [
+                HttpCacheService.POSTS_KEY,
+                *(HttpCacheService.post_key(post_id) for post_id in post_ids),
+                *(HttpCacheService.post_comments_key(post_id) for post_id in post_ids),
+            ]
+        )
+
+    @staticmethod
+    def _forget_comments(comments: List[Tuple[int, int, Optional[int]]]) -> None:
+        """
+        Purge the surrogate keys of moderated comments, of the comments of their posts and of their parents.
+
+        :param comments: ID, post ID and parent ID of every moderated comment.
+        """
+        keys = []
+        for comment_id, post_id, parent_id in comments:
+            keys.extend(
+                [
+                    HttpCacheService.comment_key(comment_id),
+                    HttpCacheService.post_comments_key(post_id),
+                    HttpCacheService.post_key(post_id),
+                ]
+            )
+            if parent_id is not None:
+                keys.extend([HttpCacheService.comment_replies_key(parent_id), HttpCacheService.comment_key(parent_id)])
+        HttpCacheService.forget(keys)
+
+    def moderate_pending(self, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Moderate a batch of pending posts and a batch of pending comments.
+
+        :param batch_size: maximum number of rows of each kind to moderate.
+        :return: number of moderated rows.
+        """
+        return self.moderate_pending_posts(batch_size) + self.moderate_pending_comments(batch_size)
@@ -0,0 +1,130 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple, Type
+
+from django.db.models import Q, QuerySet
+
+
+class CursorPaginationService:
+    """
+    Service class for keyset pagination over (created_at, id) in descending order.
+
+    The cursor is an opaque token holding the position of the last row of a page,
+    so every page is an index range read no matter how deep it is.
+
+    Attributes:
+        - DEFAULT_LIMIT (int): The page size used when none is given.
+        - MAX_LIMIT (int): The largest page size allowed.
+        - clamp_limit (method): Bring a page size within the allowed bounds.
+        - encode_cursor (method): Encode a row position into a cursor.
+        - decode_cursor (method): Decode a cursor into a row position.
+        - order (method): Order a queryset newest first and start it after a cursor.
+        - paginate (method): Fetch a page of a queryset.
+        - versions (method): Fetch the versions of the rows of a page of a queryset.
+    """
+
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+
+    @classmethod
+    def clamp_limit(cls, limit: Optional[int]) -> int:
+        """
+        Bring a page size within the allowed bounds.
+
+        :param limit: requested page size.
+        :return: page size between 1 and MAX_LIMIT.
+        """
+        if not limit:
+            return cls.DEFAULT_LIMIT
+        return max(1, min(limit, cls.MAX_LIMIT))
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, pk: int) -> str:
+        """
+        Encode a row position into a cursor.
+
+        :param created_at: creation date of the row.
+        :param pk: primary key of the row.
+        :return: opaque cursor.
+        """
+        raw = f"{created_at.isoformat()}|{pk}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """
+        Decode a cursor into a row position.
+
+        :param cursor: opaque cursor.
+        :return: creation date and primary key of the row.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            created_at, pk = raw.split("|")
+            return datetime.fromisoformat(created_at), int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError("Invalid cursor")
+
+    @classmethod
+    def order(cls, queryset: QuerySet, cursor: Optional[str]) -> QuerySet:
+        """
+        Order a queryset newest first and start it right after the row a cursor points to.
+
+        :param queryset: queryset to order.
+        :param cursor: cursor to start after, None to start from the newest row.
+        :return: ordered queryset.
+        """
+        queryset = queryset.order_by("-created_at", "-id")
+
+        if cursor:
+            created_at, pk = cls.decode_cursor(cursor)
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+        return queryset
+
+    @classmethod
+    async def paginate(
+        cls, queryset: QuerySet, cursor: Optional[str], limit: Optional[int], projection: Optional[Type] = None
+    ) -> Tuple[List, Optional[str]]:
+        """
+        Fetch a page of a queryset, newest rows first.
+
+        :param queryset: queryset to paginate.
+        :param cursor: cursor of the page, None for the first page.
+        :param limit: page size.
+        :param projection: row class built from a values_list of its FIELDS, None to fetch model instances.
+        :return: rows of the page and the cursor of the next page, None on the last page.
+        """
+        limit = cls.clamp_limit(limit)
+        queryset = cls.order(queryset, cursor)
+
+        if projection is None:
+            rows = [row async for row in queryset[: limit + 1]]
+        else:
+            queryset = queryset.values_list(*projection.FIELDS)
+            rows = [projection(*values) async for values in queryset[: limit + 1]]
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, cls.encode_cursor(rows[-1].created_at, rows[-1].pk)
+
+    @classmethod
+    async def versions(
+        cls, queryset: QuerySet, cursor: Optional[str], limit: Optional[int], counter: str
+    ) -> Tuple[List[tuple], bool]:
+        """
+        Fetch the versions of the rows of a page, newest rows first, without loading the rows themselves.
+
+        :param queryset: queryset to paginate.
+        :param cursor: cursor of the page, None for the first page.
+        :param limit: page size.
+        :param counter: name of the counter field of the rows.
+        :return: ID, updated_at and counter of every row of the page, and whether a next page follows.
+        """
+        limit = cls.clamp_limit(limit)
+        queryset = cls.order(queryset, cursor).values_list("id", "updated_at", counter)
+
+        versions = [version async for version in queryset[: limit + 1]]
+        return versions[:limit], len(versions) > limit
@@ -1,5 +1,81 @@
 import os
 import re
+import threading
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+from api.metrics.instruments import PROFANITY_CHECK_DURATION, PROFANITY_CHECKS
+
+
+class BannedWordsDictionary:
+    """
+    A process-wide dictionary of banned words shared by every ProfanityFilter reading the same file.
+
+    The file is parsed once and parsed again only when its modification time or size changes,
+    so a write request costs a single stat call instead of an open and a parse.
+
+    Attributes:
+        - file_path (str): The absolute path of the banned words file.
+        - words (List[str]): The banned words currently loaded.
+        - pattern (re.Pattern): The compiled pattern for the loaded words.
+
+    Methods:
+        - for_path(file_path: str) -> BannedWordsDictionary: Get the shared dictionary of a file.
+        - refresh(force: bool) -> None: Reload the file if it has changed since the last load.
+    """
+
+    _instances: Dict[str, "BannedWordsDictionary"] = {}
+    _instances_lock = threading.Lock()
+    _NOT_LOADED = object()
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.words: List[str] = []
+        self.pattern: Optional[re.Pattern] = None
+        self._signature = self._NOT_LOADED
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, file_path: str) -> "BannedWordsDictionary":
+        """
+        Get the shared dictionary of a file, creating it on first use.
+
+        :param file_path: path of the banned words file.
+        :return: shared dictionary.
+        """
+        file_path = os.path.abspath(file_path)
+        dictionary = cls._instances.get(file_path)
+        if dictionary is None:
+            with cls._instances_lock:
+                dictionary = cls._instances.setdefault(file_path, cls(file_path))
+        return dictionary
+
+    def _stat_signature(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Reload the file if it has changed since the last load.
+
+        :param force: reload even if the file looks unchanged.
+        """
+        signature = self._stat_signature()
+        if not force and signature == self._signature:
+            return
+
+        with self._lock:
+            if not force and signature == self._signature:
+                return
+            words = ProfanityFilter.load_banned_words(self.file_path)
+            self.pattern = ProfanityFilter.compile_pattern(words)
+            self.words = words
+            self._signature = signature
 
 
 class ProfanityFilter:
@@ -7,17 +83,32 @@ class ProfanityFilter:
     A class to filter out profanity from text.
 
     Attributes:
+        - dictionary (BannedWordsDictionary): The shared dictionary of banned words.
         - banned_words (List[str]): A list of banned words.
+        - pattern (re.Pattern): A compiled pattern matching any banned word as a whole word.
 
     Methods:
         - load_banned_words(file_path: str) -> List[str]: Load banned words from a file.
+        - compile_pattern(words: List[str]) -> re.Pattern: Compile banned words into a single pattern.
         - is_profane(text: str) -> bool: Check if the text contains any banned words.
+        - profane_flags(texts: List[str]) -> List[bool]: Check a batch of texts in a single scan.
+        - reload() -> None: Reload the banned words from the file.
     """
 
     def __init__(self, file_path: str = None):
         if file_path is None:
-            file_path = os.path.join("data", "banned_words.txt")
-        self.banned_words = self.load_banned_words(file_path)
+            file_path = settings.BANNED_WORDS_FILE
+        self.dictionary = BannedWordsDictionary.for_path(file_path)
+
+    @property
+    def banned_words(self) -> List[str]:
+        self.dictionary.refresh()
+        return self.dictionary.words
+
+    @property
+    def pattern(self) -> Optional[re.Pattern]:
+        self.dictionary.refresh()
+        return self.dictionary.pattern
 
     @staticmethod
     def load_banned_words(file_path) -> list:
@@ -31,11 +122,72 @@ class ProfanityFilter:
         except FileNotFoundError:
             return []
 
+    @staticmethod
+    def compile_pattern(words: List[str]) -> Optional[re.Pattern]:
+        """
+        Compile banned words into one alternation, so a text is scanned once regardless of the list size.
+
+        Longer words go first, so a word is never shadowed by one of its own prefixes.
+        """
+        if not words:
+            return None
+        alternation = "|".join(re.escape(word) for word in sorted(set(words), key=len, reverse=True))
+        return re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
     def is_profane(self, text) -> bool:
         """
         Check if the text contains any banned words.
         """
-        for word in self.banned_words:
-            if re.search(rf"\b{word}\b", text, re.IGNORECASE):
-                return True
-        return False
+        with PROFANITY_CHECK_DURATION.time(mode="single"):
+            pattern = self.pattern
+            profane = pattern is not None and bool(text) and pattern.search(text) is not None
+        PROFANITY_CHECKS.inc(result="profane" if profane else "clean")
+        return profane
+
+    def profane_flags(self, texts: List[str]) -> List[bool]:
+        """
+        Check a batch of texts in a single scan of their newline-joined concatenation.
+
+        Banned words never contain a newline, so a match never spans two texts, and the
+        separator keeps the word boundaries of every text as they are when checked alone.
+        Once a text matches, the scan jumps straight to the next one.
+        """
+        with PROFANITY_CHECK_DURATION.time(mode="batch"):
+            flags = self._scan(texts)
+        profane_count = sum(flags)
+        if profane_count:
+            PROFANITY_CHECKS.inc(profane_count, result="profane")
+        if len(flags) > profane_count:
+            PROFANITY_CHECKS.inc(len(flags) - profane_count, result="clean")
+        return flags
+
+    def _scan(self, texts: List[str]) -> List[bool]:
+        """
+        Flag the profane texts of a batch, as described in profane_flags.
+        """
+        flags = [False] * len(texts)
+        pattern = self.pattern
+        if pattern is None or not texts:
+            return flags
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+
+        joined = "\n".join(texts)
+        position = 0
+        while True:
+            match = pattern.search(joined, position)
+            if match is None:
+                return flags
+            index = bisect_right(starts, match.start()) - 1
+            flags[index] = True
+            position = starts[index] + len(texts[index]) + 1
+
+    def reload(self) -> None:
+        """
+        Reload the banned words from the file, even if it looks unchanged.
+        """
+        self.dictionary.refresh(force=True)
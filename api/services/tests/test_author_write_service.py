@@ -0,0 +1,109 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import TestCase, tag
+from ninja_extra import exceptions
+
+from api.comments.factories import CommentFactory
+from api.comments.models import Comment
+from api.posts.factories import PostFactory
+from api.posts.models import Post
+from api.services import AuthorWriteService
+from api.users.factories import UserFactory
+
+
+@tag("services")
+class AuthorWriteServiceTestCase(TestCase):
+    """
+    Test case for the AuthorWriteService class.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+        self.other_user = UserFactory()
+        self.post = PostFactory(author=self.author)
+
+    def test_update_is_a_single_query(self):
+        """
+        Test that updating a row of the author takes one query and returns the stored row.
+        """
+        with self.assertNumQueries(1):
+            updated_post = async_to_sync(AuthorWriteService.update)(
+                Post.objects.all(),
+                pk=self.post.pk,
+                author_id=self.author.pk,
+                values={"title": "Updated title"},
+            )
+        self.assertEqual(updated_post.pk, self.post.pk)
+        self.assertEqual(updated_post.title, "Updated title")
+        self.assertEqual(updated_post.created_at, self.post.created_at)
+
+    def test_update_without_returning(self):
+        """
+        Test that the update falls back to a separate fetch on databases without RETURNING.
+        """
+        with mock.patch.object(AuthorWriteService, "RETURNING_VENDORS", ()), self.assertNumQueries(2):
+            updated_post = async_to_sync(AuthorWriteService.update)(
+                Post.objects.all(),
+                pk=self.post.pk,
+                author_id=self.author.pk,
+                values={"title": "Updated title"},
+            )
+        self.assertEqual(updated_post.title, "Updated title")
+
+    async def test_update_missing_row(self):
+        """
+        Test that updating a missing row raises DoesNotExist.
+        """
+        for returning_vendors in (AuthorWriteService.RETURNING_VENDORS, ()):
+            with mock.patch.object(AuthorWriteService, "RETURNING_VENDORS", returning_vendors):
+                with self.assertRaises(Post.DoesNotExist) as context:
+                    await AuthorWriteService.update(
+                        Post.objects.all(),
+                        pk=self.post.pk + 1,
+                        author_id=self.author.pk,
+                        values={"title": "Updated title"},
+                    )
+                self.assertEqual(str(context.exception), "Post matching query does not exist.")
+
+    async def test_update_row_of_another_author(self):
+        """
+        Test that updating a row of another author raises PermissionDenied and changes nothing.
+        """
+        with self.assertRaises(exceptions.PermissionDenied):
+            await AuthorWriteService.update(
+                Post.objects.all(),
+                pk=self.post.pk,
+                author_id=self.other_user.pk,
+                values={"title": "Updated title"},
+            )
+        post = await Post.objects.aget(pk=self.post.pk)
+        self.assertEqual(post.title, self.post.title)
+
+    async def test_update_respects_queryset_filters(self):
+        """
+        Test that a row outside of the given queryset is treated as missing.
+        """
+        comment = await sync_to_async(CommentFactory)(post=self.post, author=self.author)
+        other_post = await sync_to_async(PostFactory)(author=self.author)
+        with self.assertRaises(Comment.DoesNotExist):
+            await AuthorWriteService.update(
+                Comment.objects.filter(post_id=other_post.pk),
+                pk=comment.pk,
+                author_id=self.author.pk,
+                values={"text": "Updated text"},
+            )
+
+    async def test_delete(self):
+        """
+        Test that a row is deleted only by its author.
+        """
+        with self.assertRaises(exceptions.PermissionDenied):
+            await AuthorWriteService.delete(Post.objects.all(), pk=self.post.pk, author_id=self.other_user.pk)
+
+        deleted = await AuthorWriteService.delete(Post.objects.all(), pk=self.post.pk, author_id=self.author.pk)
+        self.assertEqual(deleted[0], 1)
+        self.assertFalse(await Post.objects.filter(pk=self.post.pk).aexists())
+
+        with self.assertRaises(Post.DoesNotExist):
+            await AuthorWriteService.delete(Post.objects.all(), pk=self.post.pk, author_id=self.author.pk)
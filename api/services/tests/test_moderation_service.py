@@ -0,0 +1,137 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings, tag
+from django.utils import timezone
+
+from api.comments.factories import CommentFactory
+from api.comments.models import Comment, CommentDailyStat
+from api.posts.factories import PostFactory
+from api.posts.models import Post
+from api.posts.services import PostCacheService, PostTypeaheadService, PostVisibilityService
+from api.services import ModerationService
+
+PURGED_KEYS = []
+
+
+def record_purge(keys):
+    PURGED_KEYS.extend(keys)
+
+
+@tag("services")
+class ModerationServiceTestCase(TestCase):
+    """
+    Test case for the ModerationService class.
+    """
+
+    def setUp(self):
+        file_descriptor, self.banned_words_file = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+            file.write("damn\n")
+        settings_override = override_settings(
+            BANNED_WORDS_FILE=self.banned_words_file,
+            PROFANITY_MODERATION_MODE="async",
+            PROFANITY_PENDING_POLICY="hide",
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+        PostTypeaheadService.reset()
+        self.addCleanup(PostTypeaheadService.reset)
+        PURGED_KEYS.clear()
+
+    def tearDown(self):
+        os.remove(self.banned_words_file)
+
+    def test_posts_wait_for_moderation(self):
+        """
+        Test that posts are saved pending and hidden, then blocked or released by the worker.
+        """
+        clean_post = PostFactory(title="Clean title")
+        profane_post = PostFactory(content="damn it")
+        self.assertTrue(clean_post.moderation_pending)
+        self.assertFalse(profane_post.is_blocked)
+        self.assertFalse(Post.published.exists())
+
+        with override_settings(PROFANITY_PENDING_POLICY="show"):
+            self.assertEqual(Post.published.count(), 2)
+
+        self.assertEqual(ModerationService().moderate_pending_posts(), 2)
+
+        self.assertEqual(list(Post.published.all()), [clean_post])
+        profane_post.refresh_from_db()
+        self.assertTrue(profane_post.is_blocked)
+        self.assertFalse(profane_post.moderation_pending)
+
+    def test_comments_wait_for_moderation(self):
+        """
+        Test that comments are saved pending and hidden, then blocked by the worker with the stats and counters updated.
+        """
+        post = PostFactory()
+        clean_comment = CommentFactory(post=post, author=post.author, text="nice post")
+        CommentFactory(post=post, author=post.author, text="damn post")
+        self.assertFalse(Comment.available.exists())
+
+        call_command("run_moderation_worker", "--once", stdout=StringIO())
+
+        self.assertEqual(list(Comment.available.all()), [clean_comment])
+        self.assertFalse(Comment.objects.filter(moderation_pending=True).exists())
+        stat = CommentDailyStat.objects.get(date=timezone.localdate())
+        self.assertEqual(stat.total_comments, 2)
+        self.assertEqual(stat.blocked_comments, 1)
+        self.assertEqual(Post.objects.values_list("comment_count", flat=True).get(pk=post.pk), 1)
+
+    @override_settings(
+        SURROGATE_PURGE_HANDLER="api.services.tests.test_moderation_service.record_purge",
+        POST_VISIBILITY_CACHE_SIZE=100,
+    )
+    def test_moderated_posts_are_invalidated(self):
+        """
+        Test that the worker drops what its updates make stale: listings, details, visibility, typeahead, CDN.
+        """
+        clean_post = PostFactory(title="Clean title")
+        profane_post = PostFactory(title="Damn title")
+        PostVisibilityService.set(clean_post.pk, False)
+        cache.set(PostCacheService.DETAIL_KEY.format(post_id=clean_post.pk), {"id": clean_post.pk})
+        cache.set(PostCacheService.LISTING_VERSION_KEY, 1)
+
+        with override_settings(PROFANITY_PENDING_POLICY="show"):
+            PostTypeaheadService._build()
+        self.assertEqual(len(PostTypeaheadService._index.lookup("title", limit=10)), 2)
+
+        ModerationService().moderate_pending_posts()
+
+        self.assertEqual(PostTypeaheadService._index.lookup("title", limit=10), [(clean_post.pk, "Clean title")])
+        self.assertIsNone(PostVisibilityService.get(clean_post.pk))
+        self.assertIsNone(cache.get(PostCacheService.DETAIL_KEY.format(post_id=clean_post.pk)))
+        self.assertEqual(cache.get(PostCacheService.LISTING_VERSION_KEY), 2)
+        self.assertIn("posts", PURGED_KEYS)
+        self.assertIn(f"post-{clean_post.pk}", PURGED_KEYS)
+        self.assertIn(f"post-{profane_post.pk}", PURGED_KEYS)
+
+    @override_settings(SURROGATE_PURGE_HANDLER="api.services.tests.test_moderation_service.record_purge")
+    def test_moderated_comments_purge_surrogate_keys(self):
+        """
+        Test that the worker purges the keys of the moderated comments, of their post and of their parent.
+        """
+        post = PostFactory()
+        parent = CommentFactory(post=post, author=post.author, text="nice post")
+        ModerationService().moderate_pending_comments()
+        PURGED_KEYS.clear()
+        reply = CommentFactory(post=post, author=post.author, parent=parent, text="damn reply")
+
+        ModerationService().moderate_pending_comments()
+
+        self.assertEqual(
+            PURGED_KEYS,
+            [
+                f"comment-{reply.pk}",
+                f"post-{post.pk}-comments",
+                f"post-{post.pk}",
+                f"comment-{parent.pk}-replies",
+                f"comment-{parent.pk}",
+            ],
+        )
@@ -0,0 +1,95 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase, tag
+
+from api.services.profanity_service import BannedWordsDictionary, ProfanityFilter
+
+
+@tag("services")
+class ProfanityFilterTestCase(SimpleTestCase):
+    """
+    Test case for the ProfanityFilter class.
+    """
+
+    def setUp(self):
+        file_descriptor, self.file_path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+            file.write("damn\nheck\n\nshoot down\nf.o\n")
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def test_is_profane_matches_whole_words(self):
+        """
+        Test that banned words are matched only as whole words and case-insensitively.
+        """
+        profanity_filter = ProfanityFilter(self.file_path)
+        self.assertTrue(profanity_filter.is_profane("Well, DAMN it."))
+        self.assertTrue(profanity_filter.is_profane("heck"))
+        self.assertTrue(profanity_filter.is_profane("they shoot down drones"))
+        self.assertFalse(profanity_filter.is_profane("damnation and checkers"))
+        self.assertFalse(profanity_filter.is_profane("shoot the messenger"))
+
+    def test_is_profane_escapes_special_characters(self):
+        """
+        Test that banned words are matched literally.
+        """
+        profanity_filter = ProfanityFilter(self.file_path)
+        self.assertTrue(profanity_filter.is_profane("what the f.o"))
+        self.assertFalse(profanity_filter.is_profane("what the fxo"))
+
+    def test_is_profane_without_banned_words(self):
+        """
+        Test that nothing is profane when the banned words file is missing.
+        """
+        profanity_filter = ProfanityFilter(os.path.join(tempfile.gettempdir(), "missing_banned_words.txt"))
+        self.assertEqual(profanity_filter.banned_words, [])
+        self.assertFalse(profanity_filter.is_profane("damn"))
+        self.assertFalse(profanity_filter.is_profane(""))
+
+    def test_filters_share_dictionary(self):
+        """
+        Test that filters reading the same file share one dictionary.
+        """
+        first_filter = ProfanityFilter(self.file_path)
+        second_filter = ProfanityFilter(self.file_path)
+        self.assertIs(first_filter.dictionary, second_filter.dictionary)
+        self.assertIs(first_filter.dictionary, BannedWordsDictionary.for_path(self.file_path))
+
+    def test_dictionary_reloads_when_file_changes(self):
+        """
+        Test that the dictionary is reloaded once the file changes and kept otherwise.
+        """
+        profanity_filter = ProfanityFilter(self.file_path)
+        self.assertFalse(profanity_filter.is_profane("darn"))
+        pattern = profanity_filter.pattern
+        self.assertIs(profanity_filter.pattern, pattern)
+
+        with open(self.file_path, "a", encoding="utf-8") as file:
+            file.write("darn\n")
+
+        self.assertTrue(profanity_filter.is_profane("darn"))
+        self.assertIn("darn", profanity_filter.banned_words)
+
+    def test_reload_forces_parse(self):
+        """
+        Test that an explicit reload parses the file again.
+        """
+        profanity_filter = ProfanityFilter(self.file_path)
+        banned_words = profanity_filter.banned_words
+        profanity_filter.reload()
+        self.assertIsNot(profanity_filter.banned_words, banned_words)
+        self.assertEqual(profanity_filter.banned_words, banned_words)
+
+    def test_profane_flags_matches_is_profane(self):
+        """
+        Test that checking a batch gives the same answers as checking every text alone.
+        """
+        profanity_filter = ProfanityFilter(self.file_path)
+        texts = ["damn", "", "clean text", "x\nheck", "damnation", "shoot down", "f.o", "heck damn", "end"]
+        self.assertEqual(
+            profanity_filter.profane_flags(texts),
+            [profanity_filter.is_profane(text) for text in texts],
+        )
+        self.assertEqual(profanity_filter.profane_flags([]), [])
@@ -0,0 +1,75 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from django.test import RequestFactory, SimpleTestCase, override_settings, tag
+from ninja import Schema
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+
+class ItemSchema(Schema):
+    name: str
+    price: Decimal
+
+
+@tag("renderers")
+class FastJSONRendererTestCase(SimpleTestCase):
+    """
+    Test case for the FastJSONRenderer class.
+    """
+
+    data = {
+        "created_at": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+        "id": UUID("12345678-1234-5678-1234-567812345678"),
+        "item": ItemSchema(name="Book", price=Decimal("9.90")),
+        "tags": ["a", "b"],
+    }
+
+    def test_render_with_orjson(self):
+        """
+        Test that datetimes, UUIDs, decimals and pydantic models are encoded.
+        """
+        content = FastJSONRenderer().render(None, self.data, response_status=200)
+
+        self.assertIsInstance(content, bytes)
+        self.assertEqual(
+            json.loads(content),
+            {
+                "created_at": "2024-05-01T12:30:15.123456Z",
+                "id": "12345678-1234-5678-1234-567812345678",
+                "item": {"name": "Book", "price": "9.90"},
+                "tags": ["a", "b"],
+            },
+        )
+
+    @override_settings(JSON_BACKEND="json")
+    def test_render_with_stdlib(self):
+        """
+        Test that the stdlib backend encodes the same values.
+        """
+        content = FastJSONRenderer().render(None, self.data, response_status=200)
+
+        self.assertIsInstance(content, str)
+        self.assertEqual(json.loads(content)["created_at"], "2024-05-01T12:30:15.123Z")
+        self.assertEqual(json.loads(content)["item"], {"name": "Book", "price": "9.90"})
+
+
+@tag("parsers")
+class FastJSONParserTestCase(SimpleTestCase):
+    """
+    Test case for the FastJSONParser class.
+    """
+
+    def test_parse_body(self):
+        """
+        Test that bodies are decoded, and malformed ones raise a JSONDecodeError.
+        """
+        request = RequestFactory().post("/", data=b'{"text": "caf\\u00e9"}', content_type="application/json")
+        self.assertEqual(FastJSONParser().parse_body(request), {"text": "café"})
+
+        request = RequestFactory().post("/", data=b'{"text": ', content_type="application/json")
+        with self.assertRaises(json.JSONDecodeError):
+            FastJSONParser().parse_body(request)
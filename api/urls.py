@@ -3,11 +3,16 @@ from ninja_extra import NinjaExtraAPI
 from api.users.api import AuthController, UserController
 from api.posts.api import PostController
 from api.comments.api import CommentController, AnalyticsController
+from api.profiling.api import ProfilingController
+from api.parsers import FastJSONParser
+from api.profiling.renderers import ProfilingJSONRenderer
 
 api = NinjaExtraAPI(
     title="Starnavi Test API",
     version="1.0.0",
     description="API description",
+    renderer=ProfilingJSONRenderer(),
+    parser=FastJSONParser(),
 )
 
 api.register_controllers(
@@ -16,4 +21,5 @@ api.register_controllers(
     PostController,
     CommentController,
     AnalyticsController,
+    ProfilingController,
 )
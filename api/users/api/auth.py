@@ -1,9 +1,11 @@
+from django.http import HttpRequest
 from ninja_extra import api_controller, route, status
 from ninja_jwt.controller import TokenObtainPairController
-from ninja_jwt.tokens import AccessToken
 
+from api.users.authentication import UserJWTAuth
 from api.users.repositories import UserRepository
-from api.users.schemas import AuthSchema, TokenSchema
+from api.users.schemas import AuthSchema, RefreshSchema, TokenSchema
+from api.users.services import TokenService
 from api.users.services.auth_service import AuthService
 
 
@@ -13,13 +15,15 @@ class AuthController(TokenObtainPairController):
     Controller for authentication functionality.
 
     Attributes:
-        - login (method): Obtain a new token.
+        - login (method): Obtain a new access and refresh token.
+        - refresh_token (method): Obtain new tokens from a refresh token.
+        - logout (method): Revoke every token of the user.
     """
 
     @route.post("/login", response={status.HTTP_200_OK: TokenSchema})
     async def login(self, user_data: AuthSchema) -> TokenSchema:
         """
-        Obtain a new token.
+        Obtain a new access and refresh token.
 
         :param user_data: data to authenticate a user.
         :return: token.
@@ -29,5 +33,25 @@ class AuthController(TokenObtainPairController):
             email=user_data.email,
             password=user_data.password,
         )
-        token = AccessToken.for_user(user)
-        return TokenSchema(token=str(token))
+        token, refresh = TokenService.issue(user)
+        return TokenSchema(token=token, refresh=refresh)
+
+    @route.post("/refresh", response={status.HTTP_200_OK: TokenSchema})
+    async def refresh_token(self, refresh_data: RefreshSchema) -> TokenSchema:
+        """
+        Obtain new tokens from a refresh token, unless the tokens of the user were revoked.
+
+        :param refresh_data: refresh token.
+        :return: token.
+        """
+        token, refresh = await TokenService().refresh(refresh_data.refresh)
+        return TokenSchema(token=token, refresh=refresh)
+
+    @route.post("/logout", response={status.HTTP_204_NO_CONTENT: None}, auth=UserJWTAuth())
+    async def logout(self, request: HttpRequest) -> None:
+        """
+        Revoke every access and refresh token of the user.
+
+        :param request: http request object.
+        """
+        await TokenService().revoke(request.user.pk)
@@ -13,7 +13,8 @@ class UserFactory(factory.django.DjangoModelFactory):
 
     first_name = factory.Faker("first_name")
     last_name = factory.Faker("last_name")
-    email = factory.Faker("email")
+    email = factory.Sequence(lambda n: f"user{n}@example.com")
+    username = factory.SelfAttribute("email")
     password = factory.PostGenerationMethodCall("set_password", "password")
     is_staff = False
     is_superuser = False
@@ -1,5 +1,8 @@
+from django.contrib.auth.hashers import identify_hasher
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import F
+from django.db.models.expressions import Combinable
 from django.utils.translation import gettext_lazy as _
 
 from api.users.models.manager import UserManager
@@ -14,11 +17,16 @@ class User(AbstractUser):
         - first_name (str): The first name of the user.
         - last_name (str): The last name of the user.
         - email (str): The email of the user.
+        - token_version (int): The version of the user's tokens, bumped to revoke every token issued before.
+        - PRIVILEGE_FIELDS (tuple): The fields carried as token claims, whose change revokes the tokens.
     """
 
+    PRIVILEGE_FIELDS = ("is_active", "is_staff", "is_superuser")
+
     first_name = models.CharField(_("first name"), max_length=150)
     last_name = models.CharField(_("last name"), max_length=150)
     email = models.EmailField(_("email address"), unique=True)
+    token_version = models.PositiveIntegerField(_("token version"), default=0)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -35,8 +43,38 @@ class User(AbstractUser):
 
     def save(self, *args, **kwargs):
         """
-        Save the user with a hashed password.
+        Save the user with a hashed password, whatever hasher produced it.
+
+        Stateless authentication trusts the privilege claims of a token until it expires, so a change of any
+        of the PRIVILEGE_FIELDS bumps the token version in the same update, revoking every token issued before.
         """
-        if self.password and not self.password.startswith("pbkdf2_"):
+        if self.password and not self._is_password_hashed():
             self.set_password(self.password)
+
+        update_fields = kwargs.get("update_fields")
+        if self._privileges_changed(update_fields):
+            self.token_version = F("token_version") + 1
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
         super().save(*args, **kwargs)
+        if isinstance(self.token_version, Combinable):
+            self.refresh_from_db(fields=["token_version"])
+
+    def _privileges_changed(self, update_fields) -> bool:
+        """
+        Check whether the saved values of the PRIVILEGE_FIELDS differ from the stored ones.
+        """
+        if self._state.adding or self.pk is None:
+            return False
+        fields = [field for field in self.PRIVILEGE_FIELDS if update_fields is None or field in update_fields]
+        if not fields:
+            return False
+        stored = type(self).objects.filter(pk=self.pk).values(*fields).first()
+        return stored is not None and any(stored[field] != getattr(self, field) for field in fields)
+
+    def _is_password_hashed(self) -> bool:
+        try:
+            identify_hasher(self.password)
+        except ValueError:
+            return False
+        return True
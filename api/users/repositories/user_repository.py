@@ -1,9 +1,11 @@
 from asgiref.sync import sync_to_async
 
+from api.metrics.instruments import instrument_repository
 from api.users.models import User
 from api.users.repositories.user_base import UserBaseRepository
 
 
+@instrument_repository("user")
 class UserRepository(UserBaseRepository):
     """
     User repository class to handle database operations.
@@ -1,6 +1,7 @@
 from .auth_schema import AuthSchema
 from .user_create_schema import UserCreateSchema
 from .token_schema import TokenSchema
+from .refresh_schema import RefreshSchema
 from .user_responce_schema import UserResponseSchema
 
 
@@ -8,5 +9,6 @@ __all__ = [
     "AuthSchema",
     "UserCreateSchema",
     "TokenSchema",
+    "RefreshSchema",
     "UserResponseSchema",
 ]
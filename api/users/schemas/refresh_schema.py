@@ -0,0 +1,12 @@
+from ninja_schema import Schema
+
+
+class RefreshSchema(Schema):
+    """
+    Refresh schema for the request of the token refresh endpoint.
+
+    The fields defined here are:
+    - refresh: the refresh token returned by the login endpoint.
+    """
+
+    refresh: str
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from ninja import Schema
 
 
@@ -6,7 +8,9 @@ class TokenSchema(Schema):
     Token Schema for the response of the login endpoint for the user authentication.
 
     The fields defined here are:
-    - token: a string containing the token generated by the server.
+    - token: a string containing the access token generated by the server.
+    - refresh: a string containing the refresh token to get a new access token with.
     """
 
     token: str
+    refresh: Optional[str] = None
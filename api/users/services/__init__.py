@@ -1,6 +1,10 @@
 from .auth_service import AuthService
+from .credential_cache_service import CredentialCacheService
+from .token_service import TokenService
 
 
 __all__ = [
     "AuthService",
+    "CredentialCacheService",
+    "TokenService",
 ]
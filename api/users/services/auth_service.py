@@ -3,6 +3,7 @@ from ninja_extra import status
 from ninja_extra.exceptions import APIException
 
 from api.users.models import User
+from api.users.services.credential_cache_service import CredentialCacheService
 
 
 class AuthService:
@@ -11,6 +12,7 @@ class AuthService:
 
     The methods defined here are:
     - authenticate_user: Authenticate a user by email or phone number and password.
+    - check_password: Check a password, through the cache of recently verified credentials.
     """
 
     def __init__(self, repository: "UserBaseRepository" = None):
@@ -31,9 +33,30 @@ class AuthService:
             exception.status_code = status.HTTP_404_NOT_FOUND
             raise exception
 
-        if not await sync_to_async(user.check_password)(password):
+        if not await self.check_password(user, password):
             exception = APIException(detail="Invalid credentials")
             exception.status_code = status.HTTP_404_NOT_FOUND
             raise exception
 
         return user
+
+    @staticmethod
+    async def check_password(user: User, password: str) -> bool:
+        """
+        Check a password, skipping the hasher for credentials verified recently.
+
+        A successful check also rehashes the password if the preferred hasher changed,
+        so users move to a new hasher on their next login.
+
+        :param user: user to check the password of.
+        :param password: raw password.
+        :return: True if the password is correct.
+        """
+        if CredentialCacheService.is_verified(user, password):
+            return True
+
+        if not await sync_to_async(user.check_password)(password):
+            return False
+
+        CredentialCacheService.remember(user, password)
+        return True
@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.crypto import salted_hmac
+
+from api.users.models import User
+
+
+class CredentialCacheService:
+    """
+    Service class for a bounded in-memory cache of recently verified credentials.
+
+    An entry is the HMAC of the user ID, the stored password hash and the raw password, under a key
+    derived from SECRET_KEY, so no password or hash is kept and a password change (which changes the
+    stored hash) invalidates every entry of the user. Entries expire after AUTH_CREDENTIAL_CACHE_TTL
+    seconds, and the least recently used ones are dropped beyond AUTH_CREDENTIAL_CACHE_SIZE entries,
+    0 disabling the cache.
+
+    Attributes:
+        - is_verified (method): Check if credentials were verified recently.
+        - remember (method): Remember credentials as verified.
+        - clear (method): Drop every entry.
+    """
+
+    _entries: "OrderedDict[bytes, float]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _digest(user: User, password: str) -> bytes:
+        message = f"{user.pk}\0{user.password}\0{password}"
+        return salted_hmac("api.users.CredentialCacheService", message, algorithm="sha256").digest()
+
+    @staticmethod
+    def _enabled() -> bool:
+        return settings.AUTH_CREDENTIAL_CACHE_SIZE > 0
+
+    @classmethod
+    def is_verified(cls, user: User, password: str) -> bool:
+        """
+        Check if credentials were verified recently.
+
+        :param user: user with the stored password hash.
+        :param password: raw password.
+        :return: True if the credentials are cached and not expired.
+        """
+        if not cls._enabled() or not user.password:
+            return False
+
+        digest = cls._digest(user, password)
+        with cls._lock:
+            expires_at = cls._entries.get(digest)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del cls._entries[digest]
+                return False
+            cls._entries.move_to_end(digest)
+            return True
+
+    @classmethod
+    def remember(cls, user: User, password: str) -> None:
+        """
+        Remember credentials as verified.
+
+        :param user: user with the stored password hash, after any hasher upgrade.
+        :param password: raw password.
+        """
+        if not cls._enabled():
+            return
+
+        digest = cls._digest(user, password)
+        with cls._lock:
+            cls._entries[digest] = time.monotonic() + settings.AUTH_CREDENTIAL_CACHE_TTL
+            cls._entries.move_to_end(digest)
+            while len(cls._entries) > settings.AUTH_CREDENTIAL_CACHE_SIZE:
+                cls._entries.popitem(last=False)
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Drop every entry.
+        """
+        with cls._lock:
+            cls._entries.clear()
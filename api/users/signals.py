@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.users.models import User
+from api.users.services import TokenService
+
+
+@receiver(post_save, sender=User, dispatch_uid="users_forget_token_version_on_save")
+@receiver(post_delete, sender=User, dispatch_uid="users_forget_token_version_on_delete")
+def forget_token_version(sender, instance: User, **kwargs) -> None:
+    """
+    Drop the cached token version of a saved or deleted user, so a deactivation or a privilege change is seen right away.
+    """
+    TokenService().forget(instance.pk)
@@ -1,7 +1,9 @@
 from asgiref.sync import sync_to_async
+from django.core.cache import cache
 from django.test import TestCase, tag
 from ninja_extra.testing import TestAsyncClient
 
+from api.posts.api import PostController
 from api.users.api import AuthController
 from api.users.factories import UserFactory
 
@@ -33,3 +35,48 @@ class TestAuthController(TestCase):
             },
         )
         self.assertEqual(response.status_code, 404)
+
+
+@tag("api")
+class TestTokenFlow(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    async def login(self) -> dict:
+        await sync_to_async(UserFactory)(email="test@gmail.com", password="password")  # nosec
+        response = await TestAsyncClient(AuthController).post(
+            path="/login",
+            json={"email": "test@gmail.com", "password": "password"},  # nosec
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    async def test_login_returns_refresh_token(self):
+        tokens = await self.login()
+        self.assertTrue(tokens["token"])
+        self.assertTrue(tokens["refresh"])
+
+        response = await TestAsyncClient(AuthController).post(path="/refresh", json={"refresh": tokens["refresh"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["token"])
+        self.assertTrue(response.json()["refresh"])
+
+    async def test_refresh_rejects_invalid_token(self):
+        response = await TestAsyncClient(AuthController).post(path="/refresh", json={"refresh": "invalid"})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_logout_revokes_tokens(self):
+        tokens = await self.login()
+        client = TestAsyncClient(AuthController)
+        response = await client.post(path="/logout", headers={"Authorization": f"Bearer {tokens['token']}"})
+        self.assertEqual(response.status_code, 204)
+
+        response = await client.post(path="/refresh", json={"refresh": tokens["refresh"]})
+        self.assertEqual(response.status_code, 401)
+
+        response = await TestAsyncClient(PostController).post(
+            path="/",
+            json={"title": "Title", "content": "Content", "is_published": True},
+            headers={"Authorization": f"Bearer {tokens['token']}"},
+        )
+        self.assertEqual(response.status_code, 401)
@@ -1,4 +1,4 @@
-from django.test import TestCase, tag
+from django.test import TestCase, override_settings, tag
 
 from api.users.factories import UserFactory
 
@@ -21,3 +21,26 @@ class UserTestCase(TestCase):
         user.password = "new_password"  # nosec
         user.save()
         self.assertTrue(user.check_password("new_password"))
+
+    @override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.ScryptPasswordHasher"])
+    def test_save_keeps_hash_of_any_hasher(self):
+        user = UserFactory(password="password")  # nosec
+        password_hash = user.password
+        self.assertTrue(password_hash.startswith("scrypt$"))
+        user.save()
+        self.assertEqual(user.password, password_hash)
+        self.assertTrue(user.check_password("password"))
+
+    def test_privilege_change_bumps_token_version(self):
+        user = UserFactory(is_staff=True)
+        user.first_name = "Renamed"
+        user.save()
+        self.assertEqual(user.token_version, 0)
+
+        user.is_staff = False
+        user.save(update_fields=["is_staff"])
+        self.assertEqual(user.token_version, 1)
+        user.is_superuser = True
+        user.save()
+        user.refresh_from_db()
+        self.assertEqual(user.token_version, 2)
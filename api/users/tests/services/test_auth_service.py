@@ -1,9 +1,13 @@
+from unittest import mock
+
 from asgiref.sync import sync_to_async
-from django.test import TestCase, tag
+from django.test import TestCase, override_settings, tag
 from ninja_extra.exceptions import APIException
 
 from api.users.factories import UserFactory
+from api.users.models import User
 from api.users.repositories import UserRepository
+from api.users.services import CredentialCacheService
 from api.users.services.auth_service import AuthService
 
 
@@ -42,3 +46,61 @@ class AuthServiceTestCase(TestCase):
                 password="wrong_password",  # nosec
             )
         self.assertEqual(str(context.exception), "Invalid credentials")
+
+
+@tag("services")
+class CredentialCacheTestCase(TestCase):
+    def setUp(self):
+        CredentialCacheService.clear()
+        self.addCleanup(CredentialCacheService.clear)
+        self.user = UserFactory(password="password")  # nosec
+
+    async def test_verified_credentials_skip_hasher(self):
+        self.assertTrue(await AuthService.check_password(self.user, "password"))
+        with mock.patch.object(User, "check_password", return_value=False) as check_password:
+            self.assertTrue(await AuthService.check_password(self.user, "password"))
+            self.assertFalse(await AuthService.check_password(self.user, "wrong_password"))
+        check_password.assert_called_once_with("wrong_password")
+
+    async def test_password_change_invalidates_cache(self):
+        self.assertTrue(await AuthService.check_password(self.user, "password"))
+        await sync_to_async(self.user.set_password)("new_password")  # nosec
+        self.assertFalse(await AuthService.check_password(self.user, "password"))
+        self.assertTrue(await AuthService.check_password(self.user, "new_password"))
+
+    @override_settings(AUTH_CREDENTIAL_CACHE_TTL=60)
+    async def test_entries_expire(self):
+        with mock.patch("api.users.services.credential_cache_service.time.monotonic", return_value=1000):
+            CredentialCacheService.remember(self.user, "password")
+            self.assertTrue(CredentialCacheService.is_verified(self.user, "password"))
+        with mock.patch("api.users.services.credential_cache_service.time.monotonic", return_value=1060):
+            self.assertFalse(CredentialCacheService.is_verified(self.user, "password"))
+
+    @override_settings(AUTH_CREDENTIAL_CACHE_SIZE=2)
+    def test_cache_is_bounded(self):
+        other_users = UserFactory.create_batch(2)
+        CredentialCacheService.remember(self.user, "password")
+        for other_user in other_users:
+            CredentialCacheService.remember(other_user, "password")
+        self.assertFalse(CredentialCacheService.is_verified(self.user, "password"))
+        self.assertTrue(CredentialCacheService.is_verified(other_users[-1], "password"))
+
+    @override_settings(AUTH_CREDENTIAL_CACHE_SIZE=0)
+    def test_cache_can_be_disabled(self):
+        CredentialCacheService.remember(self.user, "password")
+        self.assertFalse(CredentialCacheService.is_verified(self.user, "password"))
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "django.contrib.auth.hashers.ScryptPasswordHasher",
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        ]
+    )
+    async def test_login_upgrades_hasher(self):
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+        auth_service = AuthService(UserRepository)
+        await auth_service.authenticate_user(email=self.user.email, password="password")  # nosec
+
+        user = await User.objects.aget(pk=self.user.pk)
+        self.assertTrue(user.password.startswith("scrypt$"))
+        self.assertTrue(await AuthService.check_password(user, "password"))
@@ -0,0 +1,79 @@
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings, tag
+from ninja_extra.exceptions import APIException
+from ninja_jwt.exceptions import AuthenticationFailed
+from ninja_jwt.tokens import AccessToken
+
+from api.users.authentication import TokenPrincipal, UserJWTAuth
+from api.users.factories import UserFactory
+from api.users.models import User
+from api.users.services import TokenService
+
+
+@tag("services")
+class TokenServiceTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory(is_staff=True)
+
+    def authenticate(self, token: str):
+        return async_to_sync(UserJWTAuth().authenticate)(RequestFactory().get("/"), token)
+
+    def test_issued_tokens_carry_claims(self):
+        token, refresh = TokenService.issue(self.user)
+        access = AccessToken(token)
+        self.assertEqual(access["user_id"], self.user.pk)
+        self.assertEqual(access[TokenService.VERSION_CLAIM], 0)
+        self.assertTrue(access["is_active"])
+        self.assertTrue(access["is_staff"])
+
+    def test_stateless_authentication_skips_user_lookup(self):
+        token, _ = TokenService.issue(self.user)
+        with self.assertNumQueries(1):
+            user = self.authenticate(token)
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+        self.assertIsInstance(user, TokenPrincipal)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertTrue(user.is_staff)
+        self.assertTrue(user.is_authenticated)
+
+    @override_settings(JWT_STATELESS_AUTH=0)
+    def test_stateful_authentication_loads_user(self):
+        token, _ = TokenService.issue(self.user)
+        self.assertIsInstance(self.authenticate(token), User)
+
+    def test_token_without_version_loads_user(self):
+        token = str(AccessToken.for_user(self.user))
+        self.assertIsInstance(self.authenticate(token), User)
+
+    def test_revoked_tokens_are_rejected(self):
+        token, refresh = TokenService.issue(self.user)
+        self.authenticate(token)
+        async_to_sync(TokenService().revoke)(self.user.pk)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+        with self.assertRaises(APIException):
+            async_to_sync(TokenService().refresh)(refresh)
+
+        token, _ = TokenService.issue(User.objects.get(pk=self.user.pk))
+        self.assertEqual(self.authenticate(token).pk, self.user.pk)
+
+    def test_deactivated_user_is_rejected(self):
+        token, refresh = TokenService.issue(self.user)
+        self.authenticate(token)
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+        with self.assertRaises(APIException):
+            async_to_sync(TokenService().refresh)(refresh)
+
+    async def test_refresh_issues_current_claims(self):
+        _, refresh = await sync_to_async(TokenService.issue)(self.user)
+        await User.objects.filter(pk=self.user.pk).aupdate(is_staff=False)
+        token, _ = await TokenService().refresh(refresh)
+        self.assertFalse(AccessToken(token)["is_staff"])
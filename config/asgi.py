@@ -3,6 +3,13 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+In production it is served by gunicorn with uvicorn workers, configured in
+config/gunicorn.conf.py:
+
+    gunicorn config.asgi:application -c config/gunicorn.conf.py
+
+DJANGO_ASGI tells the settings to reuse database connections the way async workers need.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
@@ -12,5 +19,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+os.environ.setdefault("DJANGO_ASGI", "1")
 
 application = get_asgi_application()
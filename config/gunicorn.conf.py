@@ -0,0 +1,38 @@
+"""
+gunicorn configuration for serving config.asgi:application with uvicorn workers.
+
+Every setting can be overridden with the environment variable named after it, e.g.
+GUNICORN_WORKERS=4. One worker process per CPU core is enough for async workers, since
+each of them serves many requests concurrently on its event loop.
+"""
+
+import multiprocessing
+import os
+import tempfile
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "config.workers.DjangoUvicornWorker")
+
+# Cached pages are dropped by the worker that handles the write, so several workers need a cache they share.
+# The local-memory default is replaced with a file cache shared by the workers of the host, and refused when set
+# explicitly. Point CACHE_BACKEND to Redis or Memcached when serving from several hosts.
+LOCMEM_CACHE = "django.core.cache.backends.locmem.LocMemCache"
+if workers > 1:
+    if "CACHE_BACKEND" not in os.environ:
+        os.environ["CACHE_BACKEND"] = "django.core.cache.backends.filebased.FileBasedCache"
+        os.environ.setdefault("CACHE_LOCATION", os.path.join(tempfile.gettempdir(), "starnavi-cache"))
+    elif os.environ["CACHE_BACKEND"] == LOCMEM_CACHE:
+        raise RuntimeError(f"CACHE_BACKEND={LOCMEM_CACHE} is not shared by the {workers} gunicorn workers.")
+
+# Requests are answered well within the timeout, a worker stuck longer than that is restarted
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
+# Recycle workers now and then to bound memory growth, staggered so they do not restart together
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 1000))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = os.getenv("GUNICORN_ERROR_LOG", "-")
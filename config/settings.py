@@ -50,9 +50,13 @@ INSTALLED_APPS = [
     "api.users.apps.UsersConfig",
     "api.posts.apps.PostsConfig",
     "api.comments.apps.CommentsConfig",
+    "api.profiling.apps.ProfilingConfig",
+    "api.metrics.apps.MetricsConfig",
 ]
 
 MIDDLEWARE = [
+    "api.metrics.middleware.MetricsMiddleware",
+    "api.profiling.middleware.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -94,11 +98,124 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", "password"),
         "HOST": os.getenv("POSTGRES_HOST", "localhost"),
         "PORT": os.getenv("POSTGRES_PORT", "5432"),
+        "CONN_HEALTH_CHECKS": bool(int(os.getenv("DB_CONN_HEALTH_CHECKS", default=1))),
     }
 }
 
+# Connection reuse. Sync (WSGI) workers keep their connection open for DB_CONN_MAX_AGE seconds. Async (ASGI)
+# workers, flagged by DJANGO_ASGI which config/asgi.py sets, run every request in a thread of its own, so a
+# connection kept open by a thread would never be reused. They borrow connections from the psycopg pool instead
+# on PostgreSQL, DB_POOL=0 turning it off
+
+ASGI_WORKERS = int(os.getenv("DJANGO_ASGI", default=0))
+DB_POOL = int(os.getenv("DB_POOL", default=ASGI_WORKERS))
+
+if DB_POOL and DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", default=2)),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", default=10)),
+            "timeout": int(os.getenv("DB_POOL_TIMEOUT", default=10)),
+        },
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", default=0 if ASGI_WORKERS else 60))
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# The local-memory default is private to a process, config/gunicorn.conf.py replaces it with a shared file cache
+# when it starts several workers.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "starnavi"),
+    }
+}
+
+POST_CACHE_TIMEOUT = int(os.getenv("POST_CACHE_TIMEOUT", default=300))
+
+# Profanity filter
+
+BANNED_WORDS_FILE = os.getenv("BANNED_WORDS_FILE", os.path.join("data", "banned_words.txt"))
+
+# "sync" checks posts and comments on save, "async" leaves them to the run_moderation_worker command
+PROFANITY_MODERATION_MODE = os.getenv("PROFANITY_MODERATION_MODE", "sync")
+
+# "hide" keeps posts and comments awaiting moderation out of the public managers, "show" lists them
+PROFANITY_PENDING_POLICY = os.getenv("PROFANITY_PENDING_POLICY", "hide")
+
+# Bulk comment ingestion
+
+COMMENTS_BULK_BATCH_SIZE = int(os.getenv("COMMENTS_BULK_BATCH_SIZE", default=500))
+COMMENTS_BULK_MAX_SIZE = int(os.getenv("COMMENTS_BULK_MAX_SIZE", default=5000))
+
+# Whether posts accept comments is cached per process, POST_VISIBILITY_CACHE_SIZE=0 disables it
+
+POST_VISIBILITY_CACHE_SIZE = int(os.getenv("POST_VISIBILITY_CACHE_SIZE", default=10000))
+POST_VISIBILITY_CACHE_TTL = int(os.getenv("POST_VISIBILITY_CACHE_TTL", default=30))
+
+# Title autocompletion uses a pg_trgm index on PostgreSQL, an in-memory index elsewhere, rebuilt after
+# TYPEAHEAD_INDEX_TTL seconds to pick up the writes of other processes
+
+TYPEAHEAD_INDEX_TTL = int(os.getenv("TYPEAHEAD_INDEX_TTL", default=300))
+
+# Cache-Control of the public read endpoints, which also answer If-None-Match with 304 Not Modified. Responses
+# list their posts and comments in a Surrogate-Key header: with a CDN purged by SURROGATE_PURGE_HANDLER, the
+# dotted path of a callable taking the list of keys made stale by a write, s-maxage can be raised safely.
+
+HTTP_CACHE_CONTROL = {
+    "post": os.getenv("HTTP_CACHE_CONTROL_POST", "public, max-age=0, s-maxage=60"),
+    "posts": os.getenv("HTTP_CACHE_CONTROL_POSTS", "public, max-age=0, s-maxage=10"),
+    "comments": os.getenv("HTTP_CACHE_CONTROL_COMMENTS", "public, max-age=0, s-maxage=10"),
+    "replies": os.getenv("HTTP_CACHE_CONTROL_REPLIES", "public, max-age=0, s-maxage=10"),
+}
+SURROGATE_PURGE_HANDLER = os.getenv("SURROGATE_PURGE_HANDLER")
+
+# "orjson" encodes responses and decodes request bodies with orjson if it is installed, "json" with the stdlib
+
+JSON_BACKEND = os.getenv("JSON_BACKEND", "orjson")
+
+# Request profiling, reported in Server-Timing headers and at /api/profiling/ for admin users
+
+PROFILING_ENABLED = int(os.getenv("PROFILING_ENABLED", default=0))
+
+# Prometheus metrics at /metrics. With several worker processes, point METRICS_DIR to a directory shared
+# by the workers of a host, and empty it before they start. Only the space-separated METRICS_ALLOWED_IPS,
+# the local host by default, and scrapers sending METRICS_TOKEN as a bearer token may read them. Behind a proxy
+# the proxy address is the one checked, so set METRICS_TOKEN instead.
+
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1 ::1").split()
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 AUTH_USER_MODEL = "users.User"
 
+# The first hasher hashes new passwords, the others still verify existing hashes, which are rehashed
+# with the first one on the next successful login. "scrypt" is memory-hard and faster to verify.
+
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+_PASSWORD_HASHERS = {
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+}
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHERS[PASSWORD_HASHER],
+    *(hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+# Recently verified credentials skip the password hasher on login, AUTH_CREDENTIAL_CACHE_SIZE=0 disables it
+
+AUTH_CREDENTIAL_CACHE_SIZE = int(os.getenv("AUTH_CREDENTIAL_CACHE_SIZE", default=10000))
+AUTH_CREDENTIAL_CACHE_TTL = int(os.getenv("AUTH_CREDENTIAL_CACHE_TTL", default=300))
+
+# Authenticate requests from the token claims, checking only the cached token version of the user
+
+JWT_STATELESS_AUTH = int(os.getenv("JWT_STATELESS_AUTH", default=1))
+JWT_TOKEN_VERSION_CACHE_TIMEOUT = int(os.getenv("JWT_TOKEN_VERSION_CACHE_TIMEOUT", default=60))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,16 @@
+"""
+Uvicorn worker for gunicorn, tuned for Django.
+
+Django does not implement the ASGI lifespan protocol, so it is turned off instead of
+being probed on every worker start. uvloop and httptools are used when installed.
+"""
+
+from uvicorn.workers import UvicornWorker
+
+
+class DjangoUvicornWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": "auto",
+        "http": "auto",
+        "lifespan": "off",
+    }